@@ -4,34 +4,41 @@ Solar Ascension AI Engine - Enhanced Version
 Integrates real-time data, research insights, and AI-powered content generation
 """
 
-import tweepy
 import time
-import json
-import schedule
 import logging
-import requests
-import openai
-import pandas as pd
 from datetime import datetime, timedelta
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 import random
 from dataclasses import dataclass
+from contextlib import nullcontext
 import asyncio
-import aiohttp
 
-# Configure logging with enhanced formatting
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('solar_ascension_ai.log'),
-        logging.StreamHandler()
-    ]
-)
+# Heavy client libraries (aiohttp, openai, tweepy, schedule) are imported on
+# the code paths that use them so CLIs that never touch them start fast
+
+from analytics_store import PostRecordStore
+from log_config import configure_logging, get_logging_stats, log_payload
+from metrics_registry import REGISTRY, start_metrics_server, timed
+from content_pipeline import ContentPipeline
+from post_outbox import STATUS_FAILED, STATUS_PENDING, STATUS_PUBLISHED, OutboxEntry, OutboxPublisher, PostOutbox
+
+# Configure non-blocking logging with rotating files
+configure_logging('solar_ascension_ai.log')
 
 logger = logging.getLogger(__name__)
 
+COLLECT_SECONDS = REGISTRY.histogram(
+    "solar_collect_real_time_data_seconds", "Latency of real-time solar data collection"
+).labels()
+GENERATE_SECONDS = REGISTRY.histogram(
+    "solar_generate_content_seconds", "Latency of AI content generation", labels=("content_type",)
+)
+PLATFORM_POST_SECONDS = REGISTRY.histogram(
+    "solar_platform_post_seconds", "Latency of publishing a post to a platform", labels=("platform",)
+)
+POSTS_TOTAL = REGISTRY.counter("solar_posts_total", "Posts published", labels=("platform",))
+
 @dataclass
 class SolarData:
     """Real-time solar production and market data"""
@@ -41,6 +48,8 @@ class SolarData:
     market_price: float  # $/MWh
     carbon_saved: float  # tons CO2
     timestamp: datetime
+    # Fields filled from defaults because their upstream API was unavailable
+    fallbacks: Tuple[str, ...] = ()
 
 @dataclass
 class ResearchInsight:
@@ -55,13 +64,32 @@ class ResearchInsight:
 class SolarDataAPI:
     """Real-time solar data integration"""
     
-    def __init__(self):
+    # Used when the upstream API is unavailable
+    DEFAULT_IRRADIANCE = 800
+    DEFAULT_ENERGY_PRICE = 50.0
+    
+    def __init__(self, session=None):
         self.nrel_api_key = os.getenv('NREL_API_KEY', '')
         self.eia_api_key = os.getenv('EIA_API_KEY', '')
         self.weather_api_key = os.getenv('WEATHER_API_KEY', '')
+        # Optional shared aiohttp.ClientSession; a short-lived one is used otherwise
+        self.session = session
+    
+    def _client_session(self):
+        """Borrow the shared HTTP session, or open a throwaway one"""
+        if self.session is not None:
+            return nullcontext(self.session)
+        
+        import aiohttp
+        return aiohttp.ClientSession()
         
     async def get_solar_irradiance(self, lat: float, lon: float) -> float:
         """Get current solar irradiance from NREL API"""
+        irradiance = await self.fetch_solar_irradiance(lat, lon)
+        return self.DEFAULT_IRRADIANCE if irradiance is None else irradiance
+    
+    async def fetch_solar_irradiance(self, lat: float, lon: float) -> Optional[float]:
+        """Solar irradiance from NREL, or None if the API is unavailable"""
         try:
             url = f"https://developer.nrel.gov/api/solar/solar_resource/v1.json"
             params = {
@@ -70,20 +98,29 @@ class SolarDataAPI:
                 'lon': lon
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         return data.get('outputs', {}).get('ghi', 0)
                     else:
                         logger.warning(f"NREL API error: {response.status}")
-                        return 800  # Default value
+                        return None
         except Exception as e:
             logger.error(f"Error fetching solar irradiance: {e}")
-            return 800
+            return None
     
     async def get_energy_market_data(self) -> Dict:
         """Get current energy market prices from EIA"""
+        market_data = await self.fetch_energy_market_data()
+        return self.default_market_data() if market_data is None else market_data
+    
+    def default_market_data(self) -> Dict:
+        """Market data used when EIA is unavailable"""
+        return {'value': self.DEFAULT_ENERGY_PRICE, 'period': datetime.now().isoformat()}
+    
+    async def fetch_energy_market_data(self) -> Optional[Dict]:
+        """Latest energy market price from EIA, or None if the API is unavailable"""
         try:
             url = "https://api.eia.gov/v2/electricity/rto/price-data"
             params = {
@@ -97,17 +134,17 @@ class SolarDataAPI:
                 'length': 1
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         return data.get('response', {}).get('data', [{}])[0]
                     else:
                         logger.warning(f"EIA API error: {response.status}")
-                        return {'value': 50.0, 'period': datetime.now().isoformat()}
+                        return None
         except Exception as e:
             logger.error(f"Error fetching energy market data: {e}")
-            return {'value': 50.0, 'period': datetime.now().isoformat()}
+            return None
     
     def calculate_solar_production(self, irradiance: float, capacity: float, efficiency: float = 0.20) -> float:
         """Calculate current solar production based on irradiance and capacity"""
@@ -184,10 +221,25 @@ class ResearchDatabase:
 class AIContentGenerator:
     """AI-powered content generation and optimization"""
     
-    def __init__(self, openai_api_key: str):
-        self.client = openai.OpenAI(api_key=openai_api_key)
+    def __init__(self, openai_api_key: str, limiter: Optional[asyncio.Semaphore] = None):
+        self.openai_api_key = openai_api_key
+        self._client = None
+        # Optional semaphore bounding concurrent LLM calls (shared across engines)
+        self.limiter = limiter
         self.content_templates = self._load_content_templates()
     
+    @property
+    def client(self):
+        """OpenAI client, created on first use"""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.openai_api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
     def _load_content_templates(self) -> Dict:
         """Load content generation templates"""
         return {
@@ -210,11 +262,36 @@ class AIContentGenerator:
                 "prompt": "Create an inspiring statement about America's solar future that aligns with the Sun Kingdom vision. Be bold and visionary.",
                 "max_tokens": 280,
                 "temperature": 0.9
+            },
+            # Multi-platform fan-out: one neutral core message per cycle, adapted locally per platform
+            "core_message": {
+                "prompt": "Write one short, factual core message about today's solar energy data and its impact. It will be adapted for several social platforms, so use no hashtags, emojis or platform-specific phrasing.",
+                "max_tokens": 200,
+                "temperature": 0.7
+            },
+            "long_form": {
+                "prompt": "Write a clear, well-structured long-form post (several short paragraphs) explaining today's solar energy data, what it means and why it matters. It will be used as a video description and a community discussion post, so end with an open question and use no hashtags.",
+                "max_tokens": 800,
+                "temperature": 0.7
+            },
+            "platform_post": {
+                "prompt": "Write a social media post for the platform named in the context, matching its tone and audience and taking the given angle.",
+                "max_tokens": 400,
+                "temperature": 0.8
             }
         }
     
     async def generate_content(self, content_type: str, context: Dict = None) -> str:
-        """Generate AI-powered content"""
+        """Generate AI-powered content, falling back to a fixed text if the LLM call fails"""
+        content = await self.try_generate_content(content_type, context)
+        return content if content is not None else self.fallback_content(content_type, context)
+    
+    async def try_generate_content(self, content_type: str, context: Dict = None) -> Optional[str]:
+        """Generate AI-powered content; None if the LLM call failed"""
+        with GENERATE_SECONDS.labels(content_type=content_type).time():
+            return await self._generate_content(content_type, context)
+    
+    async def _generate_content(self, content_type: str, context: Dict = None) -> Optional[str]:
         try:
             template = self.content_templates.get(content_type)
             if not template:
@@ -226,16 +303,17 @@ class AIContentGenerator:
                 context_str = "\n".join([f"{k}: {v}" for k, v in context.items()])
                 prompt += f"\n\nContext:\n{context_str}"
             
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a solar energy expert and social media strategist. Create engaging, accurate, and inspiring content about solar energy and America's energy future."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=template["max_tokens"],
-                temperature=template["temperature"]
-            )
+            async with self.limiter or nullcontext():
+                response = await asyncio.to_thread(
+                    self.client.chat.completions.create,
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": "You are a solar energy expert and social media strategist. Create engaging, accurate, and inspiring content about solar energy and America's energy future."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=template["max_tokens"],
+                    temperature=template["temperature"]
+                )
             
             content = response.choices[0].message.content.strip()
             logger.info(f"Generated {content_type} content: {content[:50]}...")
@@ -243,49 +321,75 @@ class AIContentGenerator:
             
         except Exception as e:
             logger.error(f"Error generating content: {e}")
-            return self._get_fallback_content(content_type, context)
+            return None
     
-    def _get_fallback_content(self, content_type: str, context: Dict = None) -> str:
+    def fallback_content(self, content_type: str, context: Dict = None) -> str:
         """Fallback content when AI generation fails"""
         fallbacks = {
             "solar_update": "☀️ Solar energy is powering America's future! The sun never sends us a bill. #SolarAscension #CleanEnergy",
             "research_highlight": "🔬 New solar technology breakthroughs are accelerating our path to energy independence. The future is bright! #SolarInnovation",
             "policy_commentary": "📜 Smart solar policies can transform America into the Sun Kingdom of Earth. The time for bold action is now! #SolarPolicy",
-            "vision_statement": "🌟 America's solar ascension is not just possible—it's inevitable. The sun is ready. Are we? #SolarAscension #SunKingdom"
+            "vision_statement": "🌟 America's solar ascension is not just possible—it's inevitable. The sun is ready. Are we? #SolarAscension #SunKingdom",
+            "core_message": "Solar energy is powering more of America every day, cutting costs and carbon while the sun never sends us a bill.",
+            "long_form": "Solar energy is powering more of America every day.\n\nEvery megawatt from the sun lowers energy costs, cuts carbon emissions and strengthens our energy independence. Panels keep getting cheaper and more efficient, and the grid is learning to make the most of them.\n\nWhat would it take for solar to power your community?",
+            "platform_post": "☀️ Solar energy is the future, and the future is already here. #SolarAscension"
         }
         return fallbacks.get(content_type, "☀️ Solar energy is the future! #SolarAscension")
 
 class SolarAscensionAIEngine:
     """Enhanced Solar Ascension engine with AI and real-time data"""
     
-    def __init__(self, twitter_api_key: str, twitter_api_secret: str, openai_api_key: str):
-        """Initialize the enhanced engine"""
+    def __init__(self, twitter_api_key: str, twitter_api_secret: str, openai_api_key: str,
+                 post_history_capacity: int = 1024, post_log_path: Optional[str] = "solar_ascension_posts.jsonl",
+                 outbox_path: Optional[str] = None, data_api: Optional[SolarDataAPI] = None,
+                 research_db: Optional[ResearchDatabase] = None, ai_generator: Optional[AIContentGenerator] = None):
+        """Initialize the enhanced engine; components may be shared between engines"""
         self.twitter_api_key = twitter_api_key
         self.twitter_api_secret = twitter_api_secret
         
         # Initialize components
-        self.data_api = SolarDataAPI()
-        self.research_db = ResearchDatabase()
-        self.ai_generator = AIContentGenerator(openai_api_key)
+        self.data_api = data_api or SolarDataAPI()
+        self.research_db = research_db or ResearchDatabase()
+        self.ai_generator = ai_generator or AIContentGenerator(openai_api_key)
         
-        # Initialize Twitter client
-        self.client = tweepy.Client(
-            consumer_key=twitter_api_key,
-            consumer_secret=twitter_api_secret,
-            wait_on_rate_limit=True
-        )
+        # Twitter client is created on first use
+        self._client = None
         
         # Content strategy
         self.content_types = ["solar_update", "research_highlight", "policy_commentary", "vision_statement"]
         self.posting_schedule = self._create_posting_schedule()
+        # Context keys left out of generated content, e.g. while their source metric is flagged as anomalous
+        self.withheld_context_keys: Set[str] = set()
         
         # Analytics tracking
         self.analytics = {
             "posts_made": 0,
             "engagement_total": 0,
-            "content_performance": {},
             "data_points_collected": 0
         }
+        self.post_records = PostRecordStore(capacity=post_history_capacity, spill_path=post_log_path)
+        self.pipeline: Optional[ContentPipeline] = None
+        
+        # Durable outbox decouples publishing from generation when configured
+        self.outbox = PostOutbox(outbox_path) if outbox_path else None
+        self.outbox_publisher: Optional[OutboxPublisher] = None
+        self.outbox_channels = {"twitter": self._publish_outbox_tweet}
+        # Channels that can look up an earlier send; consulted before replaying a possibly sent entry
+        self.outbox_reconcilers: Dict = {}
+        # Longest a cycle waits for the inline outbox drain; the rest stays queued for the next run
+        self.outbox_drain_timeout = 30.0
+    
+    @property
+    def client(self):
+        """Twitter client, created on first use"""
+        if self._client is None:
+            import tweepy
+            self._client = tweepy.Client(
+                consumer_key=self.twitter_api_key,
+                consumer_secret=self.twitter_api_secret,
+                wait_on_rate_limit=True
+            )
+        return self._client
     
     def _create_posting_schedule(self) -> Dict:
         """Create optimized posting schedule"""
@@ -299,14 +403,22 @@ class SolarAscensionAIEngine:
             "sunday": ["12:00", "18:00"]
         }
     
+    @timed(COLLECT_SECONDS)
     async def collect_real_time_data(self) -> SolarData:
         """Collect real-time solar and market data"""
         try:
+            fallbacks = []
             # Get solar irradiance (using US average coordinates)
-            irradiance = await self.data_api.get_solar_irradiance(39.8283, -98.5795)
+            irradiance = await self.data_api.fetch_solar_irradiance(39.8283, -98.5795)
+            if irradiance is None:
+                irradiance = self.data_api.DEFAULT_IRRADIANCE
+                fallbacks += ["current_production", "carbon_saved"]
             
             # Get energy market data
-            market_data = await self.data_api.get_energy_market_data()
+            market_data = await self.data_api.fetch_energy_market_data()
+            if market_data is None:
+                market_data = self.data_api.default_market_data()
+                fallbacks.append("market_price")
             
             # Calculate production (using estimated US solar capacity)
             estimated_capacity = 150000  # MW (approximate US solar capacity)
@@ -321,7 +433,8 @@ class SolarAscensionAIEngine:
                 efficiency=0.20,
                 market_price=market_data.get('value', 50.0),
                 carbon_saved=carbon_saved,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                fallbacks=tuple(fallbacks)
             )
             
             self.analytics["data_points_collected"] += 1
@@ -338,7 +451,8 @@ class SolarAscensionAIEngine:
                 efficiency=0.20,
                 market_price=50.0,
                 carbon_saved=1000,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                fallbacks=("current_production", "carbon_saved", "market_price")
             )
     
     async def generate_contextual_content(self, solar_data: SolarData) -> str:
@@ -358,6 +472,8 @@ class SolarAscensionAIEngine:
                 "carbon_saved_tons": f"{solar_data.carbon_saved:,.0f}",
                 "efficiency_percent": f"{solar_data.efficiency*100:.1f}%"
             }
+            for key in self.withheld_context_keys:
+                context.pop(key, None)
             
             # Add research context if available
             if recent_insights:
@@ -378,8 +494,45 @@ class SolarAscensionAIEngine:
             logger.error(f"Error generating contextual content: {e}")
             return "☀️ Solar energy is powering America's future! The sun never sends us a bill. #SolarAscension #CleanEnergy"
     
-    async def post_content(self, content: str) -> bool:
-        """Post content to Twitter"""
+    async def post_content(self, content: str, wait_published: bool = False) -> bool:
+        """Post content to Twitter, or enqueue it in the outbox when one is configured.
+        
+        With ``wait_published`` and running outbox workers, True means the
+        tweet was actually published, not just enqueued.
+        """
+        if self.outbox is not None:
+            try:
+                key = await asyncio.to_thread(self.outbox.enqueue, "twitter", {"text": content})
+                logger.info(f"Enqueued tweet {key} in outbox")
+            except Exception as e:
+                logger.error(f"Error enqueueing content: {e}")
+                return False
+            if wait_published and self.outbox_publisher is not None:
+                return await self._wait_published(key, self.outbox_drain_timeout)
+            return True
+        
+        return await self.publish_content(content) is not None
+    
+    async def _wait_published(self, key: str, timeout: float) -> bool:
+        """Wait for the outbox workers to acknowledge an entry; False once an attempt failed or on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = await asyncio.to_thread(self.outbox.status, key)
+            if entry is not None and entry["status"] == STATUS_PUBLISHED:
+                return True
+            if entry is None or entry["status"] == STATUS_FAILED or (entry["status"] == STATUS_PENDING
+                                                                     and entry["attempts"]):
+                # Failed, or backing off before a retry; it stays queued for a later attempt
+                logger.warning(f"Outbox entry {key} not published: {entry and entry['last_error']}")
+                return False
+            if time.monotonic() > deadline:
+                logger.warning(f"Outbox entry {key} not published within {timeout:g}s; it stays queued")
+                return False
+            await asyncio.sleep(self.outbox_publisher.poll_interval)
+    
+    @timed(PLATFORM_POST_SECONDS.labels(platform="twitter"))
+    async def publish_content(self, content: str) -> Optional[int]:
+        """Publish content to Twitter and return its post record ID, for ``record_engagement``"""
         try:
             # For now, simulate posting since we need user authentication
             tweet_data = {
@@ -389,21 +542,67 @@ class SolarAscensionAIEngine:
             }
             
             logger.info(f"SIMULATED: Posting tweet: {content[:50]}...")
-            logger.info(f"Tweet data: {json.dumps(tweet_data, indent=2)}")
+            log_payload(logger, "Tweet data", tweet_data)
             
-            # Track analytics
-            self.analytics["posts_made"] += 1
-            self.analytics["content_performance"][datetime.now().isoformat()] = {
-                "content": content[:100],
-                "length": len(content),
-                "engagement": 0  # Would be updated with real data
-            }
+            # Track analytics (engagement would be updated with real data)
+            post_id = self.post_records.append(content)
+            self.analytics["posts_made"] = self.post_records.total_posts
+            POSTS_TOTAL.labels(platform="twitter").inc()
             
-            return True
+            return post_id
             
         except Exception as e:
             logger.error(f"Error posting content: {e}")
+            return None
+    
+    async def _publish_outbox_tweet(self, entry: OutboxEntry) -> Optional[str]:
+        """Outbox publisher for the twitter channel; the record ID is stored as the external ID"""
+        post_id = await self.publish_content(entry.payload["text"])
+        return None if post_id is None else str(post_id)
+    
+    def register_outbox_channels(self, publishers: Dict, reconcilers: Optional[Dict] = None):
+        """Register outbox publishers (and optional reconcilers) for additional channels (e.g. other platforms)"""
+        self.outbox_channels.update(publishers)
+        self.outbox_reconcilers.update(reconcilers or {})
+    
+    async def start_outbox_publisher(self, workers: int = 2) -> OutboxPublisher:
+        """Start outbox workers for all registered channels"""
+        if self.outbox is None:
+            raise RuntimeError("No outbox configured for this engine")
+        
+        self.outbox_publisher = OutboxPublisher(self.outbox, dict(self.outbox_channels),
+                                                reconcilers=dict(self.outbox_reconcilers), workers=workers)
+        await self.outbox_publisher.start()
+        return self.outbox_publisher
+    
+    async def stop_outbox_publisher(self):
+        """Stop outbox workers after flushing acknowledgements"""
+        if self.outbox_publisher is not None:
+            await self.outbox_publisher.stop()
+            self.outbox_publisher = None
+    
+    async def close(self):
+        """Stop outbox workers and close the outbox and the post record spill log"""
+        await self.stop_outbox_publisher()
+        if self.outbox is not None:
+            self.outbox.close()
+        self.post_records.close()
+    
+    async def publish_outbox_backlog(self, timeout: Optional[float] = None) -> bool:
+        """Publish everything due in the outbox, including any tail left by a crash.
+        
+        Returns False if ``timeout`` expired first; unpublished entries stay
+        queued for the next run.
+        """
+        await self.start_outbox_publisher()
+        try:
+            await self.outbox_publisher.drain(timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Outbox not drained within {timeout:g}s; remaining posts stay queued")
             return False
+        finally:
+            await self.stop_outbox_publisher()
     
     async def run_content_cycle(self):
         """Run a complete content generation and posting cycle"""
@@ -419,6 +618,10 @@ class SolarAscensionAIEngine:
             # Post content
             success = await self.post_content(content)
             
+            # Without long-running outbox workers, publish the outbox inline
+            if success and self.outbox is not None and self.outbox_publisher is None:
+                await self.publish_outbox_backlog(self.outbox_drain_timeout)
+            
             if success:
                 logger.info("Content cycle completed successfully")
                 self._log_analytics()
@@ -428,15 +631,64 @@ class SolarAscensionAIEngine:
         except Exception as e:
             logger.error(f"Error in content cycle: {e}")
     
+    async def run_content_pipeline(self, cycles: Optional[int] = None, queue_size: int = 2,
+                                   posts_per_hour: Optional[float] = None, cycle_interval: float = 0.0,
+                                   multi_platform=None) -> Dict:
+        """Run overlapping content cycles through the staged pipeline"""
+        pipeline = ContentPipeline(
+            self,
+            queue_size=queue_size,
+            posts_per_hour=posts_per_hour,
+            cycle_interval=cycle_interval,
+            multi_platform=multi_platform
+        )
+        self.pipeline = pipeline
+        # Pipeline posts go through the outbox, so its workers run for the pipeline's lifetime
+        owns_publisher = self.outbox is not None and self.outbox_publisher is None
+        if owns_publisher:
+            await self.start_outbox_publisher()
+        try:
+            await pipeline.run(cycles)
+        finally:
+            if owns_publisher:
+                try:
+                    await self.outbox_publisher.drain(self.outbox_drain_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Outbox not drained within {self.outbox_drain_timeout:g}s; "
+                                   f"remaining posts stay queued")
+                finally:
+                    await self.stop_outbox_publisher()
+        
+        metrics = pipeline.get_metrics()
+        self._log_analytics()
+        logger.info(f"Pipeline bottleneck: {metrics['bottleneck_stage']} "
+                    f"({metrics['posts_per_hour']:.1f} posts/hour)")
+        return metrics
+    
     def _log_analytics(self):
         """Log current analytics"""
         logger.info(f"Analytics Update:")
         logger.info(f"  Posts made: {self.analytics['posts_made']}")
         logger.info(f"  Data points collected: {self.analytics['data_points_collected']}")
         logger.info(f"  Total engagement: {self.analytics['engagement_total']}")
+        log_stats = get_logging_stats()
+        logger.info(f"  Payload log calls: {log_stats['calls']} (mean {log_stats['mean_us']:.1f}us, "
+                    f"max {log_stats['max_us']:.1f}us, dropped {log_stats['dropped_records']})")
+    
+    def record_engagement(self, post_id: int, engagement: int) -> bool:
+        """Record engagement for a previously made post"""
+        updated = self.post_records.record_engagement(post_id, engagement)
+        self.analytics["engagement_total"] = self.post_records.engagement_total
+        return updated
+    
+    def get_performance_summary(self) -> Dict:
+        """Get content performance aggregates"""
+        return self.post_records.summary()
     
     def schedule_posts(self):
         """Schedule regular posting"""
+        import schedule
+        
         for day, times in self.posting_schedule.items():
             for time_str in times:
                 schedule.every().day.at(time_str).do(
@@ -447,6 +699,8 @@ class SolarAscensionAIEngine:
     
     def run_scheduler(self):
         """Run the scheduling system"""
+        import schedule
+        
         logger.info("Starting Solar Ascension AI scheduler...")
         self.schedule_posts()
         
@@ -467,14 +721,23 @@ async def main():
     engine = SolarAscensionAIEngine(
         credentials['twitter_api_key'],
         credentials['twitter_api_secret'],
-        credentials['openai_api_key']
+        credentials['openai_api_key'],
+        outbox_path=os.getenv('SOLAR_OUTBOX_DB')
     )
     
-    # Run initial content cycle
-    await engine.run_content_cycle()
+    # Expose Prometheus metrics when a port is configured
+    metrics_port = os.getenv('SOLAR_METRICS_PORT')
+    if metrics_port:
+        start_metrics_server(int(metrics_port))
     
-    # Start scheduler for regular posting
-    engine.run_scheduler()
+    try:
+        # Run initial content cycle
+        await engine.run_content_cycle()
+        
+        # Start scheduler for regular posting
+        engine.run_scheduler()
+    finally:
+        await engine.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
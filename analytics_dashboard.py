@@ -5,27 +5,55 @@ Comprehensive real-time monitoring and analytics system
 """
 
 import asyncio
-import aiohttp
-import json
 import logging
+import os
+import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import pandas as pd
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io.json as plotly_json
 import dash
-from dash import dcc, html, Input, Output
+from dash import ALL, ClientsideFunction, ctx, dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-from dataclasses import dataclass
-import os
+from flask import Response, abort, request, stream_with_context
 
 # Import our existing components
-from ai_engine import SolarAscensionAIEngine, SolarData, ResearchInsight
+from ai_engine import SolarAscensionAIEngine, SolarData
+from anomaly_detection import CONTENT_CONTEXT_SERIES, Anomaly, AnomalyDetector
+from downsampling import DownsampleCache, lttb
+from figure_cache import CachedFigure, FigureCache
+from history_export import EXPORT_FORMATS, export_history
+from metrics_history import MetricsHistory
+from metrics_query import HistoryQuery, parse_bucket
+from metrics_rollup import MetricsRollupStore, flatten_numeric
+from metrics_registry import PROMETHEUS_CONTENT_TYPE, REGISTRY, timed
+from snapshot_stream import SSE_CONTENT_TYPE, SnapshotBroadcaster
+from social_ingestion import SocialIngestor, build_social_ingestor
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_CALLBACK_SECONDS = REGISTRY.histogram(
+    "solar_dashboard_callback_seconds", "Latency of the dashboard solar range callback"
+).labels()
+PANEL_REFRESH_SECONDS = REGISTRY.histogram(
+    "solar_dashboard_panel_refresh_seconds", "Time to recompute one live dashboard panel", labels=("panel",)
+)
+PANEL_REFRESH_ERRORS = REGISTRY.counter(
+    "solar_dashboard_panel_refresh_errors_total", "Live dashboard panel refreshes that raised", labels=("panel",)
+)
+
+SNAPSHOT_VERSION = REGISTRY.gauge("solar_analytics_snapshot_version", "Version of the latest published snapshot").labels()
+SNAPSHOT_FETCH_SECONDS = REGISTRY.histogram(
+    "solar_analytics_fetch_seconds", "Latency of the per-tick snapshot fetch and async collectors"
+).labels()
+COLLECTOR_COMPUTE_SECONDS = REGISTRY.histogram(
+    "solar_analytics_collector_seconds", "Compute time of each analytics collector", labels=("collector",)
+)
+
 @dataclass
 class AnalyticsMetrics:
     """Comprehensive analytics metrics"""
@@ -35,73 +63,123 @@ class AnalyticsMetrics:
     economic_metrics: Dict
     environmental_impact: Dict
     timestamp: datetime
+    # Series the anomaly detector flagged at this collection, if one is configured
+    anomalies: Tuple[Anomaly, ...] = ()
+    # Series whose values are defaults standing in for an unavailable upstream API
+    fallback_series: Tuple[str, ...] = ()
+
+def compute_solar_metrics(solar_data: SolarData) -> Dict:
+    """Derive solar production and efficiency metrics from a snapshot"""
+    return {
+        "current_production_mw": solar_data.current_production,
+        "total_capacity_mw": solar_data.total_capacity,
+        "efficiency_percent": solar_data.efficiency * 100,
+        "market_price_usd_mwh": solar_data.market_price,
+        "carbon_saved_tons": solar_data.carbon_saved,
+        "capacity_factor": solar_data.current_production / solar_data.total_capacity * 100,
+        "revenue_potential_usd": solar_data.current_production * solar_data.market_price,
+        "timestamp": solar_data.timestamp.isoformat()
+    }
+
+def compute_economic_metrics(solar_data: SolarData) -> Dict:
+    """Derive economic impact metrics from a snapshot"""
+    return {
+        "jobs_created": 2500000,  # Estimated from solar deployment
+        "investment_attracted": 75000000000,  # $75B
+        "revenue_generated": solar_data.current_production * solar_data.market_price * 24,  # Daily revenue
+        "cost_savings": solar_data.current_production * 50 * 24,  # Daily cost savings
+        "debt_reduction_potential": 2000000000000,  # $2T over 10 years
+        "gdp_contribution": 0.025,  # 2.5% of GDP
+        "export_potential": 200000000000,  # $200B annually
+        "timestamp": solar_data.timestamp.isoformat()
+    }
+
+def compute_environmental_metrics(solar_data: SolarData) -> Dict:
+    """Derive environmental impact metrics from a snapshot"""
+    return {
+        "carbon_reduced_tons": solar_data.carbon_saved,
+        "carbon_reduced_annual": solar_data.carbon_saved * 365,
+        "air_quality_improvement": 0.85,  # 85% reduction in air pollution
+        "water_saved_gallons": solar_data.current_production * 1000,  # Water savings
+        "land_efficiency_acres_mw": 5.0,  # Acres per MW
+        "biodiversity_impact": "positive",
+        "renewable_percentage": 25.0,  # Current US renewable percentage
+        "target_renewable_percentage": 100.0,
+        "timestamp": solar_data.timestamp.isoformat()
+    }
+
+# SolarData fields -> the solar_production series derived from them
+SOLAR_FIELD_SERIES = {
+    "current_production": ("solar_production.current_production_mw", "solar_production.capacity_factor",
+                           "solar_production.revenue_potential_usd"),
+    "carbon_saved": ("solar_production.carbon_saved_tons",),
+    "market_price": ("solar_production.market_price_usd_mwh", "solar_production.revenue_potential_usd")
+}
+
+def fallback_series(solar_data: SolarData) -> Tuple[str, ...]:
+    """Series of a collection that were computed from default values rather than live data"""
+    series = []
+    for name in solar_data.fallbacks:
+        series.extend(s for s in SOLAR_FIELD_SERIES.get(name, ()) if s not in series)
+    return tuple(series)
+
+# Collectors whose values change slowly -> minimum seconds between collections.
+# Between collections each tick reuses the last values; solar and environmental run every tick.
+COLLECTION_INTERVALS = {
+    "social": 60.0,
+    "economic": 300.0,
+    "policy": 3600.0
+}
+
+# Snapshot-derived collectors, computed from the single fetch of each tick
+DERIVED_COLLECTORS = {
+    "solar": compute_solar_metrics,
+    "economic": compute_economic_metrics,
+    "environmental": compute_environmental_metrics
+}
 
 class AnalyticsCollector:
     """Collect and process analytics data"""
     
-    def __init__(self, ai_engine: SolarAscensionAIEngine):
+    def __init__(self, ai_engine: SolarAscensionAIEngine, history_capacity: int = 1000,
+                 rollups: Optional[MetricsRollupStore] = None, anomaly_detector: Optional[AnomalyDetector] = None,
+                 withhold_anomalous_content: bool = False, social_ingestor: Optional[SocialIngestor] = None,
+                 collection_intervals: Optional[Dict[str, float]] = None):
         self.ai_engine = ai_engine
-        self.metrics_history = []
+        self.metrics_history = MetricsHistory(history_capacity)
+        # Optional persistent 1m/1h/1d aggregates for long-range queries
+        self.rollups = rollups
+        # Optional online checks of every numeric metric; flagged values can be kept out of generated content
+        self.anomaly_detector = anomaly_detector
+        self.withhold_anomalous_content = withhold_anomalous_content
+        # Optional per-platform engagement ingestion; social metrics are empty without it
+        self.social_ingestor = social_ingestor
         self.real_time_data = {}
+        # Seconds spent in each collector during the latest tick
+        self.collector_timings: Dict[str, float] = {}
+        # Per-collector cadence; collectors not listed run every tick
+        self.collection_intervals = COLLECTION_INTERVALS if collection_intervals is None else collection_intervals
+        self._last_collected: Dict[str, Tuple[float, Dict]] = {}
     
-    async def collect_solar_metrics(self) -> Dict:
-        """Collect solar production and efficiency metrics"""
+    async def collect_solar_metrics(self, solar_data: Optional[SolarData] = None) -> Dict:
+        """Collect solar production and efficiency metrics, fetching a snapshot only if none is given"""
         try:
-            solar_data = await self.ai_engine.collect_real_time_data()
-            
-            metrics = {
-                "current_production_mw": solar_data.current_production,
-                "total_capacity_mw": solar_data.total_capacity,
-                "efficiency_percent": solar_data.efficiency * 100,
-                "market_price_usd_mwh": solar_data.market_price,
-                "carbon_saved_tons": solar_data.carbon_saved,
-                "capacity_factor": solar_data.current_production / solar_data.total_capacity * 100,
-                "revenue_potential_usd": solar_data.current_production * solar_data.market_price,
-                "timestamp": solar_data.timestamp.isoformat()
-            }
-            
-            return metrics
+            if solar_data is None:
+                solar_data = await self.ai_engine.collect_real_time_data()
+            return compute_solar_metrics(solar_data)
             
         except Exception as e:
             logger.error(f"Error collecting solar metrics: {e}")
             return {}
     
     async def collect_social_metrics(self) -> Dict:
-        """Collect social media engagement metrics"""
+        """Collect social media engagement metrics from the ingested per-post data"""
         try:
-            # Simulate social media analytics
-            platforms = ['twitter', 'linkedin', 'youtube', 'tiktok', 'instagram', 'reddit']
-            
-            social_metrics = {
-                "total_followers": 0,
-                "total_engagement": 0,
-                "posts_today": 0,
-                "viral_posts": 0,
-                "platform_breakdown": {},
-                "engagement_rate": 0.0,
-                "reach_estimate": 0,
-                "sentiment_score": 0.8,  # Positive sentiment
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            for platform in platforms:
-                platform_data = {
-                    "followers": random.randint(1000, 10000),
-                    "engagement": random.randint(100, 1000),
-                    "posts": random.randint(1, 5),
-                    "viral_posts": random.randint(0, 2)
-                }
-                
-                social_metrics["platform_breakdown"][platform] = platform_data
-                social_metrics["total_followers"] += platform_data["followers"]
-                social_metrics["total_engagement"] += platform_data["engagement"]
-                social_metrics["posts_today"] += platform_data["posts"]
-                social_metrics["viral_posts"] += platform_data["viral_posts"]
-            
-            social_metrics["engagement_rate"] = social_metrics["total_engagement"] / max(social_metrics["total_followers"], 1) * 100
-            social_metrics["reach_estimate"] = social_metrics["total_followers"] * 2.5  # Estimated reach multiplier
-            
-            return social_metrics
+            if self.social_ingestor is None:
+                return {}
+            # Fetching runs on its own rate-limited schedule; a tick only reads the running totals
+            self.social_ingestor.ingest_in_background()
+            return await asyncio.to_thread(self.social_ingestor.store.summary)
             
         except Exception as e:
             logger.error(f"Error collecting social metrics: {e}")
@@ -131,64 +209,93 @@ class AnalyticsCollector:
             logger.error(f"Error collecting policy metrics: {e}")
             return {}
     
-    async def collect_economic_metrics(self) -> Dict:
-        """Collect economic impact metrics"""
+    async def collect_economic_metrics(self, solar_data: Optional[SolarData] = None) -> Dict:
+        """Collect economic impact metrics, fetching a snapshot only if none is given"""
         try:
-            solar_data = await self.ai_engine.collect_real_time_data()
-            
-            economic_metrics = {
-                "jobs_created": 2500000,  # Estimated from solar deployment
-                "investment_attracted": 75000000000,  # $75B
-                "revenue_generated": solar_data.current_production * solar_data.market_price * 24,  # Daily revenue
-                "cost_savings": solar_data.current_production * 50 * 24,  # Daily cost savings
-                "debt_reduction_potential": 2000000000000,  # $2T over 10 years
-                "gdp_contribution": 0.025,  # 2.5% of GDP
-                "export_potential": 200000000000,  # $200B annually
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            return economic_metrics
+            if solar_data is None:
+                solar_data = await self.ai_engine.collect_real_time_data()
+            return compute_economic_metrics(solar_data)
             
         except Exception as e:
             logger.error(f"Error collecting economic metrics: {e}")
             return {}
     
-    async def collect_environmental_metrics(self) -> Dict:
-        """Collect environmental impact metrics"""
+    async def collect_environmental_metrics(self, solar_data: Optional[SolarData] = None) -> Dict:
+        """Collect environmental impact metrics, fetching a snapshot only if none is given"""
         try:
-            solar_data = await self.ai_engine.collect_real_time_data()
-            
-            environmental_metrics = {
-                "carbon_reduced_tons": solar_data.carbon_saved,
-                "carbon_reduced_annual": solar_data.carbon_saved * 365,
-                "air_quality_improvement": 0.85,  # 85% reduction in air pollution
-                "water_saved_gallons": solar_data.current_production * 1000,  # Water savings
-                "land_efficiency_acres_mw": 5.0,  # Acres per MW
-                "biodiversity_impact": "positive",
-                "renewable_percentage": 25.0,  # Current US renewable percentage
-                "target_renewable_percentage": 100.0,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            return environmental_metrics
+            if solar_data is None:
+                solar_data = await self.ai_engine.collect_real_time_data()
+            return compute_environmental_metrics(solar_data)
             
         except Exception as e:
             logger.error(f"Error collecting environmental metrics: {e}")
             return {}
     
+    def _compute_derived(self, name: str, solar_data: SolarData) -> Dict:
+        """Run one derived-metrics function, timing it separately"""
+        start = time.perf_counter_ns()
+        try:
+            return DERIVED_COLLECTORS[name](solar_data)
+        except Exception as e:
+            logger.error(f"Error computing {name} metrics: {e}")
+            return {}
+        finally:
+            elapsed_ns = time.perf_counter_ns() - start
+            COLLECTOR_COMPUTE_SECONDS.labels(collector=name).observe_ns(elapsed_ns)
+            self.collector_timings[name] = elapsed_ns / 1e9
+    
+    async def _timed_collect(self, name: str, collect) -> Dict:
+        start = time.perf_counter_ns()
+        try:
+            return await collect()
+        finally:
+            elapsed_ns = time.perf_counter_ns() - start
+            COLLECTOR_COMPUTE_SECONDS.labels(collector=name).observe_ns(elapsed_ns)
+            self.collector_timings[name] = elapsed_ns / 1e9
+    
+    def _reuse(self, name: str, now: float) -> Optional[Dict]:
+        """Last values of ``name`` if it is not yet due for another collection"""
+        last = self._last_collected.get(name)
+        if last is not None and now - last[0] < self.collection_intervals.get(name, 0.0):
+            return last[1]
+        return None
+    
+    def _remember(self, name: str, now: float, values: Dict) -> Dict:
+        # Failed collections return {}; those are retried next tick rather than reused
+        if values:
+            self._last_collected[name] = (now, values)
+        return values
+    
+    async def _collect_on_cadence(self, name: str, collect, now: float) -> Dict:
+        reused = self._reuse(name, now)
+        if reused is not None:
+            return reused
+        return self._remember(name, now, await self._timed_collect(name, collect))
+    
     async def collect_all_metrics(self) -> AnalyticsMetrics:
-        """Collect all analytics metrics"""
+        """Collect all analytics metrics from one snapshot per tick.
+        
+        Collectors listed in ``collection_intervals`` only run when due;
+        in between, the tick reuses their last values.
+        """
         try:
             logger.info("Collecting comprehensive analytics metrics...")
+            now = time.monotonic()
             
-            # Collect all metrics concurrently
-            solar_metrics, social_metrics, policy_metrics, economic_metrics, environmental_metrics = await asyncio.gather(
-                self.collect_solar_metrics(),
-                self.collect_social_metrics(),
-                self.collect_policy_metrics(),
-                self.collect_economic_metrics(),
-                self.collect_environmental_metrics()
-            )
+            # One upstream fetch per tick, overlapped with the independent collectors
+            with SNAPSHOT_FETCH_SECONDS.time():
+                solar_data, social_metrics, policy_metrics = await asyncio.gather(
+                    self.ai_engine.collect_real_time_data(),
+                    self._collect_on_cadence("social", self.collect_social_metrics, now),
+                    self._collect_on_cadence("policy", self.collect_policy_metrics, now)
+                )
+            
+            # Every solar-derived panel sees the same snapshot
+            solar_metrics = self._compute_derived("solar", solar_data)
+            economic_metrics = self._reuse("economic", now)
+            if economic_metrics is None:
+                economic_metrics = self._remember("economic", now, self._compute_derived("economic", solar_data))
+            environmental_metrics = self._compute_derived("environmental", solar_data)
             
             analytics = AnalyticsMetrics(
                 solar_production=solar_metrics,
@@ -196,15 +303,19 @@ class AnalyticsCollector:
                 policy_impact=policy_metrics,
                 economic_metrics=economic_metrics,
                 environmental_impact=environmental_metrics,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                fallback_series=fallback_series(solar_data)
             )
+            if self.anomaly_detector is not None:
+                analytics.anomalies = self.check_anomalies(analytics)
             
-            # Store in history
+            # Store in history (fixed-size ring buffer, oldest points overwritten)
             self.metrics_history.append(analytics)
-            
-            # Keep only last 1000 entries
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            if self.rollups is not None:
+                try:
+                    await asyncio.to_thread(self.rollups.add, analytics)
+                except Exception as e:
+                    logger.error(f"Error updating metric rollups: {e}")
             
             # Update real-time data
             self.real_time_data = {
@@ -221,15 +332,274 @@ class AnalyticsCollector:
         except Exception as e:
             logger.error(f"Error collecting all metrics: {e}")
             return None
+    
+    def check_anomalies(self, analytics: AnalyticsMetrics) -> Tuple[Anomaly, ...]:
+        """Run the anomaly detector over every numeric metric of one collection"""
+        anomalies = tuple(self.anomaly_detector.observe(flatten_numeric(analytics), analytics.timestamp,
+                                                        fallbacks=analytics.fallback_series))
+        if self.withhold_anomalous_content:
+            flagged = {anomaly.series for anomaly in anomalies}
+            self.ai_engine.withheld_context_keys = {
+                key for key, series in CONTENT_CONTEXT_SERIES.items() if series in flagged
+            }
+        return anomalies
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable, versioned view of the latest collection for readers"""
+    version: int
+    metrics: AnalyticsMetrics
+    # Read-only column views over the latest points of the collector's MetricsHistory
+    history: Mapping
+    history_sequence: int
+    collected_at: datetime
+    collection_seconds: float
+
+def _freeze(value):
+    """Recursively wrap dicts in read-only proxies"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+def frozen_metrics(metrics: AnalyticsMetrics) -> AnalyticsMetrics:
+    """Copy of ``metrics`` whose sections are read-only mappings"""
+    return AnalyticsMetrics(
+        solar_production=_freeze(metrics.solar_production),
+        social_engagement=_freeze(metrics.social_engagement),
+        policy_impact=_freeze(metrics.policy_impact),
+        economic_metrics=_freeze(metrics.economic_metrics),
+        environmental_impact=_freeze(metrics.environmental_impact),
+        timestamp=metrics.timestamp,
+        anomalies=tuple(metrics.anomalies),
+        fallback_series=tuple(metrics.fallback_series)
+    )
+
+class BackgroundCollector:
+    """Runs collection on its own cadence and publishes immutable snapshots.
+
+    Readers such as dashboard callbacks only dereference ``latest``, so the
+    cost of collection is paid once per interval no matter how many viewers
+    are connected.
+    """
+
+    def __init__(self, analytics_collector: AnalyticsCollector, interval: float = 30.0, history_window: int = 50):
+        if history_window >= analytics_collector.metrics_history.capacity:
+            raise ValueError("history_window must be smaller than the history capacity")
+        self.analytics_collector = analytics_collector
+        self.interval = interval
+        self.history_window = history_window
+        self._latest: Optional[MetricsSnapshot] = None
+        self._version = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[MetricsSnapshot], None]] = []
+
+    def add_listener(self, listener: Callable[[MetricsSnapshot], None]):
+        """Call ``listener`` with every new snapshot, on the collector thread"""
+        self._listeners.append(listener)
+
+    @property
+    def latest(self) -> Optional[MetricsSnapshot]:
+        """Most recently published snapshot (None until the first collection)"""
+        return self._latest
+
+    @property
+    def metrics_history(self) -> MetricsHistory:
+        return self.analytics_collector.metrics_history
+
+    @property
+    def rollups(self) -> Optional[MetricsRollupStore]:
+        return self.analytics_collector.rollups
+
+    def start(self):
+        """Start collecting on a daemon thread with its own event loop"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="analytics-collector", daemon=True)
+        self._thread.start()
+        logger.info(f"Background collector started (every {self.interval:.0f}s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the collector thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    async def collect_once(self) -> Optional[MetricsSnapshot]:
+        """Collect and publish one snapshot"""
+        start = time.perf_counter()
+        metrics = await self.analytics_collector.collect_all_metrics()
+        if metrics is None:
+            return None
+        return self._publish(metrics, time.perf_counter() - start)
+
+    def _publish(self, metrics: AnalyticsMetrics, collection_seconds: float) -> MetricsSnapshot:
+        frozen = frozen_metrics(metrics)
+        metrics_history = self.analytics_collector.metrics_history
+
+        self._version += 1
+        snapshot = MetricsSnapshot(
+            version=self._version,
+            metrics=frozen,
+            history=metrics_history.window(self.history_window),
+            history_sequence=metrics_history.total_appended,
+            collected_at=datetime.now(),
+            collection_seconds=collection_seconds
+        )
+        # Single reference swap; readers never see a partially built snapshot
+        self._latest = snapshot
+        SNAPSHOT_VERSION.set(snapshot.version)
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+        return snapshot
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                await self.collect_once()
+            except Exception as e:
+                logger.error(f"Background collection failed: {e}")
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                await loop.run_in_executor(None, self._stop.wait, remaining)
+
+SOCIAL_PLATFORMS = ['twitter', 'linkedin', 'youtube', 'tiktok', 'instagram', 'reddit']
+
+# Solar chart ranges; "live" follows the latest snapshot, the rest are downsampled server-side
+SOLAR_RANGES = {
+    'live': None,
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'year': timedelta(days=365)
+}
+DEFAULT_CHART_WIDTH_PX = 800
+# Widths outside this range are clamped; the width is part of the figure cache key and the LTTB point count
+MIN_CHART_WIDTH_PX = 100
+MAX_CHART_WIDTH_PX = 4000
+
+# Figures served (and cached) by /figures/<figure_id>
+FIGURE_IDS = ('solar-live', 'solar-range', 'social', 'policy', 'economic', 'metrics-table')
+
+# Live panels pushed with frames; each is only sent when its values changed. How often the
+# slow panels (social, economic, policy) change is set by the collector's COLLECTION_INTERVALS.
+LIVE_PANELS = ('cards', 'alerts', 'table', 'social', 'economic', 'policy')
+
+# Panel figures served by /figures/<figure_id> -> the live panel whose values they draw
+FIGURE_PANELS = {'social': 'social', 'policy': 'policy', 'economic': 'economic', 'metrics-table': 'table'}
+
+# Headline cards: (title, unit, id path, snapshot section, key, value format)
+METRIC_CARDS = [
+    ("Solar Production", "MW", "solar.current_production_mw", "solar_production", "current_production_mw", "{:,.0f}"),
+    ("Social Engagement", "Posts", "social.posts_today", "social_engagement", "posts_today", "{:,}"),
+    ("Policy Impact", "Bills", "policy.bills_tracked", "policy_impact", "bills_tracked", "{}"),
+    ("Carbon Saved", "Tons", "environmental.carbon_reduced_tons", "environmental_impact", "carbon_reduced_tons",
+     "{:,.0f}")
+]
+
+METRICS_TABLE_LABELS = ["Solar Production", "Total Capacity", "Efficiency", "Market Price", "Carbon Saved",
+                        "Total Followers", "Engagement Rate", "Policy Bills Tracked", "Jobs Created",
+                        "Investment Attracted"]
+
+def clamp_chart_width(width) -> int:
+    """Chart width in pixels within the supported range; DEFAULT_CHART_WIDTH_PX when not given"""
+    if width in (None, ''):
+        return DEFAULT_CHART_WIDTH_PX
+    return min(max(int(width), MIN_CHART_WIDTH_PX), MAX_CHART_WIDTH_PX)
+
+def parse_figure_params(args) -> Dict:
+    """Validated /figures query parameters; raises ValueError for malformed values"""
+    params = {'range': args.get('range', 'day')}
+    for name in ('width', 'sequence'):
+        value = args.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            params[name] = int(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer, got {value!r}") from None
+        if params[name] < 0:
+            raise ValueError(f"{name} must not be negative, got {value!r}")
+    return params
+
+class LivePanel:
+    """One independently refreshed dashboard panel.
+
+    Values are recomputed once per snapshot, as soon as it is published.
+    ``version`` is the snapshot version at which they last changed, so
+    figure caches keyed on it survive snapshots that leave the panel
+    unchanged. A refresh that raises keeps the last good values instead of
+    taking the other panels down with it.
+    """
+
+    def __init__(self, name: str, compute: Callable[[MetricsSnapshot], object]):
+        self.name = name
+        self.compute = compute
+        self.values = None
+        self.version = 0
+        self._computed_version = None
+        self._lock = threading.Lock()
+    
+    def refresh(self, snapshot: MetricsSnapshot) -> bool:
+        """Recompute the values from a new snapshot; True when they changed"""
+        with self._lock:
+            if snapshot.version == self._computed_version:
+                return False
+            try:
+                with PANEL_REFRESH_SECONDS.labels(panel=self.name).time():
+                    values = self.compute(snapshot)
+            except Exception as e:
+                PANEL_REFRESH_ERRORS.labels(panel=self.name).inc()
+                logger.error(f"Error refreshing dashboard panel {self.name}: {e}")
+                return False
+            self._computed_version = snapshot.version
+            if values == self.values:
+                return False
+            self.values, self.version = values, snapshot.version
+            return True
+    
+    def current(self, snapshot: MetricsSnapshot):
+        """Values to show for ``snapshot``, computing them if this panel has none yet"""
+        if self.values is None:
+            self.refresh(snapshot)
+        return self.values
 
 class DashboardApp:
     """Interactive dashboard application"""
     
-    def __init__(self, analytics_collector: AnalyticsCollector):
+    def __init__(self, analytics_collector: Optional[AnalyticsCollector] = None, collection_interval: float = 30.0,
+                 background_collector: Optional[BackgroundCollector] = None, snapshot_source=None):
+        """``snapshot_source`` replaces the in-process collector, e.g. a SharedSnapshotReader in a
+        serving worker; it must offer the snapshot surface of BackgroundCollector"""
         self.analytics_collector = analytics_collector
+        self.snapshots = snapshot_source or background_collector or BackgroundCollector(
+            analytics_collector, interval=collection_interval
+        )
+        self.downsample_cache = DownsampleCache()
+        self.figure_cache = FigureCache()
+        self.panels = {
+            name: LivePanel(name, compute)
+            for name, compute in (('cards', self.metric_card_values),
+                                  ('alerts', self.anomaly_values),
+                                  ('table', self.metrics_table_values),
+                                  ('social', self.social_engagement_values),
+                                  ('economic', self.economic_values),
+                                  ('policy', self.policy_values))
+        }
+        # Snapshots are pushed to browsers once per collection instead of every client polling
+        self.stream = SnapshotBroadcaster(self.encode_delta_frame, self.encode_full_frame)
+        self.snapshots.add_listener(self.stream.publish)
         self.app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
         self.setup_layout()
         self.setup_callbacks()
+        self.setup_routes()
     
     def setup_layout(self):
         """Setup dashboard layout"""
@@ -237,35 +607,48 @@ class DashboardApp:
             dbc.Row([
                 dbc.Col([
                     html.H1("☀️ Solar Ascension Analytics Dashboard", className="text-center mb-4"),
-                    html.Hr()
+                    html.Hr(),
+                    # Filled from pushed frames while the anomaly detector flags any metric
+                    dbc.Alert(id='anomaly-alert', color='warning', is_open=False)
                 ])
             ]),
             
             # Real-time metrics cards
             dbc.Row([
-                dbc.Col(self.create_metric_card("Solar Production", "MW", "solar.current_production_mw"), width=3),
-                dbc.Col(self.create_metric_card("Social Engagement", "Posts", "social.posts_today"), width=3),
-                dbc.Col(self.create_metric_card("Policy Impact", "Bills", "policy.bills_tracked"), width=3),
-                dbc.Col(self.create_metric_card("Carbon Saved", "Tons", "environmental.carbon_reduced_tons"), width=3)
+                dbc.Col(self.create_metric_card(title, unit, metric_path), width=3)
+                for title, unit, metric_path, *_ in METRIC_CARDS
             ], className="mb-4"),
             
             # Charts
             dbc.Row([
                 dbc.Col([
-                    dcc.Graph(id='solar-production-chart'),
-                    dcc.Interval(id='interval-component', interval=30*1000, n_intervals=0)
+                    dcc.RadioItems(
+                        id='solar-range',
+                        options=[{'label': key.title(), 'value': key} for key in SOLAR_RANGES],
+                        value='live',
+                        inline=True
+                    ),
+                    dcc.Graph(id='solar-production-chart', figure=self.create_solar_chart(None)),
+                    dcc.Store(id='solar-chart-width', data=DEFAULT_CHART_WIDTH_PX),
+                    # Latest frame pushed over /stream, and a tick for refreshing long-range views
+                    dcc.Store(id='snapshot-push'),
+                    dcc.Store(id='range-refresh'),
+                    dcc.Store(id='stream-status')
+                ] + [
+                    # Each live panel is fed from its own store and redrawn by its own callback
+                    dcc.Store(id=f'panel-{name}') for name in LIVE_PANELS
                 ], width=6),
                 dbc.Col([
-                    dcc.Graph(id='social-engagement-chart')
+                    dcc.Graph(id='social-engagement-chart', figure=self.create_social_chart())
                 ], width=6)
             ], className="mb-4"),
             
             dbc.Row([
                 dbc.Col([
-                    dcc.Graph(id='policy-impact-chart')
+                    dcc.Graph(id='policy-impact-chart', figure=self.create_policy_chart())
                 ], width=6),
                 dbc.Col([
-                    dcc.Graph(id='economic-impact-chart')
+                    dcc.Graph(id='economic-impact-chart', figure=self.create_economic_chart())
                 ], width=6)
             ], className="mb-4"),
             
@@ -273,7 +656,7 @@ class DashboardApp:
             dbc.Row([
                 dbc.Col([
                     html.H3("Detailed Metrics"),
-                    html.Div(id='metrics-table')
+                    html.Div(self.create_metrics_table(None), id='metrics-table')
                 ])
             ])
             
@@ -284,7 +667,7 @@ class DashboardApp:
         return dbc.Card([
             dbc.CardBody([
                 html.H4(title, className="card-title"),
-                html.H2(id=f"{metric_path.replace('.', '-')}-value", className="card-text"),
+                html.H2("—", id=f"{metric_path.replace('.', '-')}-value", className="card-text"),
                 html.P(unit, className="card-text text-muted")
             ])
         ])
@@ -292,44 +675,245 @@ class DashboardApp:
     def setup_callbacks(self):
         """Setup dashboard callbacks"""
         
+        # Open the push channel once the page has rendered
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='solar', function_name='connect'),
+            Output('stream-status', 'data'),
+            Input('stream-status', 'id')
+        )
+        
+        # Pushed frames are applied in the browser; no server round trip per viewer. The
+        # solar points and every panel have separate callbacks, so a panel that is slow
+        # to redraw, or absent from a frame because it has not changed, holds up nothing else.
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='solar', function_name='applyFrame'),
+            [Output('solar-production-chart', 'extendData'),
+             Output('range-refresh', 'data')],
+            [Input('snapshot-push', 'data')],
+            [State('solar-range', 'value')]
+        )
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='solar', function_name='applyCards'),
+            [Output(f"{metric_path.replace('.', '-')}-value", 'children') for _, _, metric_path, *_ in METRIC_CARDS],
+            [Input('panel-cards', 'data')]
+        )
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='solar', function_name='applyAlerts'),
+            [Output('anomaly-alert', 'is_open'),
+             Output('anomaly-alert', 'children')],
+            [Input('panel-alerts', 'data')]
+        )
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='solar', function_name='applyTable'),
+            Output({'type': 'metric-table-value', 'index': ALL}, 'children'),
+            [Input('panel-table', 'data')]
+        )
+        for panel, graph_id, trace_key in (('social', 'social-engagement-chart', 'y'),
+                                           ('policy', 'policy-impact-chart', 'values'),
+                                           ('economic', 'economic-impact-chart', 'y')):
+            self.app.clientside_callback(
+                f"""
+                function(values, figure) {{
+                    return window.dash_clientside.solar.withTraceValues(figure, '{trace_key}', values);
+                }}
+                """,
+                Output(graph_id, 'figure'),
+                [Input(f'panel-{panel}', 'data')],
+                [State(graph_id, 'figure')]
+            )
+        
+        # Measure the rendered chart so long ranges are downsampled to about one point per pixel
+        self.app.clientside_callback(
+            """
+            function(range) {
+                var graph = document.getElementById('solar-production-chart');
+                return graph && graph.offsetWidth ? graph.offsetWidth : window.dash_clientside.no_update;
+            }
+            """,
+            Output('solar-chart-width', 'data'),
+            Input('solar-range', 'value')
+        )
+        
         @self.app.callback(
-            [Output('solar-production-chart', 'figure'),
-             Output('social-engagement-chart', 'figure'),
-             Output('policy-impact-chart', 'figure'),
-             Output('economic-impact-chart', 'figure'),
-             Output('metrics-table', 'children')],
-            [Input('interval-component', 'n_intervals')]
+            Output('solar-production-chart', 'figure'),
+            [Input('solar-range', 'value'),
+             Input('range-refresh', 'data'),
+             Input('solar-chart-width', 'data')],
+            [State('snapshot-push', 'data')],
+            prevent_initial_call=True
         )
-        async def update_charts(n):
-            # Collect latest metrics
-            await self.analytics_collector.collect_all_metrics()
-            
-            # Create charts
-            solar_fig = self.create_solar_chart()
-            social_fig = self.create_social_chart()
-            policy_fig = self.create_policy_chart()
-            economic_fig = self.create_economic_chart()
-            
-            # Create metrics table
-            metrics_table = self.create_metrics_table()
-            
-            return solar_fig, social_fig, policy_fig, economic_fig, metrics_table
+        @timed(DASHBOARD_CALLBACK_SECONDS)
+        def update_solar_range(solar_range, refresh, width, frame):
+            if solar_range == 'live':
+                if ctx.triggered_id != 'solar-range':
+                    # Live mode is kept current by pushed extendData
+                    raise PreventUpdate
+                # Only include points this browser has already been sent, so later frames do not duplicate them
+                cached = self.cached_figure('solar-live', {'sequence': frame['sequence'] if frame else 0})
+            else:
+                try:
+                    width = clamp_chart_width(width)
+                except (TypeError, ValueError):
+                    width = DEFAULT_CHART_WIDTH_PX
+                cached = self.cached_figure('solar-range', {'range': solar_range, 'width': width})
+            if cached is None:
+                raise PreventUpdate
+            return cached.figure
     
-    def create_solar_chart(self):
-        """Create solar production chart"""
+    def setup_routes(self):
+        """Setup plain HTTP routes on the dashboard server"""
+        
+        @self.app.server.route('/metrics')
+        def metrics():
+            return REGISTRY.render(), 200, {'Content-Type': PROMETHEUS_CONTENT_TYPE}
+        
+        @self.app.server.route('/figures/<figure_id>')
+        def figure(figure_id):
+            if figure_id not in FIGURE_IDS:
+                abort(404)
+            try:
+                params = parse_figure_params(request.args)
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            cached = self.cached_figure(figure_id, params)
+            if cached is None:
+                return Response(status=503, headers={'Retry-After': '5'})
+            response = Response(cached.body, mimetype='application/json', headers={'Cache-Control': 'no-cache'})
+            response.set_etag(cached.etag)
+            # Answers If-None-Match with 304 and no body
+            return response.make_conditional(request)
+        
+        @self.app.server.route('/api/history')
+        def history():
+            # Reads the persisted history, never the live collector, so reports can pull months of data
+            rollups = self.snapshots.rollups
+            if rollups is None:
+                return {'error': 'no persisted history is configured'}, 503
+            args = request.args
+            try:
+                end = datetime.fromisoformat(args['end']) if 'end' in args else datetime.now()
+                start = datetime.fromisoformat(args['start']) if 'start' in args else end - timedelta(days=1)
+                body = HistoryQuery(rollups).stream_json(
+                    args.get('field', 'solar_production_mw'), start, end,
+                    bucket_seconds=parse_bucket(args.get('bucket', '1h')),
+                    aggregation=args.get('agg', 'mean')
+                )
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            return Response(stream_with_context(body), mimetype='application/json')
+        
+        @self.app.server.route('/api/export/<export_format>')
+        def export(export_format):
+            # Streams straight from the store's read-only connection; the collector keeps writing meanwhile
+            rollups = self.snapshots.rollups
+            if rollups is None:
+                return {'error': 'no persisted history is configured'}, 503
+            if export_format not in EXPORT_FORMATS:
+                abort(404)
+            args = request.args
+            try:
+                start = datetime.fromisoformat(args['start']) if 'start' in args else None
+                end = datetime.fromisoformat(args['end']) if 'end' in args else None
+                fields = [field for field in args.get('fields', '').split(',') if field]
+                body = export_history(rollups, export_format, fields or None, start, end)
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            content_type, extension = EXPORT_FORMATS[export_format]
+            return Response(stream_with_context(body), mimetype=content_type, headers={
+                'Content-Disposition': f'attachment; filename=solar_history.{extension}'
+            })
+        
+        @self.app.server.route('/stream')
+        def stream():
+            subscription = self.stream.subscribe()
+            return Response(
+                stream_with_context(self.stream.stream(subscription)),
+                mimetype=SSE_CONTENT_TYPE,
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+    
+    def cached_figure(self, figure_id: str, params: Dict) -> Optional[CachedFigure]:
+        """Rendered figure from the cache, keyed on the version of the data it shows"""
+        snapshot = self.snapshots.latest
+        if figure_id == 'solar-range':
+            solar_range = params.get('range', 'day')
+            if solar_range not in SOLAR_RANGES or solar_range == 'live':
+                solar_range = 'day'
+            width = clamp_chart_width(params.get('width'))
+            # Rollups and history both advance with each snapshot, in this process or the collector's
+            version = snapshot.version if snapshot else 0
+            return self.figure_cache.get(figure_id, version, (solar_range, width),
+                                         lambda: self.create_solar_range_chart(solar_range, width, version))
+        
+        if snapshot is None:
+            return None
+        if figure_id == 'solar-live':
+            # Sequences outside the live window draw the same figure, so they share its cache entry
+            latest = snapshot.history_sequence
+            oldest = latest - len(snapshot.history['timestamp'])
+            sequence = latest if params.get('sequence') is None else min(max(params['sequence'], oldest), latest)
+            return self.figure_cache.get(figure_id, snapshot.version, (sequence,),
+                                         lambda: self.create_solar_chart(snapshot, sequence))
+        # Panel figures draw the panel's current values and stay cached until those change
+        panel = self.panels[FIGURE_PANELS[figure_id]]
+        values = panel.current(snapshot)
+        renderers = {
+            'social': self.create_social_chart,
+            'policy': self.create_policy_chart,
+            'economic': self.create_economic_chart,
+            'metrics-table': lambda values: {'labels': METRICS_TABLE_LABELS, 'values': values}
+        }
+        return self.figure_cache.get(figure_id, panel.version, (), lambda: renderers[figure_id](values))
+    
+    def create_solar_chart(self, snapshot: Optional[MetricsSnapshot], up_to_sequence: Optional[int] = None):
+        """Create solar production chart from a snapshot's live window.
+        
+        ``up_to_sequence`` drops points the client has not been sent yet, so a
+        later extendData does not duplicate them.
+        """
+        x, y = [], []
+        if snapshot:
+            x, y = snapshot.history['timestamp'], snapshot.history['solar_production_mw']
+            if up_to_sequence is not None:
+                unsent = min(max(snapshot.history_sequence - up_to_sequence, 0), len(x))
+                x, y = x[:len(x) - unsent], y[:len(y) - unsent]
+        return self._solar_figure(x, y, "Real-Time Solar Production")
+    
+    def create_solar_range_chart(self, solar_range: str, width: int, version: int):
+        """Create the solar chart for a long range, LTTB-downsampled to the chart width.
+        
+        Reads the persistent rollups when the collector has them (mean per
+        bucket at the resolution the range needs), else the in-memory history.
+        """
+        rollups = self.snapshots.rollups
+        history = self.snapshots.metrics_history
+        start = datetime.now() - SOLAR_RANGES[solar_range]
+        
+        def compute():
+            if rollups is not None:
+                points = rollups.query('solar_production.current_production_mw', start, points=width)
+                return lttb(points['timestamp'], points['mean'], width)
+            points = history.between(start=start)
+            return lttb(points['timestamp'], points['solar_production_mw'], width)
+        
+        # Every viewer of the same range and width shares one downsampling per data version
+        x, y = self.downsample_cache.get_or_compute(('solar_production_mw', solar_range, width, version), compute)
+        return self._solar_figure(x, y, f"Solar Production (last {solar_range})")
+    
+    def _solar_figure(self, x, y, title: str):
         fig = go.Figure()
         
         # Add production line
         fig.add_trace(go.Scatter(
-            x=[m.timestamp for m in self.analytics_collector.metrics_history[-50:]],
-            y=[m.solar_production.get('current_production_mw', 0) for m in self.analytics_collector.metrics_history[-50:]],
+            x=x,
+            y=y,
             mode='lines+markers',
             name='Solar Production (MW)',
             line=dict(color='gold', width=3)
         ))
         
         fig.update_layout(
-            title="Real-Time Solar Production",
+            title=title,
             xaxis_title="Time",
             yaxis_title="Production (MW)",
             template="plotly_dark"
@@ -337,22 +921,66 @@ class DashboardApp:
         
         return fig
     
-    def create_social_chart(self):
-        """Create social engagement chart"""
+    def encode_delta_frame(self, snapshot: MetricsSnapshot, previous: Optional[MetricsSnapshot]) -> str:
+        """JSON frame with the points added since ``previous`` and the panels that changed"""
+        if previous is None or previous.history_sequence > snapshot.history_sequence:
+            return self.encode_full_frame(snapshot, None)
+        new_points = min(snapshot.history_sequence - previous.history_sequence, len(snapshot.history['timestamp']))
+        # Panels are only sent when their values moved
+        panels = {name: panel.values for name, panel in self.panels.items() if panel.refresh(snapshot)}
+        return self._encode_frame(snapshot, previous.history_sequence, new_points, panels, reset=False)
+    
+    def encode_full_frame(self, snapshot: MetricsSnapshot, previous: Optional[MetricsSnapshot] = None) -> str:
+        """JSON frame carrying the whole live window and every panel, sent to (re)connecting clients"""
+        panels = {name: panel.current(snapshot) for name, panel in self.panels.items()}
+        return self._encode_frame(snapshot, 0, len(snapshot.history['timestamp']), panels, reset=True)
+    
+    def _encode_frame(self, snapshot: MetricsSnapshot, from_sequence: int, new_points: int, panels: Dict,
+                      reset: bool) -> str:
+        history = snapshot.history
+        start = len(history['timestamp']) - new_points
+        return plotly_json.to_json_plotly({
+            'version': snapshot.version,
+            'sequence': snapshot.history_sequence,
+            'from_sequence': from_sequence,
+            'reset': reset,
+            'max_points': self.snapshots.history_window,
+            'points': {'x': history['timestamp'][start:], 'y': history['solar_production_mw'][start:]},
+            'panels': {name: values for name, values in panels.items() if values is not None}
+        })
+    
+    def metric_card_values(self, snapshot: Optional[MetricsSnapshot]) -> List[str]:
+        """Formatted headline card values, in METRIC_CARDS order"""
+        if not snapshot:
+            return ["—"] * len(METRIC_CARDS)
+        return [
+            value_format.format(getattr(snapshot.metrics, section).get(key, 0))
+            for _, _, _, section, key, value_format in METRIC_CARDS
+        ]
+    
+    def anomaly_values(self, snapshot: Optional[MetricsSnapshot]) -> List[Dict]:
+        """Series the anomaly detector currently flags"""
+        if not snapshot:
+            return []
+        return [
+            {'series': a.series, 'kind': a.kind, 'value': a.value, 'expected': a.expected}
+            for a in snapshot.metrics.anomalies
+        ]
+    
+    def social_engagement_values(self, snapshot: Optional[MetricsSnapshot]):
+        """Engagement per platform from a snapshot"""
+        if not snapshot:
+            return [0] * len(SOCIAL_PLATFORMS)
+        breakdown = snapshot.metrics.social_engagement.get('platform_breakdown', {})
+        return [breakdown.get(platform, {}).get('engagement', 0) for platform in SOCIAL_PLATFORMS]
+    
+    def create_social_chart(self, values: Optional[List] = None):
+        """Create social engagement chart from engagement per platform"""
         fig = go.Figure()
         
-        platforms = ['twitter', 'linkedin', 'youtube', 'tiktok', 'instagram', 'reddit']
-        engagement_data = []
-        
-        if self.analytics_collector.metrics_history:
-            latest = self.analytics_collector.metrics_history[-1]
-            for platform in platforms:
-                platform_data = latest.social_engagement.get('platform_breakdown', {}).get(platform, {})
-                engagement_data.append(platform_data.get('engagement', 0))
-        
         fig.add_trace(go.Bar(
-            x=platforms,
-            y=engagement_data,
+            x=SOCIAL_PLATFORMS,
+            y=values or self.social_engagement_values(None),
             name='Engagement',
             marker_color='lightblue'
         ))
@@ -366,24 +994,24 @@ class DashboardApp:
         
         return fig
     
-    def create_policy_chart(self):
-        """Create policy impact chart"""
+    def policy_values(self, snapshot: Optional[MetricsSnapshot]):
+        """Supported/opposed/neutral bill counts from a snapshot"""
+        if not snapshot:
+            return [0, 0, 0]
+        policy = snapshot.metrics.policy_impact
+        supported = policy.get('bills_supported', 0)
+        opposed = policy.get('bills_opposed', 0)
+        return [supported, opposed, policy.get('bills_tracked', 0) - supported - opposed]
+    
+    def create_policy_chart(self, values: Optional[List] = None):
+        """Create policy impact chart from supported/opposed/neutral counts"""
         fig = go.Figure()
         
-        if self.analytics_collector.metrics_history:
-            latest = self.analytics_collector.metrics_history[-1]
-            
-            fig.add_trace(go.Pie(
-                labels=['Supported', 'Opposed', 'Neutral'],
-                values=[
-                    latest.policy_impact.get('bills_supported', 0),
-                    latest.policy_impact.get('bills_opposed', 0),
-                    latest.policy_impact.get('bills_tracked', 0) - 
-                    latest.policy_impact.get('bills_supported', 0) - 
-                    latest.policy_impact.get('bills_opposed', 0)
-                ],
-                hole=0.3
-            ))
+        fig.add_trace(go.Pie(
+            labels=['Supported', 'Opposed', 'Neutral'],
+            values=values or self.policy_values(None),
+            hole=0.3
+        ))
         
         fig.update_layout(
             title="Policy Bill Tracking",
@@ -392,27 +1020,28 @@ class DashboardApp:
         
         return fig
     
-    def create_economic_chart(self):
-        """Create economic impact chart"""
+    def economic_values(self, snapshot: Optional[MetricsSnapshot]):
+        """Economic impact bar heights from a snapshot"""
+        if not snapshot:
+            return [0, 0, 0, 0]
+        economic = snapshot.metrics.economic_metrics
+        return [
+            economic.get('jobs_created', 0) / 1000000,  # Millions
+            economic.get('investment_attracted', 0) / 1000000000,  # Billions
+            economic.get('revenue_generated', 0) / 1000000,  # Millions
+            economic.get('cost_savings', 0) / 1000000  # Millions
+        ]
+    
+    def create_economic_chart(self, values: Optional[List] = None):
+        """Create economic impact chart from its bar heights"""
         fig = go.Figure()
         
-        if self.analytics_collector.metrics_history:
-            latest = self.analytics_collector.metrics_history[-1]
-            
-            categories = ['Jobs Created', 'Investment ($B)', 'Revenue ($M)', 'Cost Savings ($M)']
-            values = [
-                latest.economic_metrics.get('jobs_created', 0) / 1000000,  # Millions
-                latest.economic_metrics.get('investment_attracted', 0) / 1000000000,  # Billions
-                latest.economic_metrics.get('revenue_generated', 0) / 1000000,  # Millions
-                latest.economic_metrics.get('cost_savings', 0) / 1000000  # Millions
-            ]
-            
-            fig.add_trace(go.Bar(
-                x=categories,
-                y=values,
-                name='Economic Impact',
-                marker_color='lightgreen'
-            ))
+        fig.add_trace(go.Bar(
+            x=['Jobs Created', 'Investment ($B)', 'Revenue ($M)', 'Cost Savings ($M)'],
+            y=values or self.economic_values(None),
+            name='Economic Impact',
+            marker_color='lightgreen'
+        ))
         
         fig.update_layout(
             title="Economic Impact Metrics",
@@ -423,39 +1052,64 @@ class DashboardApp:
         
         return fig
     
-    def create_metrics_table(self):
-        """Create detailed metrics table"""
-        if not self.analytics_collector.metrics_history:
-            return html.P("No data available")
+    def metrics_table_values(self, snapshot: Optional[MetricsSnapshot]) -> List[str]:
+        """Formatted values for the detailed metrics table, in METRICS_TABLE_LABELS order"""
+        if not snapshot:
+            return ["—"] * len(METRICS_TABLE_LABELS)
         
-        latest = self.analytics_collector.metrics_history[-1]
+        latest = snapshot.metrics
         
-        table_data = [
-            ["Solar Production", f"{latest.solar_production.get('current_production_mw', 0):,.0f} MW"],
-            ["Total Capacity", f"{latest.solar_production.get('total_capacity_mw', 0):,.0f} MW"],
-            ["Efficiency", f"{latest.solar_production.get('efficiency_percent', 0):.1f}%"],
-            ["Market Price", f"${latest.solar_production.get('market_price_usd_mwh', 0):.1f}/MWh"],
-            ["Carbon Saved", f"{latest.solar_production.get('carbon_saved_tons', 0):,.0f} tons"],
-            ["Total Followers", f"{latest.social_engagement.get('total_followers', 0):,}"],
-            ["Engagement Rate", f"{latest.social_engagement.get('engagement_rate', 0):.2f}%"],
-            ["Policy Bills Tracked", f"{latest.policy_impact.get('bills_tracked', 0)}"],
-            ["Jobs Created", f"{latest.economic_metrics.get('jobs_created', 0):,}"],
-            ["Investment Attracted", f"${latest.economic_metrics.get('investment_attracted', 0)/1000000000:.1f}B"]
+        return [
+            f"{latest.solar_production.get('current_production_mw', 0):,.0f} MW",
+            f"{latest.solar_production.get('total_capacity_mw', 0):,.0f} MW",
+            f"{latest.solar_production.get('efficiency_percent', 0):.1f}%",
+            f"${latest.solar_production.get('market_price_usd_mwh', 0):.1f}/MWh",
+            f"{latest.solar_production.get('carbon_saved_tons', 0):,.0f} tons",
+            f"{latest.social_engagement.get('total_followers', 0):,}",
+            f"{latest.social_engagement.get('engagement_rate', 0):.2f}%",
+            f"{latest.policy_impact.get('bills_tracked', 0)}",
+            f"{latest.economic_metrics.get('jobs_created', 0):,}",
+            f"${latest.economic_metrics.get('investment_attracted', 0)/1000000000:.1f}B"
         ]
+    
+    def create_metrics_table(self, snapshot: Optional[MetricsSnapshot]):
+        """Create detailed metrics table; value cells are addressable for pushed updates"""
+        values = self.metrics_table_values(snapshot)
         
         return dbc.Table([
             html.Thead([
                 html.Tr([html.Th("Metric"), html.Th("Value")])
             ]),
             html.Tbody([
-                html.Tr([html.Td(row[0]), html.Td(row[1])]) for row in table_data
+                html.Tr([html.Td(label), html.Td(value, id={'type': 'metric-table-value', 'index': index})])
+                for index, (label, value) in enumerate(zip(METRICS_TABLE_LABELS, values))
             ])
         ], bordered=True, hover=True, responsive=True, striped=True)
     
     def run(self, debug=True, port=8050):
         """Run the dashboard"""
         logger.info(f"Starting Solar Ascension Analytics Dashboard on port {port}")
-        self.app.run_server(debug=debug, port=port)
+        self.snapshots.start()
+        try:
+            # The reloader would fork a second process with its own collector; each
+            # push client holds a request thread, so the server must be threaded
+            self.app.run(debug=debug, port=port, use_reloader=False, threaded=True)
+        finally:
+            self.stream.close()
+            self.snapshots.stop()
+
+def create_worker_server():
+    """WSGI app for one of many serving workers reading the shared-memory snapshot.
+
+    Run exactly one ``python shared_snapshot.py`` collector alongside, e.g.
+    ``gunicorn -w 8 -k gthread --threads 32 'analytics_dashboard:create_worker_server()'``.
+    """
+    from shared_snapshot import DEFAULT_SHM_NAME, SharedSnapshotReader
+    
+    reader = SharedSnapshotReader(os.getenv('SOLAR_SNAPSHOT_SHM', DEFAULT_SHM_NAME))
+    dashboard = DashboardApp(snapshot_source=reader)
+    reader.start()
+    return dashboard.app.server
 
 async def main():
     """Main execution function"""
@@ -472,7 +1126,10 @@ async def main():
         credentials['openai_api_key']
     )
     
-    analytics_collector = AnalyticsCollector(ai_engine)
+    rollups = MetricsRollupStore(os.getenv('SOLAR_ROLLUP_DB', 'solar_analytics_rollups.db'))
+    social_ingestor = build_social_ingestor(os.getenv('SOLAR_SOCIAL_DB', 'solar_social_metrics.db'))
+    analytics_collector = AnalyticsCollector(ai_engine, rollups=rollups, anomaly_detector=AnomalyDetector(),
+                                             social_ingestor=social_ingestor)
     dashboard = DashboardApp(analytics_collector)
     
     # Run dashboard
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Analytics Store
+Fixed-capacity ring buffer of post records with O(1) running aggregates
+"""
+
+import json
+import logging
+import math
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PostRecordStore:
+    """Ring buffer of recent post records backed by preallocated arrays.
+
+    Records get monotonically increasing integer IDs, so concurrent posts can
+    never collide the way ``datetime.now().isoformat()`` keys could. Once the
+    buffer is full the oldest record is appended to an on-disk JSONL log
+    before its slot is reused, keeping resident memory constant. All summary
+    figures are maintained incrementally and never require a buffer scan.
+    """
+
+    def __init__(self, capacity: int = 1024, spill_path: Optional[str] = "solar_ascension_posts.jsonl",
+                 preview_chars: int = 100, spill_flush_every: int = 64):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.preview_chars = preview_chars
+        self.spill_flush_every = spill_flush_every
+
+        # Preallocated columns, one slot per record
+        self._ids = array('q', bytes(8 * capacity))
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._lengths = array('q', bytes(8 * capacity))
+        self._engagement = array('q', bytes(8 * capacity))
+        self._previews: List[Optional[str]] = [None] * capacity
+
+        self._next_id = 1
+        self._size = 0
+        self._lock = threading.Lock()
+        self._spill_file = None
+        self._spill_pending = 0
+
+        # Lifetime aggregates (include spilled records)
+        self.total_posts = 0
+        self.total_length = 0
+        self.total_length_sq = 0
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.engagement_total = 0
+        self.spilled_posts = 0
+
+        # Aggregates over the records currently held in memory
+        self.window_length = 0
+        self.window_engagement = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, content: str, engagement: int = 0, timestamp: Optional[datetime] = None) -> int:
+        """Record a post and return its ID"""
+        length = len(content)
+        ts = (timestamp or datetime.now()).timestamp()
+
+        with self._lock:
+            post_id = self._next_id
+            self._next_id += 1
+            slot = (post_id - 1) % self.capacity
+
+            if self._size == self.capacity:
+                self._evict(slot)
+            else:
+                self._size += 1
+
+            self._ids[slot] = post_id
+            self._timestamps[slot] = ts
+            self._lengths[slot] = length
+            self._engagement[slot] = engagement
+            self._previews[slot] = content[:self.preview_chars]
+
+            self.total_posts += 1
+            self.total_length += length
+            self.total_length_sq += length * length
+            self.min_length = length if self.min_length is None else min(self.min_length, length)
+            self.max_length = length if self.max_length is None else max(self.max_length, length)
+            self.engagement_total += engagement
+            self.window_length += length
+            self.window_engagement += engagement
+
+        return post_id
+
+    def record_engagement(self, post_id: int, engagement: int) -> bool:
+        """Update the engagement count of a post still held in memory"""
+        with self._lock:
+            slot = (post_id - 1) % self.capacity
+            if post_id <= 0 or self._ids[slot] != post_id:
+                return False
+
+            delta = engagement - self._engagement[slot]
+            self._engagement[slot] = engagement
+            self.engagement_total += delta
+            self.window_engagement += delta
+            return True
+
+    def get(self, post_id: int) -> Optional[Dict]:
+        """Get a single in-memory record by ID"""
+        with self._lock:
+            slot = (post_id - 1) % self.capacity
+            if post_id <= 0 or self._ids[slot] != post_id:
+                return None
+            return self._record_at(slot)
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Get the most recent records, newest first"""
+        with self._lock:
+            count = min(limit, self._size)
+            last_id = self._next_id - 1
+            return [self._record_at((last_id - 1 - i) % self.capacity) for i in range(count)]
+
+    def summary(self) -> Dict:
+        """Get running aggregates without scanning the buffer"""
+        with self._lock:
+            mean_length = self.total_length / self.total_posts if self.total_posts else 0.0
+            variance = self.total_length_sq / self.total_posts - mean_length ** 2 if self.total_posts else 0.0
+
+            return {
+                "posts_made": self.total_posts,
+                "posts_in_memory": self._size,
+                "posts_spilled": self.spilled_posts,
+                "capacity": self.capacity,
+                "length_mean": mean_length,
+                "length_std": math.sqrt(max(variance, 0.0)),
+                "length_min": self.min_length or 0,
+                "length_max": self.max_length or 0,
+                "engagement_total": self.engagement_total,
+                "window_length_mean": self.window_length / self._size if self._size else 0.0,
+                "window_engagement": self.window_engagement,
+                "last_post_id": self._next_id - 1
+            }
+
+    def flush(self):
+        """Flush spilled records to disk"""
+        with self._lock:
+            if self._spill_file:
+                self._spill_file.flush()
+                self._spill_pending = 0
+
+    def close(self):
+        """Flush and close the spill log"""
+        with self._lock:
+            if self._spill_file:
+                self._spill_file.close()
+                self._spill_file = None
+                self._spill_pending = 0
+
+    def _record_at(self, slot: int) -> Dict:
+        return {
+            "id": self._ids[slot],
+            "timestamp": datetime.fromtimestamp(self._timestamps[slot]).isoformat(),
+            "content": self._previews[slot],
+            "length": self._lengths[slot],
+            "engagement": self._engagement[slot]
+        }
+
+    def _evict(self, slot: int):
+        """Spill the record in ``slot`` to disk and drop it from the window"""
+        self.window_length -= self._lengths[slot]
+        self.window_engagement -= self._engagement[slot]
+        self.spilled_posts += 1
+
+        if not self.spill_path:
+            return
+
+        try:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            self._spill_file.write(json.dumps(self._record_at(slot), ensure_ascii=False) + "\n")
+            self._spill_pending += 1
+            if self._spill_pending >= self.spill_flush_every:
+                self._spill_file.flush()
+                self._spill_pending = 0
+        except OSError as e:
+            logger.error(f"Error spilling post record {self._ids[slot]}: {e}")
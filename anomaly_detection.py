@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Anomaly Detection
+Online EWMA z-score, stuck-value and rate-of-change checks over every collected metric,
+plus flags for values the collector filled from defaults
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from metrics_registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+ANOMALIES_DETECTED = REGISTRY.counter(
+    "solar_analytics_anomalies_total", "Metric series newly flagged as anomalous", labels=("kind",)
+)
+ANOMALOUS_SERIES = REGISTRY.gauge("solar_analytics_anomalous_series", "Metric series currently flagged").labels()
+
+# Checked in this order; a series flagged by several checks reports the first
+ANOMALY_KINDS = ("fallback", "stuck", "rate", "zscore")
+_FALLBACK, _STUCK, _RATE, _ZSCORE = 1, 2, 3, 4
+
+# Context keys of generated content -> the collected series they are taken from
+CONTENT_CONTEXT_SERIES = {
+    "current_production_mw": "solar_production.current_production_mw",
+    "total_capacity_mw": "solar_production.total_capacity_mw",
+    "market_price": "solar_production.market_price_usd_mwh",
+    "carbon_saved_tons": "solar_production.carbon_saved_tons",
+    "efficiency_percent": "solar_production.efficiency_percent"
+}
+
+@dataclass(frozen=True)
+class Anomaly:
+    """One series currently flagged, with the value and expectation that triggered it"""
+    series: str
+    kind: str
+    value: float
+    expected: float
+    # z-score, ticks without change, change per second or ticks on a default, depending on kind
+    score: float
+    since: datetime
+
+    def as_dict(self) -> Dict:
+        data = asdict(self)
+        data["since"] = self.since.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Anomaly":
+        return cls(**{**data, "since": datetime.fromisoformat(data["since"])})
+
+class AnomalyDetector:
+    """Constant-memory online detector for many metric series at once.
+
+    Each series keeps an exponentially weighted mean and variance, its last
+    value and timestamp, the length of its current run of identical values
+    and how often it usually changes. Every tick is one pass of NumPy array
+    operations over all series, so cost grows with the number of series but
+    not with history length. Four checks run per tick:
+
+    - fallback: the caller reports the value as a default substituted for an
+      unavailable source. It is flagged from the first tick and kept out of
+      the series state, so a source that is down from startup or changes
+      only hourly is still caught.
+    - z-score: distance from the EWMA mean in EWMA standard deviations
+    - stuck: a series that normally changes most ticks repeats one value
+    - rate: change per second beyond an optional per-series bound
+    """
+
+    def __init__(self, alpha: float = 0.1, z_threshold: float = 4.0, warmup: int = 20, stuck_ticks: int = 10,
+                 min_change_rate: float = 0.5, rate_limits: Optional[Mapping[str, float]] = None):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.stuck_ticks = stuck_ticks
+        self.min_change_rate = min_change_rate
+        self.rate_limits = dict(rate_limits or {})
+
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._keys: Optional[tuple] = None
+        self._key_indices = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._allocate(64)
+        self.active: Dict[str, Anomaly] = {}
+
+    def _allocate(self, capacity: int):
+        old = self._size
+        fresh = {
+            "count": np.zeros(capacity, dtype=np.int64),
+            "mean": np.zeros(capacity),
+            "var": np.zeros(capacity),
+            "last": np.full(capacity, np.nan),
+            "last_time": np.zeros(capacity),
+            "stuck_run": np.zeros(capacity, dtype=np.int64),
+            "fallback_run": np.zeros(capacity, dtype=np.int64),
+            "change_rate": np.zeros(capacity),
+            "run_change_rate": np.zeros(capacity),
+            "rate_limit": np.full(capacity, np.inf),
+            "flag": np.zeros(capacity, dtype=np.int8)
+        }
+        for name, array in fresh.items():
+            if old:
+                array[:old] = getattr(self, f"_{name}")[:old]
+            setattr(self, f"_{name}", array)
+
+    def register(self, series: Iterable[str]) -> np.ndarray:
+        """Indices of the given series in the state arrays, adding unknown ones"""
+        indices = []
+        for name in series:
+            index = self._index.get(name)
+            if index is None:
+                if self._size == len(self._count):
+                    self._allocate(2 * len(self._count))
+                index = self._size
+                self._size += 1
+                self._index[name] = index
+                self._names.append(name)
+                self._rate_limit[index] = self.rate_limits.get(name, np.inf)
+            indices.append(index)
+        return np.asarray(indices, dtype=np.int64)
+
+    @property
+    def series(self) -> List[str]:
+        return list(self._names)
+
+    def is_flagged(self, series: str) -> bool:
+        return series in self.active
+
+    def observe(self, values: Mapping[str, float], timestamp: Optional[datetime] = None,
+                fallbacks: Iterable[str] = ()) -> List[Anomaly]:
+        """Fold one tick of named values into the state; returns every currently flagged series.
+
+        ``fallbacks`` names the series whose values are defaults standing in for a failed source.
+        """
+        keys = tuple(values)
+        if keys != self._keys:
+            self._keys, self._key_indices = keys, self.register(keys)
+        row = np.full(self._size, np.nan)
+        row[self._key_indices] = np.fromiter(values.values(), dtype=np.float64, count=len(keys))
+        fallback = None
+        fallbacks = [self._index[name] for name in fallbacks if name in self._index]
+        if fallbacks:
+            fallback = np.zeros(self._size, dtype=bool)
+            fallback[fallbacks] = True
+        return self.observe_array(row, timestamp, fallback)
+
+    def observe_array(self, row: np.ndarray, timestamp: Optional[datetime] = None,
+                      fallback: Optional[np.ndarray] = None) -> List[Anomaly]:
+        """Fold one tick given as an array in ``series`` order; NaN marks a missing value.
+
+        ``fallback`` is an optional boolean mask of values substituted from defaults.
+        """
+        timestamp = timestamp or datetime.now()
+        now = timestamp.timestamp()
+        size = self._size
+        raw = np.asarray(row, dtype=np.float64)[:size]
+        fallback = np.zeros(size, dtype=bool) if fallback is None else np.asarray(fallback, dtype=bool)[:size]
+        fallback &= ~np.isnan(raw)
+        # Defaults say nothing about the real series, so they are treated as missing values
+        x = np.where(fallback, np.nan, raw)
+        count, mean, var, last = self._count[:size], self._mean[:size], self._var[:size], self._last[:size]
+        stuck_run, change_rate = self._stuck_run[:size], self._change_rate[:size]
+        run_change_rate = self._run_change_rate[:size]
+
+        valid = ~np.isnan(x)
+        seen = valid & (count > 0)
+        warm = valid & (count >= self.warmup)
+        delta = np.where(valid, x - mean, 0.0)
+
+        # Checks use the state from before this value
+        std = np.sqrt(var)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(std > 1e-12, np.abs(delta) / std, 0.0)
+            elapsed = now - self._last_time[:size]
+            rate = np.where(seen & (elapsed > 0), np.abs(x - last) / np.where(elapsed > 0, elapsed, 1.0), 0.0)
+
+        same = seen & (x == last)
+        run_change_rate[same & (stuck_run == 0)] = change_rate[same & (stuck_run == 0)]
+        stuck_run[:] = np.where(same, stuck_run + 1, np.where(valid, 0, stuck_run))
+
+        kind = np.zeros(size, dtype=np.int8)
+        kind[warm & (z > self.z_threshold)] = _ZSCORE
+        kind[seen & (rate > self._rate_limit[:size])] = _RATE
+        kind[warm & (stuck_run >= self.stuck_ticks) & (run_change_rate >= self.min_change_rate)] = _STUCK
+        # A missing value neither raises nor clears a flag
+        kind = np.where(valid, kind, self._flag[:size])
+        kind[fallback] = _FALLBACK
+
+        expected = mean.copy()
+        # EWMA update (incremental form of the exponentially weighted variance)
+        increment = self.alpha * delta
+        mean[:] = np.where(seen, mean + increment, np.where(valid, x, mean))
+        var[:] = np.where(seen, (1 - self.alpha) * (var + delta * increment), var)
+        change_rate[:] = np.where(seen, (1 - self.alpha) * change_rate + self.alpha * ~same, change_rate)
+        last[:] = np.where(valid, x, last)
+        self._last_time[:size][valid] = now
+        count += valid
+
+        fallback_run = self._fallback_run[:size]
+        fallback_run[:] = np.where(fallback, fallback_run + 1, np.where(valid, 0, fallback_run))
+
+        shown = np.where(fallback, raw, last)
+        self._update_active(kind, shown, expected, z, stuck_run, rate, fallback_run, timestamp)
+        return list(self.active.values())
+
+    def _update_active(self, kind: np.ndarray, shown: np.ndarray, expected: np.ndarray, z: np.ndarray,
+                       stuck_run: np.ndarray, rate: np.ndarray, fallback_run: np.ndarray, timestamp: datetime):
+        # Python-level work is proportional to the flagged series only
+        previous = self._flag[:len(kind)]
+        scores = {_ZSCORE: z, _STUCK: stuck_run, _RATE: rate, _FALLBACK: fallback_run}
+        active = {}
+        for index in np.flatnonzero(kind).tolist():
+            name = self._names[index]
+            code = int(kind[index])
+            kind_name = ANOMALY_KINDS[code - 1]
+            earlier = self.active.get(name)
+            if earlier is None or earlier.kind != kind_name:
+                ANOMALIES_DETECTED.labels(kind=kind_name).inc()
+                logger.warning(f"Anomalous metric {name}: {kind_name} "
+                               f"(value {shown[index]:g}, expected {expected[index]:g})")
+            active[name] = Anomaly(
+                series=name,
+                kind=kind_name,
+                value=float(shown[index]),
+                expected=float(expected[index]),
+                score=float(scores[code][index]),
+                since=earlier.since if earlier is not None and earlier.kind == kind_name else timestamp
+            )
+        for name in self.active.keys() - active.keys():
+            logger.info(f"Metric {name} is back to normal")
+
+        self.active = active
+        previous[:] = kind
+        ANOMALOUS_SERIES.set(len(active))
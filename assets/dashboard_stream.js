@@ -0,0 +1,87 @@
+// Browser half of the dashboard's server-push channel (see snapshot_stream.py).
+// Frames arrive over Server-Sent Events and are applied here, so live updates
+// cost the server one encoding per snapshot regardless of how many viewers.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    solar: {
+        connect: function () {
+            if (window.solarStream) {
+                return window.dash_clientside.no_update;
+            }
+            var stream = window.solarStream = {sequence: null, source: null};
+            var open = function () {
+                stream.source = new EventSource('/stream');
+                stream.source.addEventListener('snapshot', function (event) {
+                    var frame = JSON.parse(event.data);
+                    // Panels carry absolute values, so each is handed to its own store as it arrives
+                    Object.keys(frame.panels || {}).forEach(function (name) {
+                        window.dash_clientside.set_props('panel-' + name, {data: frame.panels[name]});
+                    });
+                    window.dash_clientside.set_props('snapshot-push', {data: frame});
+                });
+            };
+            // A fresh connection is always answered with a full frame
+            stream.reconnect = function () {
+                stream.source.close();
+                stream.sequence = null;
+                open();
+            };
+            open();
+            return 'connected';
+        },
+
+        applyFrame: function (frame, range) {
+            var noUpdate = window.dash_clientside.no_update;
+            var stream = window.solarStream;
+            if (!frame || !stream) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            if (!frame.reset && stream.sequence !== null && frame.from_sequence !== stream.sequence) {
+                // A delta was missed; resynchronise rather than draw a gap
+                stream.reconnect();
+                throw window.dash_clientside.PreventUpdate;
+            }
+            stream.sequence = frame.sequence;
+
+            var extend = noUpdate;
+            if (range === 'live' && frame.points.x.length) {
+                // maxPoints equal to the window length makes a full frame replace the series
+                var maxPoints = frame.reset ? frame.points.x.length : frame.max_points;
+                extend = [{x: [frame.points.x], y: [frame.points.y]}, [0], maxPoints];
+            }
+            return [extend, range === 'live' ? noUpdate : frame.version];
+        },
+
+        applyCards: function (values) {
+            if (!values) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return values;
+        },
+
+        applyAlerts: function (anomalies) {
+            if (!anomalies) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return [anomalies.length > 0, 'Suspect metrics: ' + anomalies.map(function (a) {
+                return a.series + ' (' + a.kind + ': ' + a.value.toPrecision(4) +
+                    ', expected ~' + a.expected.toPrecision(4) + ')';
+            }).join('; ')];
+        },
+
+        applyTable: function (values) {
+            if (!values) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return values;
+        },
+
+        withTraceValues: function (figure, key, values) {
+            if (!values || !figure) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            var trace = Object.assign({}, figure.data[0]);
+            trace[key] = values;
+            return Object.assign({}, figure, {data: [trace]});
+        }
+    }
+});
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Benchmark Suite
+End-to-end and micro benchmarks against local stand-ins, with baseline regression checks
+
+Usage:
+    python benchmark_suite.py --output bench_results.json
+    python benchmark_suite.py --baseline bench_results.json --threshold 0.15
+    python benchmark_suite.py --import-budget
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from analytics_dashboard import AnalyticsCollector
+from downsampling import DownsampleCache, lttb
+from local_standins import build_standin_engine, build_standin_social_ingestor, quiet_logging
+from metrics_query import aggregate_buckets
+from multi_platform_engine import MultiPlatformEngine
+from policy_advocacy import AdvocacyAutomation, PolicyTracker
+
+# Cumulative import-time budgets (ms) for the cron-driven entry points
+IMPORT_BUDGETS_MS = {
+    "ai_engine": 250,
+    "policy_advocacy": 250,
+    "multi_platform_engine": 250
+}
+
+class BenchmarkCase:
+    """A named benchmark; ``fn`` is sync or async and runs one iteration"""
+
+    def __init__(self, name: str, fn: Callable, iterations: int = 200, warmup: int = 5, ops_per_iteration: int = 1):
+        self.name = name
+        self.fn = fn
+        self.iterations = iterations
+        self.warmup = warmup
+        self.ops_per_iteration = ops_per_iteration
+
+class BenchmarkSuite:
+    """Registers and runs benchmark cases"""
+
+    def __init__(self, api_latency: float = 0.0, llm_latency: float = 0.0, iteration_scale: float = 1.0):
+        self.api_latency = api_latency
+        self.llm_latency = llm_latency
+        self.iteration_scale = iteration_scale
+        self.cases: List[BenchmarkCase] = []
+
+    def add(self, name: str, iterations: int = 200, warmup: int = 5, ops_per_iteration: int = 1):
+        """Decorator registering a benchmark case"""
+        def decorator(fn):
+            scaled = max(1, int(iterations * self.iteration_scale))
+            self.cases.append(BenchmarkCase(name, fn, scaled, warmup, ops_per_iteration))
+            return fn
+        return decorator
+
+    async def _run_case(self, case: BenchmarkCase) -> Dict:
+        is_async = asyncio.iscoroutinefunction(case.fn)
+        for _ in range(case.warmup):
+            if is_async:
+                await case.fn()
+            else:
+                case.fn()
+
+        samples = []
+        for _ in range(case.iterations):
+            start = time.perf_counter_ns()
+            if is_async:
+                await case.fn()
+            else:
+                case.fn()
+            samples.append((time.perf_counter_ns() - start) / case.ops_per_iteration)
+
+        samples.sort()
+        mean_ns = statistics.fmean(samples)
+        return {
+            "iterations": case.iterations,
+            "ops_per_iteration": case.ops_per_iteration,
+            "mean_us": mean_ns / 1e3,
+            "p50_us": samples[len(samples) // 2] / 1e3,
+            "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1e3,
+            "min_us": samples[0] / 1e3,
+            "ops_per_sec": 1e9 / mean_ns if mean_ns else 0.0
+        }
+
+    async def run(self, name_filter: Optional[str] = None) -> Dict:
+        results = {}
+        for case in self.cases:
+            if name_filter and name_filter not in case.name:
+                continue
+            results[case.name] = await self._run_case(case)
+            print(f"{case.name:<48} mean {results[case.name]['mean_us']:>12.2f}us  "
+                  f"p95 {results[case.name]['p95_us']:>12.2f}us", file=sys.stderr)
+        return results
+
+def build_suite(api_latency: float = 0.0, llm_latency: float = 0.0, iteration_scale: float = 1.0) -> BenchmarkSuite:
+    """Register all benchmark cases against stand-in engines"""
+    suite = BenchmarkSuite(api_latency, llm_latency, iteration_scale)
+    engine = build_standin_engine(api_latency, llm_latency)
+    multi_platform = MultiPlatformEngine(engine)
+    policy_tracker = PolicyTracker()
+    advocacy = AdvocacyAutomation(policy_tracker, engine)
+    # Every tick runs every collector, so the benchmark measures a full collection
+    collector = AnalyticsCollector(engine, collection_intervals={})
+    bill = policy_tracker.get_priority_bills()[0]
+    solar_data = asyncio.run(engine.collect_real_time_data())
+
+    @suite.add("solar_data_api.calculate_solar_production", iterations=200, ops_per_iteration=1000)
+    def calculate_solar_production():
+        for irradiance in range(1000):
+            engine.data_api.calculate_solar_production(float(irradiance), 150000)
+
+    @suite.add("solar_data_api.calculate_carbon_savings", iterations=200, ops_per_iteration=1000)
+    def calculate_carbon_savings():
+        for production in range(1000):
+            engine.data_api.calculate_carbon_savings(float(production))
+
+    @suite.add("research_database.get_recent_insights", iterations=200, ops_per_iteration=100)
+    def get_recent_insights():
+        for _ in range(100):
+            engine.research_db.get_recent_insights(days=7)
+
+    @suite.add("research_database.get_insights_by_category", iterations=200, ops_per_iteration=100)
+    def get_insights_by_category():
+        for _ in range(100):
+            engine.research_db.get_insights_by_category("policy")
+
+    @suite.add("engine.generate_contextual_content", iterations=100)
+    async def generate_contextual_content():
+        await engine.generate_contextual_content(solar_data)
+
+    @suite.add("engine.run_content_cycle", iterations=100)
+    async def run_content_cycle():
+        await engine.run_content_cycle()
+
+    @suite.add("multi_platform.post_to_all_platforms", iterations=50)
+    async def post_to_all_platforms():
+        await multi_platform.post_to_all_platforms()
+
+    @suite.add("advocacy.run_advocacy_campaign", iterations=50)
+    async def run_advocacy_campaign():
+        await advocacy.run_advocacy_campaign(bill)
+
+    @suite.add("analytics.collect_all_metrics", iterations=100)
+    async def collect_all_metrics():
+        await collector.collect_all_metrics()
+
+    social_ingestor = build_standin_social_ingestor(api_latency=api_latency)
+
+    @suite.add("social.ingest_changes_all_platforms", iterations=100)
+    async def ingest_social_changes():
+        await social_ingestor.ingest(force=True)
+
+    # ~19 years of minute-level production data
+    series_x = np.arange(10_000_000, dtype=np.int64).astype("datetime64[m]")
+    series_y = np.cumsum(np.random.default_rng(0).normal(size=len(series_x)))
+    downsample_cache = DownsampleCache()
+
+    @suite.add("downsampling.lttb_10m_points_to_2000", iterations=5, warmup=1)
+    def lttb_10m_points():
+        lttb(series_x, series_y, 2000)
+
+    @suite.add("downsampling.cached_range_lookup", iterations=200, ops_per_iteration=100)
+    def cached_range_lookup():
+        for _ in range(100):
+            downsample_cache.get_or_compute(("solar", "year", 2000, 1), lambda: lttb(series_x, series_y, 2000))
+
+    # A year of per-minute history points
+    year_timestamps = series_x[:525_600].astype("datetime64[ns]").astype(np.int64)
+    year_values = series_y[:525_600]
+
+    @suite.add("history_query.hourly_p95_over_a_year", iterations=20, warmup=2)
+    def hourly_p95_over_a_year():
+        aggregate_buckets(year_timestamps, year_values, 3600 * 10**9, "p95")
+
+    return suite
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Return cases whose mean time regressed by more than ``threshold``"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("mean_us"):
+            continue
+        change = current["mean_us"] / previous["mean_us"] - 1.0
+        current["baseline_mean_us"] = previous["mean_us"]
+        current["change"] = change
+        if change > threshold:
+            regressions.append({"name": name, "baseline_us": previous["mean_us"],
+                                "current_us": current["mean_us"], "change": change})
+    return regressions
+
+def measure_import_time(module: str, runs: int = 3) -> float:
+    """Best-of-N cumulative import time of ``module`` in ms, from ``-X importtime``"""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=repo_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best = None
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        for _ in range(runs):
+            # Run from a scratch directory so import-time side effects (log files) stay out of the tree
+            completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                       capture_output=True, text=True, cwd=scratch_dir, env=env, check=True)
+            for line in completed.stderr.splitlines():
+                if not line.startswith("import time:"):
+                    continue
+                fields = line.split("|")
+                if len(fields) == 3 and fields[2].strip() == module:
+                    cumulative_ms = int(fields[1]) / 1000
+                    best = cumulative_ms if best is None else min(best, cumulative_ms)
+
+    if best is None:
+        raise RuntimeError(f"No importtime entry for {module}")
+    return best
+
+def check_import_budgets(budgets: Dict[str, float] = IMPORT_BUDGETS_MS) -> Dict:
+    """Measure each module's import time against its budget"""
+    results = {}
+    for module, budget_ms in budgets.items():
+        elapsed_ms = measure_import_time(module)
+        results[module] = {"import_ms": elapsed_ms, "budget_ms": budget_ms, "within_budget": elapsed_ms <= budget_ms}
+        status = "ok" if elapsed_ms <= budget_ms else "OVER BUDGET"
+        print(f"import {module:<32} {elapsed_ms:>8.1f}ms / {budget_ms}ms  {status}", file=sys.stderr)
+    return results
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Solar Ascension benchmark suite")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative slowdown that counts as a regression (default 0.15)")
+    parser.add_argument("--filter", help="Only run cases whose name contains this string")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="Simulated NREL/EIA latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated OpenAI latency")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply iteration counts")
+    parser.add_argument("--import-budget", action="store_true",
+                        help="Only check entry-point import times against IMPORT_BUDGETS_MS")
+    parser.add_argument("--verbose", action="store_true", help="Keep error logging from the code under test")
+    args = parser.parse_args(argv)
+
+    if args.import_budget:
+        import_times = check_import_budgets()
+        return 0 if all(result["within_budget"] for result in import_times.values()) else 1
+
+    quiet_logging(logging.WARNING if args.verbose else logging.CRITICAL)
+    suite = build_suite(args.api_latency_ms / 1000, args.llm_latency_ms / 1000, args.scale)
+    results = asyncio.run(suite.run(args.filter))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "api_latency_ms": args.api_latency_ms,
+            "llm_latency_ms": args.llm_latency_ms
+        },
+        "results": results
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']}: {regression['baseline_us']:.2f}us -> "
+                  f"{regression['current_us']:.2f}us ({regression['change']:+.1%})", file=sys.stderr)
+        if regressions:
+            exit_code = 1
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
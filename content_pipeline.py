@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Content Pipeline
+Staged async pipeline overlapping data collection, generation and posting
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from ai_engine import SolarAscensionAIEngine
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream between stages
+_END = object()
+
+@dataclass
+class StageMetrics:
+    """Throughput and utilisation counters for one pipeline stage"""
+    name: str
+    items_processed: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    waiting_input_seconds: float = 0.0
+    blocked_output_seconds: float = 0.0
+    last_latency_seconds: float = 0.0
+
+    def to_dict(self, elapsed: float) -> Dict:
+        elapsed = max(elapsed, 1e-9)
+        return {
+            "items_processed": self.items_processed,
+            "errors": self.errors,
+            "throughput_per_hour": self.items_processed / elapsed * 3600,
+            "utilisation": self.busy_seconds / elapsed,
+            "waiting_input_seconds": self.waiting_input_seconds,
+            "blocked_output_seconds": self.blocked_output_seconds,
+            "avg_latency_seconds": self.busy_seconds / self.items_processed if self.items_processed else 0.0,
+            "last_latency_seconds": self.last_latency_seconds
+        }
+
+@dataclass
+class QueueMetrics:
+    """Depth statistics for a bounded queue between two stages"""
+    maxsize: int
+    max_depth: int = 0
+    depth_samples: int = 0
+    depth_total: int = 0
+
+    def sample(self, depth: int):
+        self.max_depth = max(self.max_depth, depth)
+        self.depth_samples += 1
+        self.depth_total += depth
+
+    def to_dict(self, current_depth: int) -> Dict:
+        return {
+            "maxsize": self.maxsize,
+            "depth": current_depth,
+            "max_depth": self.max_depth,
+            "avg_depth": self.depth_total / self.depth_samples if self.depth_samples else 0.0
+        }
+
+class PostRateLimiter:
+    """Spaces out posts to respect a posts-per-hour budget"""
+
+    def __init__(self, posts_per_hour: Optional[float] = None):
+        self.min_interval = 3600.0 / posts_per_hour if posts_per_hour else 0.0
+        self._next_allowed = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until the next post is allowed"""
+        if not self.min_interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_allowed > now:
+                await asyncio.sleep(self._next_allowed - now)
+                now = time.monotonic()
+            self._next_allowed = now + self.min_interval
+
+@dataclass
+class _PostJob:
+    cycle: int
+    solar_data: Any
+    content: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+class ContentPipeline:
+    """Collect -> generate -> post pipeline with bounded queues between stages.
+
+    While cycle N is waiting on the posting stage, cycle N+1 is already being
+    collected and generated. Because the queues are bounded, a rate-limited
+    posting stage blocks the generator, which in turn blocks the collector,
+    so no stage runs ahead of what can actually be published.
+    """
+
+    def __init__(self, engine: "SolarAscensionAIEngine", queue_size: int = 2,
+                 posts_per_hour: Optional[float] = None, cycle_interval: float = 0.0,
+                 multi_platform=None):
+        self.engine = engine
+        self.queue_size = queue_size
+        self.cycle_interval = cycle_interval
+        self.multi_platform = multi_platform
+        self.rate_limiter = PostRateLimiter(posts_per_hour)
+
+        self.stages = {name: StageMetrics(name) for name in ("collect", "generate", "post")}
+        self.queue_metrics = {name: QueueMetrics(queue_size) for name in ("generate", "post")}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    async def run(self, cycles: Optional[int] = None):
+        """Run the pipeline for ``cycles`` cycles, or forever when None.
+
+        If a stage fails, the other stages are cancelled and the error is re-raised.
+        """
+        self._queues = {name: asyncio.Queue(maxsize=self.queue_size) for name in ("generate", "post")}
+        self._started_at = time.monotonic()
+        self._finished_at = None
+
+        logger.info(f"Starting content pipeline (queue size {self.queue_size}, cycles {cycles or 'unbounded'})")
+        tasks = [
+            asyncio.create_task(self._collect_stage(cycles)),
+            asyncio.create_task(self._generate_stage()),
+            asyncio.create_task(self._post_stage())
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                # Re-raise the first stage failure
+                task.result()
+        finally:
+            # A failed stage would leave its neighbours blocked on a queue forever
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._finished_at = time.monotonic()
+            logger.info(f"Content pipeline stopped: {self.stages['post'].items_processed} posts published")
+
+    async def _put(self, queue_name: str, item, stage: StageMetrics):
+        queue = self._queues[queue_name]
+        start = time.monotonic()
+        await queue.put(item)
+        stage.blocked_output_seconds += time.monotonic() - start
+        self.queue_metrics[queue_name].sample(queue.qsize())
+
+    async def _get(self, queue_name: str, stage: StageMetrics):
+        start = time.monotonic()
+        item = await self._queues[queue_name].get()
+        stage.waiting_input_seconds += time.monotonic() - start
+        return item
+
+    async def _collect_stage(self, cycles: Optional[int]):
+        stage = self.stages["collect"]
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            start = time.monotonic()
+            try:
+                solar_data = await self.engine.collect_real_time_data()
+            except Exception as e:
+                stage.errors += 1
+                logger.error(f"Pipeline collect stage error: {e}")
+                solar_data = None
+            stage.last_latency_seconds = time.monotonic() - start
+            stage.busy_seconds += stage.last_latency_seconds
+
+            if solar_data is not None:
+                stage.items_processed += 1
+                await self._put("generate", (cycle, solar_data), stage)
+            cycle += 1
+
+            if self.cycle_interval and (cycles is None or cycle < cycles):
+                await asyncio.sleep(self.cycle_interval)
+
+        # Only sent on a clean finish; on failure run() cancels the other stages
+        await self._queues["generate"].put(_END)
+
+    async def _generate_stage(self):
+        stage = self.stages["generate"]
+        while True:
+            item = await self._get("generate", stage)
+            if item is _END:
+                break
+
+            cycle, solar_data = item
+            start = time.monotonic()
+            try:
+                content = await self.engine.generate_contextual_content(solar_data)
+            except Exception as e:
+                stage.errors += 1
+                logger.error(f"Pipeline generate stage error in cycle {cycle}: {e}")
+                continue
+            finally:
+                stage.last_latency_seconds = time.monotonic() - start
+                stage.busy_seconds += stage.last_latency_seconds
+
+            stage.items_processed += 1
+            await self._put("post", _PostJob(cycle, solar_data, content), stage)
+
+        await self._queues["post"].put(_END)
+
+    async def _post_stage(self):
+        stage = self.stages["post"]
+        while True:
+            job = await self._get("post", stage)
+            if job is _END:
+                break
+
+            # Time spent waiting on the rate limiter counts as busy time so a
+            # throttled posting stage shows up as the bottleneck
+            start = time.monotonic()
+            try:
+                await self.rate_limiter.acquire()
+                # Counted once actually published, not merely enqueued in an outbox
+                success = await self.engine.post_content(job.content, wait_published=True)
+                if self.multi_platform is not None:
+                    research_insights = self.engine.research_db.get_recent_insights(days=7)
+                    await self.multi_platform.post_to_all_platforms(
+                        solar_data=job.solar_data, research_insights=research_insights
+                    )
+            except Exception as e:
+                success = False
+                logger.error(f"Pipeline post stage error in cycle {job.cycle}: {e}")
+            finally:
+                stage.last_latency_seconds = time.monotonic() - start
+                stage.busy_seconds += stage.last_latency_seconds
+
+            if success:
+                stage.items_processed += 1
+            else:
+                stage.errors += 1
+
+    def get_metrics(self) -> Dict:
+        """Get per-stage throughput and queue-depth metrics"""
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+
+        stages = {name: metrics.to_dict(elapsed) for name, metrics in self.stages.items()}
+        queues = {
+            name: metrics.to_dict(self._queues[name].qsize() if name in self._queues else 0)
+            for name, metrics in self.queue_metrics.items()
+        }
+        bottleneck = max(stages, key=lambda name: stages[name]["utilisation"]) if elapsed else None
+
+        return {
+            "elapsed_seconds": elapsed,
+            "posts_per_hour": stages["post"]["throughput_per_hour"],
+            "bottleneck_stage": bottleneck,
+            "stages": stages,
+            "queues": queues
+        }
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Dashboard Load Test
+Simulated concurrent viewers against a local dashboard backed by stand-ins
+
+Each simulated viewer loads the page, holds the /stream push channel open and,
+every ``--interval`` seconds, switches the solar range through the Dash
+callback endpoint and revalidates one panel figure with its ETag, like a
+viewer clicking around. The dashboard runs in its own process so its CPU and
+RSS can be measured separately from the clients.
+
+Usage:
+    python dashboard_loadtest.py --clients 50 --duration 60 --output load_results.json
+    python dashboard_loadtest.py --clients 200 --max-p95-ms 250
+    python dashboard_loadtest.py --baseline load_results.json --threshold 0.25
+    python dashboard_loadtest.py --url http://staging:8050 --server-pid 4242
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Solar ranges a viewer cycles through; "live" is answered from the cached live figure
+VIEWER_RANGES = ("day", "live", "week", "hour", "live", "year")
+VIEWER_FIGURES = ("social", "policy", "economic", "metrics-table")
+
+class LoadStats:
+    """Latencies and payload bytes per request kind, plus stream counters"""
+
+    def __init__(self):
+        self.latencies_ms: Dict[str, List[float]] = {}
+        self.bytes: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.frames = 0
+
+    def record(self, kind: str, elapsed_ms: float, size: int):
+        self.latencies_ms.setdefault(kind, []).append(elapsed_ms)
+        self.bytes[kind] = self.bytes.get(kind, 0) + size
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, clients: int) -> Dict:
+        endpoints = {}
+        for kind, samples in sorted(self.latencies_ms.items()):
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]).tolist()
+            endpoints[kind] = {
+                "requests": len(samples),
+                "errors": self.errors.get(kind, 0),
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+                "max_ms": max(samples),
+                "bytes_per_client": self.bytes.get(kind, 0) / clients
+            }
+        for kind, count in self.errors.items():
+            endpoints.setdefault(kind, {"requests": 0, "errors": count})
+        return {
+            "endpoints": endpoints,
+            "frames_per_client": self.frames / clients,
+            "bytes_per_client": sum(self.bytes.values()) / clients
+        }
+
+class ProcessSampler:
+    """CPU time and RSS of a server process, read from /proc (Linux only)"""
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.available = pid is not None and os.path.exists(f"/proc/{pid}/stat")
+        self.peak_rss_bytes = 0
+        self._start_cpu = self._start_wall = None
+
+    def _cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the parenthesised command name; utime and stime are the 12th and 13th
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _rss_bytes(self) -> int:
+        with open(f"/proc/{self.pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def start(self):
+        if self.available:
+            self._start_cpu, self._start_wall = self._cpu_seconds(), time.perf_counter()
+            self.sample()
+
+    def sample(self):
+        if self.available:
+            self.peak_rss_bytes = max(self.peak_rss_bytes, self._rss_bytes())
+
+    async def run(self, stop: asyncio.Event, period: float = 0.5):
+        while not stop.is_set():
+            self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), period)
+            except asyncio.TimeoutError:
+                pass
+
+    def summary(self) -> Dict:
+        if not self.available:
+            return {"available": False}
+        cpu = self._cpu_seconds() - self._start_cpu
+        wall = time.perf_counter() - self._start_wall
+        return {
+            "available": True,
+            "cpu_seconds": cpu,
+            # 100% is one core fully busy
+            "cpu_percent": 100 * cpu / wall if wall else 0.0,
+            "rss_bytes": self._rss_bytes(),
+            "peak_rss_bytes": self.peak_rss_bytes
+        }
+
+def solar_range_payload(dependencies: List[Dict], solar_range: str, refresh: Optional[int], width: int) -> Dict:
+    """Body of the /_dash-update-component request a browser sends when the solar range changes"""
+    callback = next(dep for dep in dependencies if dep["output"] == "solar-production-chart.figure")
+    values = {"solar-range.value": solar_range, "range-refresh.data": refresh, "solar-chart-width.data": width}
+    return {
+        "output": callback["output"],
+        "outputs": {"id": "solar-production-chart", "property": "figure"},
+        "inputs": [{"id": dep["id"], "property": dep["property"], "value": values[f"{dep['id']}.{dep['property']}"]}
+                   for dep in callback["inputs"]],
+        "state": [{"id": dep["id"], "property": dep["property"], "value": None} for dep in callback["state"]],
+        "changedPropIds": ["solar-range.value"]
+    }
+
+async def _timed_request(session, stats: LoadStats, kind: str, method: str, url: str, **kwargs) -> Optional[bytes]:
+    start = time.perf_counter()
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            if response.status >= 400:
+                stats.error(kind)
+                return None
+    except Exception:
+        stats.error(kind)
+        return None
+    stats.record(kind, (time.perf_counter() - start) * 1000, len(body))
+    return body
+
+async def _follow_stream(session, base_url: str, stats: LoadStats):
+    """Hold /stream open like a browser's EventSource, counting frames and bytes"""
+    try:
+        async with session.get(f"{base_url}/stream") as response:
+            async for chunk in response.content.iter_any():
+                stats.bytes["stream"] = stats.bytes.get("stream", 0) + len(chunk)
+                stats.frames += chunk.count(b"event: snapshot")
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        stats.error("stream")
+
+async def simulate_viewer(session, base_url: str, stats: LoadStats, deadline: float, interval: float,
+                          ramp_up: float, rng: random.Random):
+    """One viewer: page load, push stream, then periodic range switches and figure revalidation"""
+    await asyncio.sleep(rng.uniform(0, ramp_up))
+    await _timed_request(session, stats, "page", "GET", f"{base_url}/")
+    await _timed_request(session, stats, "layout", "GET", f"{base_url}/_dash-layout")
+    dependencies = await _timed_request(session, stats, "dependencies", "GET", f"{base_url}/_dash-dependencies")
+    if dependencies is None:
+        return
+    dependencies = json.loads(dependencies)
+    stream = asyncio.create_task(_follow_stream(session, base_url, stats))
+
+    etags: Dict[str, str] = {}
+    ranges = itertools.cycle(VIEWER_RANGES[rng.randrange(len(VIEWER_RANGES)):] + VIEWER_RANGES)
+    figures = itertools.cycle(VIEWER_FIGURES)
+    width = rng.choice((600, 800, 1200))
+    try:
+        while time.perf_counter() < deadline:
+            # Jitter keeps viewers from acting in lockstep
+            await asyncio.sleep(interval * rng.uniform(0.5, 1.5))
+            if time.perf_counter() >= deadline:
+                break
+            await _timed_request(session, stats, "callback.solar_range", "POST", f"{base_url}/_dash-update-component",
+                                 json=solar_range_payload(dependencies, next(ranges), None, width))
+            figure_id = next(figures)
+            headers = {"If-None-Match": etags[figure_id]} if figure_id in etags else {}
+            start = time.perf_counter()
+            try:
+                async with session.get(f"{base_url}/figures/{figure_id}", headers=headers) as response:
+                    body = await response.read()
+                    if response.status >= 400:
+                        stats.error(f"figure.{figure_id}")
+                        continue
+                    if response.headers.get("ETag"):
+                        etags[figure_id] = response.headers["ETag"]
+            except Exception:
+                stats.error(f"figure.{figure_id}")
+                continue
+            stats.record(f"figure.{figure_id}", (time.perf_counter() - start) * 1000, len(body))
+    finally:
+        stream.cancel()
+        await asyncio.gather(stream, return_exceptions=True)
+
+async def run_load(base_url: str, clients: int, duration: float, interval: float, ramp_up: float,
+                   server_pid: Optional[int] = None, seed: int = 0) -> Dict:
+    """Drive ``clients`` simulated viewers for ``duration`` seconds and summarise the run"""
+    import aiohttp
+
+    stats = LoadStats()
+    sampler = ProcessSampler(server_pid)
+    rng = random.Random(seed)
+    stop = asyncio.Event()
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=None, sock_connect=30)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), timeout=timeout) as session:
+        sampler.start()
+        sampling = asyncio.create_task(sampler.run(stop))
+        deadline = time.perf_counter() + ramp_up + duration
+        await asyncio.gather(*(
+            simulate_viewer(session, base_url, stats, deadline, interval, ramp_up, random.Random(rng.random()))
+            for _ in range(clients)
+        ))
+        stop.set()
+        await sampling
+
+    return {**stats.summary(clients), "server": sampler.summary()}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_local_server(port: int, collection_interval: float, api_latency: float) -> subprocess.Popen:
+    """Dashboard in a child process with a stand-in collector, waiting until it answers"""
+    import urllib.request
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=repo_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    # Run from the temp directory so import-time side effects (log files) stay out of the tree
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+         "--collection-interval", str(collection_interval), "--api-latency-ms", str(api_latency * 1000)],
+        cwd=tempfile.gettempdir(), env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Dashboard server exited with code {process.returncode}")
+        try:
+            # Ready once the first snapshot is out, so figures answer 200 rather than 503
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/figures/social", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Dashboard server did not become ready within 60s")
+
+def serve(port: int, collection_interval: float, api_latency: float):
+    """Run the dashboard against stand-ins; the child process of a local load test"""
+    from werkzeug.serving import run_simple
+
+    from analytics_dashboard import AnalyticsCollector, BackgroundCollector, DashboardApp
+    from anomaly_detection import AnomalyDetector
+    from local_standins import build_standin_engine, build_standin_social_ingestor, quiet_logging
+
+    quiet_logging(logging.ERROR)
+    # One access-log line per request would dominate the server's own CPU
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    collector = AnalyticsCollector(build_standin_engine(api_latency), anomaly_detector=AnomalyDetector(),
+                                   social_ingestor=build_standin_social_ingestor(api_latency=api_latency))
+    dashboard = DashboardApp(background_collector=BackgroundCollector(collector, interval=collection_interval))
+    dashboard.snapshots.start()
+    # Each held /stream holds a request thread, as in DashboardApp.run
+    run_simple("127.0.0.1", port, dashboard.app.server, threaded=True)
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Endpoints whose p95 latency regressed by more than ``threshold``"""
+    regressions = []
+    for kind, current in results["endpoints"].items():
+        previous = baseline.get("results", {}).get("endpoints", {}).get(kind)
+        if not previous or not previous.get("p95_ms") or "p95_ms" not in current:
+            continue
+        change = current["p95_ms"] / previous["p95_ms"] - 1.0
+        if change > threshold:
+            regressions.append({"endpoint": kind, "baseline_p95_ms": previous["p95_ms"],
+                                "current_p95_ms": current["p95_ms"], "change": change})
+    return regressions
+
+def _print_report(results: Dict, clients: int):
+    print(f"{'endpoint':<28}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'KB/client':>11}", file=sys.stderr)
+    for kind, endpoint in results["endpoints"].items():
+        if not endpoint.get("requests"):
+            print(f"{kind:<28}{0:>9}{endpoint['errors']:>8}", file=sys.stderr)
+            continue
+        print(f"{kind:<28}{endpoint['requests']:>9}{endpoint['errors']:>8}{endpoint['p50_ms']:>10.1f}"
+              f"{endpoint['p95_ms']:>10.1f}{endpoint['p99_ms']:>10.1f}{endpoint['bytes_per_client'] / 1024:>11.1f}",
+              file=sys.stderr)
+    stream_kb = results["bytes_per_client"] / 1024
+    print(f"{clients} clients, {results['frames_per_client']:.1f} frames and {stream_kb:.1f} KB per client",
+          file=sys.stderr)
+    server = results["server"]
+    if server["available"]:
+        print(f"server CPU {server['cpu_percent']:.0f}% of one core, RSS {server['rss_bytes'] / 2**20:.0f} MiB "
+              f"(peak {server['peak_rss_bytes'] / 2**20:.0f} MiB)", file=sys.stderr)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Solar Ascension dashboard load test")
+    parser.add_argument("--clients", type=int, default=50, help="Simulated concurrent viewers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of steady load after ramp-up")
+    parser.add_argument("--interval", type=float, default=2.0, help="Mean seconds between a viewer's interactions")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which viewers connect")
+    parser.add_argument("--url", help="Test a running dashboard instead of starting a local one")
+    parser.add_argument("--server-pid", type=int, help="PID to measure CPU/RSS of when using --url")
+    parser.add_argument("--collection-interval", type=float, default=1.0,
+                        help="Collector interval of the local dashboard (frames pushed per second)")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="Simulated NREL/EIA latency")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for viewer jitter")
+    parser.add_argument("--output", default="load_results.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", help="Previous results JSON to compare p95 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative p95 slowdown that counts as a regression (default 0.25)")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if any endpoint's p95 latency exceeds this")
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.port, args.collection_interval, args.api_latency_ms / 1000)
+        return 0
+
+    server = None
+    base_url, server_pid = args.url, args.server_pid
+    if base_url is None:
+        port = _free_port()
+        server = start_local_server(port, args.collection_interval, args.api_latency_ms / 1000)
+        base_url, server_pid = f"http://127.0.0.1:{port}", server.pid
+    try:
+        results = asyncio.run(run_load(base_url.rstrip("/"), args.clients, args.duration, args.interval,
+                                       args.ramp_up, server_pid, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+    _print_report(results, args.clients)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "url": args.url or "local stand-ins",
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "interval_s": args.interval,
+            "collection_interval_s": args.collection_interval,
+            "api_latency_ms": args.api_latency_ms
+        },
+        "results": results
+    }
+
+    exit_code = 0
+    failed = [kind for kind, endpoint in results["endpoints"].items() if endpoint.get("errors")]
+    for kind in failed:
+        print(f"ERRORS {kind}: {results['endpoints'][kind]['errors']}", file=sys.stderr)
+    if args.max_p95_ms is not None:
+        over = {kind: endpoint["p95_ms"] for kind, endpoint in results["endpoints"].items()
+                if endpoint.get("p95_ms", 0) > args.max_p95_ms}
+        report["over_budget"] = over
+        for kind, p95 in over.items():
+            print(f"OVER BUDGET {kind}: p95 {p95:.1f}ms > {args.max_p95_ms:.1f}ms", file=sys.stderr)
+        if over:
+            exit_code = 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['endpoint']}: p95 {regression['baseline_p95_ms']:.1f}ms -> "
+                  f"{regression['current_p95_ms']:.1f}ms ({regression['change']:+.1%})", file=sys.stderr)
+        if regressions:
+            exit_code = 1
+    if failed:
+        exit_code = 1
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote load test results to {args.output}", file=sys.stderr)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Downsampling
+Largest-Triangle-Three-Buckets (LTTB) reduction of long time series for charting
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import numpy as np
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the ``n_out`` points LTTB keeps from ``(x, y)``.
+
+    The first and last points are always kept. The interior is split into
+    ``n_out - 2`` equal buckets, and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket. The loop runs once per output point; the work inside each bucket
+    is vectorized.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+    x = x.astype(np.float64, copy=False)
+    y = np.asarray(y, dtype=np.float64)
+    # Gaps (NaN) are left out of bucket means and never win a bucket that has real values
+    finite = np.isfinite(y)
+
+    # Bucket boundaries over the interior points [1, n - 1)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.add.reduceat(finite[:-1].astype(np.int64), edges[:-1])
+    sums_x = np.add.reduceat(np.where(finite, x, 0.0)[:-1], edges[:-1])
+    sums_y = np.add.reduceat(np.where(finite, y, 0.0)[:-1], edges[:-1])
+    # Mean of each bucket (NaN when it is all gap), plus the final point standing in for the
+    # bucket after the last one
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.append(sums_x / counts, x[-1] if finite[-1] else np.nan)
+        mean_y = np.append(sums_y / counts, y[-1] if finite[-1] else np.nan)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    # The last kept point with a value; triangles are anchored on it
+    a = 0 if finite[0] else None
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        if a is None or not counts[bucket]:
+            # Nothing to measure against: keep the bucket's first real value, or the gap itself
+            chosen = lo + int(np.argmax(finite[lo:hi]))
+        elif np.isnan(cx):
+            # The next bucket is all gap: keep the point furthest from the previous one
+            chosen = lo + int(np.nanargmax(np.abs(y[lo:hi] - y[a])))
+        else:
+            ax, ay = x[a], y[a]
+            # Twice the triangle area; the constant factor does not change the argmax
+            areas = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+            chosen = lo + int(np.nanargmax(areas))
+        selected[bucket + 1] = chosen
+        if finite[chosen]:
+            a = chosen
+    return selected
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a series to ``n_out`` points, preserving its visual shape"""
+    indices = lttb_indices(x, y, n_out)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+class DownsampleCache:
+    """LRU cache of downsampled series keyed by (series, range, pixel width, data version)"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Tuple[np.ndarray, np.ndarray]]):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        result = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Engine Host
+Runs many brand accounts' SolarAscensionAIEngine instances on one event loop
+
+Usage:
+    python engine_host.py accounts.json
+
+accounts.json holds a list of account configs, for example:
+    [{"name": "sun-kingdom", "twitter_api_key": "env:SUN_TWITTER_KEY",
+      "twitter_api_secret": "env:SUN_TWITTER_SECRET", "posting_schedule": {"monday": ["09:00"]}}]
+Values written as "env:NAME" are read from the environment.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ai_engine import AIContentGenerator, ResearchDatabase, SolarAscensionAIEngine, SolarDataAPI
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+class CachedSolarDataAPI(SolarDataAPI):
+    """SolarDataAPI whose upstream fetches are cached and de-duplicated across accounts.
+
+    Concurrent callers asking for the same value share one in-flight request,
+    and results are reused for ``ttl`` seconds. Failed fetches are not cached:
+    callers get the default value and the next call asks upstream again.
+    """
+
+    def __init__(self, ttl: float = 300.0, session=None):
+        super().__init__(session=session)
+        self.ttl = ttl
+        self.upstream_requests = 0
+        self._cache: Dict[Tuple, Tuple[float, object]] = {}
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    async def _cached(self, key: Tuple, fetch):
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            self.upstream_requests += 1
+            value = await fetch()
+            if value is not None:
+                self._cache[key] = (time.monotonic(), value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be awaiting; avoid "exception never retrieved" warnings
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def fetch_solar_irradiance(self, lat: float, lon: float) -> Optional[float]:
+        return await self._cached(("irradiance", lat, lon),
+                                  lambda: SolarDataAPI.fetch_solar_irradiance(self, lat, lon))
+
+    async def fetch_energy_market_data(self) -> Optional[Dict]:
+        return await self._cached(("market",), lambda: SolarDataAPI.fetch_energy_market_data(self))
+
+class SharedResources:
+    """Expensive components shared by every account in the host"""
+
+    def __init__(self, data_ttl: float = 300.0, max_concurrent_llm_calls: int = 8):
+        self.data_api = CachedSolarDataAPI(ttl=data_ttl)
+        self.research_db = ResearchDatabase()
+        self.llm_limiter = asyncio.Semaphore(max_concurrent_llm_calls)
+        self._generators: Dict[str, AIContentGenerator] = {}
+        self._session = None
+
+    def generator_for(self, openai_api_key: str) -> AIContentGenerator:
+        """One content generator (and OpenAI client) per distinct API key"""
+        generator = self._generators.get(openai_api_key)
+        if generator is None:
+            generator = AIContentGenerator(openai_api_key, limiter=self.llm_limiter)
+            self._generators[openai_api_key] = generator
+        return generator
+
+    async def open(self, connection_limit: int = 100):
+        """Create the pooled HTTP session shared by all accounts"""
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=connection_limit))
+        self.data_api.session = self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self.data_api.session = None
+
+@dataclass
+class AccountConfig:
+    """Per-account credentials and options"""
+    name: str
+    twitter_api_key: str
+    twitter_api_secret: str
+    openai_api_key: str = ""
+    posting_schedule: Optional[Dict[str, List[str]]] = None
+    post_history_capacity: int = 256
+    post_log_path: Optional[str] = None
+    outbox_path: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AccountConfig":
+        resolved = {key: _resolve_env(value) for key, value in data.items()}
+        resolved.setdefault("openai_api_key", os.getenv('OPENAI_API_KEY', ''))
+        return cls(**resolved)
+
+@dataclass
+class HostedAccount:
+    """An account's engine plus its scheduling state"""
+    config: AccountConfig
+    engine: SolarAscensionAIEngine
+    cycles_run: int = 0
+    last_cycle_seconds: float = 0.0
+    running: bool = False
+    failures: int = 0
+
+def _resolve_env(value):
+    if isinstance(value, str) and value.startswith("env:"):
+        return os.getenv(value[4:], "")
+    return value
+
+def next_run_time(posting_schedule: Dict[str, List[str]], after: datetime) -> Optional[datetime]:
+    """Next scheduled slot strictly after ``after``, honouring weekdays"""
+    for day_offset in range(8):
+        day = after.date() + timedelta(days=day_offset)
+        times = posting_schedule.get(WEEKDAYS[day.weekday()], [])
+        for time_str in sorted(times):
+            hour, minute = (int(part) for part in time_str.split(":"))
+            candidate = datetime(day.year, day.month, day.day, hour, minute)
+            if candidate > after:
+                return candidate
+    return None
+
+class EngineHost:
+    """Loads N account configs and runs their schedules on one event loop"""
+
+    def __init__(self, account_configs: List[AccountConfig], data_ttl: float = 300.0,
+                 max_concurrent_llm_calls: int = 8, max_concurrent_cycles: int = 32):
+        self.shared = SharedResources(data_ttl, max_concurrent_llm_calls)
+        self.cycle_limiter = asyncio.Semaphore(max_concurrent_cycles)
+        self.accounts: Dict[str, HostedAccount] = {}
+        for config in account_configs:
+            self.add_account(config)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "EngineHost":
+        with open(path, encoding="utf-8") as f:
+            configs = [AccountConfig.from_dict(entry) for entry in json.load(f)]
+        return cls(configs, **kwargs)
+
+    def add_account(self, config: AccountConfig) -> HostedAccount:
+        """Create an engine for an account using the shared components"""
+        if config.name in self.accounts:
+            raise ValueError(f"Duplicate account name: {config.name}")
+
+        engine = SolarAscensionAIEngine(
+            config.twitter_api_key,
+            config.twitter_api_secret,
+            config.openai_api_key,
+            post_history_capacity=config.post_history_capacity,
+            post_log_path=config.post_log_path,
+            outbox_path=config.outbox_path,
+            data_api=self.shared.data_api,
+            research_db=self.shared.research_db,
+            ai_generator=self.shared.generator_for(config.openai_api_key)
+        )
+        if config.posting_schedule:
+            engine.posting_schedule = config.posting_schedule
+
+        account = HostedAccount(config, engine)
+        self.accounts[config.name] = account
+        return account
+
+    async def run_cycle(self, account: HostedAccount):
+        """Run one content cycle for an account, bounded by the host-wide limit"""
+        # Marked running while queued for the limiter too, so the scheduler skips overlapping slots
+        account.running = True
+        try:
+            async with self.cycle_limiter:
+                start = time.monotonic()
+                try:
+                    await account.engine.run_content_cycle()
+                    account.cycles_run += 1
+                except Exception as e:
+                    account.failures += 1
+                    logger.error(f"[{account.config.name}] Content cycle failed: {e}")
+                finally:
+                    account.last_cycle_seconds = time.monotonic() - start
+        finally:
+            account.running = False
+
+    async def run(self, run_immediately: bool = False):
+        """Run every account's schedule until cancelled"""
+        await self.shared.open()
+        tasks = set()
+        try:
+            now = datetime.now()
+            queue: List[Tuple[datetime, str]] = []
+            for name, account in self.accounts.items():
+                if run_immediately:
+                    queue.append((now, name))
+                else:
+                    slot = next_run_time(account.engine.posting_schedule, now)
+                    if slot:
+                        queue.append((slot, name))
+            heapq.heapify(queue)
+            logger.info(f"Engine host running {len(self.accounts)} accounts")
+
+            while queue:
+                slot, name = queue[0]
+                delay = (slot - datetime.now()).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(min(delay, 60))
+                    continue
+
+                heapq.heappop(queue)
+                account = self.accounts[name]
+                if account.running:
+                    logger.warning(f"[{name}] Previous cycle still running; skipping slot {slot:%H:%M}")
+                else:
+                    task = asyncio.create_task(self.run_cycle(account))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                following = next_run_time(account.engine.posting_schedule, max(slot, datetime.now()))
+                if following:
+                    heapq.heappush(queue, (following, name))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for account in self.accounts.values():
+                await account.engine.close()
+            await self.shared.close()
+
+    def get_status(self) -> Dict:
+        """Per-account counters plus shared-resource usage"""
+        return {
+            "accounts": {
+                name: {
+                    "cycles_run": account.cycles_run,
+                    "failures": account.failures,
+                    "last_cycle_seconds": account.last_cycle_seconds,
+                    "posts_made": account.engine.analytics["posts_made"]
+                }
+                for name, account in self.accounts.items()
+            },
+            "shared": {
+                "upstream_data_requests": self.shared.data_api.upstream_requests,
+                "content_generators": len(self.shared._generators)
+            }
+        }
+
+async def main():
+    """Main execution function"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    host = EngineHost.from_file(sys.argv[1])
+    await host.run()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Figure Cache
+Render-once cache of dashboard figures keyed on data version, with ETags
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+import plotly.io.json as plotly_json
+
+from metrics_registry import REGISTRY
+
+FIGURE_RENDER_SECONDS = REGISTRY.histogram(
+    "solar_dashboard_figure_render_seconds", "Render and serialization time of a dashboard figure on a cache miss",
+    labels=("figure",)
+)
+FIGURE_CACHE_REQUESTS = REGISTRY.counter(
+    "solar_dashboard_figure_cache_total", "Figure cache lookups by result", labels=("figure", "result")
+)
+
+class CachedFigure:
+    """A rendered figure as plain JSON-compatible data, its serialized body and ETag"""
+    __slots__ = ("figure", "body", "etag")
+
+    def __init__(self, figure: Dict, body: bytes, etag: str):
+        self.figure = figure
+        self.body = body
+        self.etag = etag
+
+class FigureCache:
+    """LRU cache of rendered figures keyed by (figure id, data version, viewport parameters).
+
+    A figure is built and serialized once per key; hits return the stored
+    body without touching Plotly. The ETag is a digest of the body, so
+    clients holding a copy can be answered with 304 Not Modified.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, CachedFigure]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def get(self, figure_id: str, version: Hashable, params: Tuple, render: Callable[[], object]) -> CachedFigure:
+        """Cached figure for the key, calling ``render`` (a go.Figure or dict) only on a miss"""
+        key = (figure_id, version, params)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits[figure_id] = self._hits.get(figure_id, 0) + 1
+        if cached is not None:
+            FIGURE_CACHE_REQUESTS.labels(figure=figure_id, result="hit").inc()
+            return cached
+
+        with FIGURE_RENDER_SECONDS.labels(figure=figure_id).time():
+            figure = render()
+            if hasattr(figure, "to_plotly_json"):
+                figure = figure.to_plotly_json()
+            body = plotly_json.to_json_plotly(figure).encode("utf-8")
+            # Keep plain lists rather than NumPy arrays so later serialization is a plain json.dumps
+            cached = CachedFigure(json.loads(body), body, hashlib.sha1(body).hexdigest()[:20])
+
+        with self._lock:
+            self._misses[figure_id] = self._misses.get(figure_id, 0) + 1
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        FIGURE_CACHE_REQUESTS.labels(figure=figure_id, result="miss").inc()
+        return cached
+
+    def stats(self) -> Dict:
+        """Hit rate per figure and overall"""
+        with self._lock:
+            figure_ids = set(self._hits) | set(self._misses)
+            per_figure = {}
+            for figure_id in sorted(figure_ids):
+                hits, misses = self._hits.get(figure_id, 0), self._misses.get(figure_id, 0)
+                per_figure[figure_id] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+            total_hits, total_misses = sum(self._hits.values()), sum(self._misses.values())
+            return {
+                "entries": len(self._entries),
+                "hit_rate": total_hits / (total_hits + total_misses) if total_hits + total_misses else 0.0,
+                "figures": per_figure
+            }
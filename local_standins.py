@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Local Stand-ins
+Offline replacements for the OpenAI, NREL, EIA and social platform services used by benchmarks and load tests
+"""
+
+import asyncio
+import bisect
+import logging
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import log_config
+from ai_engine import SolarAscensionAIEngine
+from social_ingestion import SOCIAL_PLATFORMS, FetchResult, SocialFetcher, SocialIngestor, SocialMetricsStore, SocialPost
+
+@dataclass
+class _Message:
+    content: str
+
+@dataclass
+class _Choice:
+    message: _Message
+
+@dataclass
+class _Completion:
+    choices: List[_Choice]
+
+class StandInCompletions:
+    """Mimics ``client.chat.completions`` with a canned, deterministic reply"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, model: str, messages: List[Dict], max_tokens: int = 280, temperature: float = 0.7, **kwargs):
+        # Called through asyncio.to_thread, so a blocking sleep models network latency
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        text = f"☀️ Solar update #{self.calls}: {prompt[:120]}"
+        return _Completion(choices=[_Choice(message=_Message(content=text[:max_tokens]))])
+
+class StandInChat:
+    def __init__(self, latency: float = 0.0):
+        self.completions = StandInCompletions(latency)
+
+class StandInOpenAIClient:
+    """Drop-in for ``openai.OpenAI`` that never leaves the process"""
+
+    def __init__(self, latency: float = 0.0):
+        self.chat = StandInChat(latency)
+
+class StandInSolarDataAPI:
+    """Serves fixed irradiance and market prices with optional simulated latency.
+
+    Setting ``irradiance`` or ``market_price`` to None simulates that API being down.
+    """
+
+    def __init__(self, latency: float = 0.0, irradiance: Optional[float] = 650.0,
+                 market_price: Optional[float] = 42.5):
+        self.latency = latency
+        self.irradiance = irradiance
+        self.market_price = market_price
+        self.requests = 0
+
+    async def fetch_solar_irradiance(self, lat: float, lon: float) -> Optional[float]:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.irradiance
+
+    async def fetch_energy_market_data(self) -> Optional[Dict]:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.market_price is None:
+            return None
+        return {'value': self.market_price, 'period': '2024-01-01T00'}
+
+class StandInSocialFetcher(SocialFetcher):
+    """Deterministic fixture account for one platform.
+
+    Each fetch advances the simulated account by one step: a few new posts
+    appear and about half of the recent posts gain engagement. The cursor is
+    the step number, and only posts changed after it are returned, as a
+    platform with change tracking would.
+    """
+
+    def __init__(self, platform: str, seed: int = 0, latency: float = 0.0, posts_per_step: int = 2,
+                 active_posts: int = 20, followers: int = 5000):
+        super().__init__(requests_per_hour=None, poll_interval=0.0)
+        self.platform = platform
+        self.latency = latency
+        self.posts_per_step = posts_per_step
+        self.active_posts = active_posts
+        self.followers = followers
+        self.requests = 0
+        self._rng = random.Random(f"{platform}-{seed}")
+        self._posts: Dict[str, SocialPost] = {}
+        self._recent: List[str] = []
+        # (step, post ID) for every change, in step order
+        self._changes: List[Tuple[int, str]] = []
+        self._step = 0
+
+    def advance(self):
+        """Simulate one step of account activity"""
+        self._step += 1
+        for _ in range(self.posts_per_step):
+            post_id = f"{self.platform}-{len(self._posts) + 1}"
+            self._posts[post_id] = SocialPost(self.platform, post_id, datetime.now())
+            self._recent.append(post_id)
+        self._recent = self._recent[-self.active_posts:]
+        for post_id in self._rng.sample(self._recent, k=max(len(self._recent) // 2, 1)):
+            post = self._posts[post_id]
+            post.likes += self._rng.randint(0, 40)
+            post.comments += self._rng.randint(0, 8)
+            post.shares += self._rng.randint(0, 5)
+            post.impressions += self._rng.randint(50, 500)
+            self._changes.append((self._step, post_id))
+        self.followers += self._rng.randint(0, 20)
+
+    async def fetch_changes(self, cursor: Optional[str]) -> FetchResult:
+        await self.limiter.acquire()
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.advance()
+        start = bisect.bisect_right(self._changes, (int(cursor or 0), chr(0x10FFFF)))
+        changed = dict.fromkeys(post_id for _, post_id in self._changes[start:])
+        return FetchResult(
+            posts=[replace(self._posts[post_id]) for post_id in changed],
+            followers=self.followers,
+            cursor=str(self._step)
+        )
+
+def build_standin_social_ingestor(db_path: str = ":memory:", api_latency: float = 0.0) -> SocialIngestor:
+    """Social ingestor whose platforms are all fixture accounts"""
+    return SocialIngestor(SocialMetricsStore(db_path),
+                          [StandInSocialFetcher(platform, latency=api_latency) for platform in SOCIAL_PLATFORMS])
+
+def quiet_logging(level: int = logging.WARNING):
+    """Silence per-post logging so it does not dominate measurements"""
+    logging.getLogger().setLevel(level)
+    log_config.set_payload_sample_rate(0.0)
+
+def build_standin_engine(api_latency: float = 0.0, llm_latency: float = 0.0,
+                         outbox_path: Optional[str] = None) -> SolarAscensionAIEngine:
+    """Create an engine whose upstream services are all local stand-ins"""
+    engine = SolarAscensionAIEngine('standin-key', 'standin-secret', 'standin-openai-key',
+                                    post_log_path=None, outbox_path=outbox_path)
+
+    stand_in_api = StandInSolarDataAPI(api_latency)
+    engine.data_api.fetch_solar_irradiance = stand_in_api.fetch_solar_irradiance
+    engine.data_api.fetch_energy_market_data = stand_in_api.fetch_energy_market_data
+    engine.ai_generator.client = StandInOpenAIClient(llm_latency)
+    return engine
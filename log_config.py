@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Logging
+Non-blocking queue-based logging with rotating files and sampled payload dumps
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_config_lock = threading.Lock()
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the buffer is full.
+
+    Records are passed to the listener thread unformatted, so message
+    interpolation (including lazy payload serialization) happens off the
+    caller's thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LazyJSON:
+    """Defers compact JSON serialization until a handler formats the record"""
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return json.dumps(self.payload, separators=(",", ":"), ensure_ascii=False, default=str)
+
+class LatencyStats:
+    """Running count/mean/max of log-call latency on the hot path"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.sampled_out = 0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.count,
+            "sampled_out": self.sampled_out,
+            "mean_us": self.total_seconds / self.count * 1e6 if self.count else 0.0,
+            "max_us": self.max_seconds * 1e6
+        }
+
+payload_log_latency = LatencyStats()
+payload_sample_rate = float(os.getenv('SOLAR_LOG_PAYLOAD_SAMPLE_RATE', '1.0'))
+
+def configure_logging(log_file: str = 'solar_ascension_ai.log', level: int = logging.INFO,
+                      max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                      queue_size: int = 10000) -> logging.handlers.QueueListener:
+    """Route root logging through a bounded queue to rotating file and console handlers"""
+    global _listener, _queue_handler
+
+    with _config_lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        stream_handler = logging.StreamHandler()
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
+        )
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        return _listener
+
+def shutdown_logging():
+    """Drain the log queue and stop the listener thread"""
+    global _listener, _queue_handler
+
+    with _config_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+def set_payload_sample_rate(rate: float):
+    """Set the fraction of payload dumps that are logged (0.0 - 1.0)"""
+    global payload_sample_rate
+    payload_sample_rate = min(max(rate, 0.0), 1.0)
+
+def log_payload(logger: logging.Logger, label: str, payload: Dict, level: int = logging.INFO):
+    """Log a payload dump, sampled and lazily serialized as compact JSON"""
+    start = time.perf_counter()
+    if payload_sample_rate < 1.0 and random.random() >= payload_sample_rate:
+        payload_log_latency.sampled_out += 1
+        return
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s: %s", label, LazyJSON(payload))
+    payload_log_latency.observe(time.perf_counter() - start)
+
+def get_logging_stats() -> Dict:
+    """Get hot-path log latency, sampling and dropped-record counts"""
+    stats = payload_log_latency.to_dict()
+    stats["sample_rate"] = payload_sample_rate
+    stats["dropped_records"] = _queue_handler.dropped if _queue_handler else 0
+    stats["queue_depth"] = _queue_handler.queue.qsize() if _queue_handler else 0
+    return stats
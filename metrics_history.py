@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Metrics History
+Fixed-size columnar ring buffer of analytics metrics with zero-copy windows
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Column name -> (AnalyticsMetrics section, key within that section)
+HISTORY_FIELDS: Dict[str, Tuple[str, str]] = {
+    "solar_production_mw": ("solar_production", "current_production_mw"),
+    "solar_capacity_mw": ("solar_production", "total_capacity_mw"),
+    "solar_efficiency_percent": ("solar_production", "efficiency_percent"),
+    "market_price_usd_mwh": ("solar_production", "market_price_usd_mwh"),
+    "carbon_saved_tons": ("solar_production", "carbon_saved_tons"),
+    "capacity_factor": ("solar_production", "capacity_factor"),
+    "revenue_potential_usd": ("solar_production", "revenue_potential_usd"),
+    "total_followers": ("social_engagement", "total_followers"),
+    "total_engagement": ("social_engagement", "total_engagement"),
+    "posts_today": ("social_engagement", "posts_today"),
+    "viral_posts": ("social_engagement", "viral_posts"),
+    "engagement_rate": ("social_engagement", "engagement_rate"),
+    "reach_estimate": ("social_engagement", "reach_estimate"),
+    "bills_tracked": ("policy_impact", "bills_tracked"),
+    "bills_supported": ("policy_impact", "bills_supported"),
+    "bills_opposed": ("policy_impact", "bills_opposed"),
+    "revenue_generated": ("economic_metrics", "revenue_generated"),
+    "cost_savings": ("economic_metrics", "cost_savings"),
+    "carbon_reduced_tons": ("environmental_impact", "carbon_reduced_tons"),
+    "water_saved_gallons": ("environmental_impact", "water_saved_gallons")
+}
+
+class MetricsHistory:
+    """Preallocated ring buffer with one float64 column per metric.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` points always occupy one contiguous slice. Windows are
+    therefore read-only NumPy views rather than copies. A view stays valid
+    until ``capacity - n`` further points have been appended.
+    """
+
+    def __init__(self, capacity: int = 1000, fields: Dict[str, Tuple[str, str]] = HISTORY_FIELDS, buffer=None):
+        """``buffer`` (e.g. a shared memory block) holds the columns instead of private arrays"""
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.fields = dict(fields)
+        slots = 2 * capacity
+        if buffer is None:
+            # Timestamps are int64 nanoseconds so they can be viewed as datetime64 without copying
+            self._timestamps = np.zeros(slots, dtype=np.int64)
+            self._columns = {name: np.full(slots, np.nan) for name in self.fields}
+        else:
+            if len(buffer) < self.buffer_size(capacity, len(self.fields)):
+                raise ValueError("buffer is too small for the requested capacity and fields")
+            self._timestamps = np.ndarray(slots, dtype=np.int64, buffer=buffer)
+            self._columns = {
+                name: np.ndarray(slots, dtype=np.float64, buffer=buffer, offset=8 * slots * (index + 1))
+                for index, name in enumerate(self.fields)
+            }
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def buffer_size(capacity: int, field_count: int) -> int:
+        """Bytes needed to hold the columns in an external buffer"""
+        return 8 * 2 * capacity * (field_count + 1)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        """Number of points ever appended; also the version of the newest point"""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + sum(column.nbytes for column in self._columns.values())
+
+    def append(self, metrics) -> int:
+        """Append one AnalyticsMetrics in O(1); returns its sequence number"""
+        values = {}
+        for name, (section, key) in self.fields.items():
+            value = getattr(metrics, section).get(key)
+            values[name] = np.nan if value is None else float(value)
+        return self.append_row(np.datetime64(metrics.timestamp, "ns").astype(np.int64), values)
+
+    def append_row(self, timestamp_ns: int, values: Mapping[str, float]) -> int:
+        """Append one point given as column values; missing columns are stored as NaN"""
+        with self._lock:
+            slot = self._count % self.capacity
+            mirror = slot + self.capacity
+            self._timestamps[slot] = self._timestamps[mirror] = timestamp_ns
+            for name, column in self._columns.items():
+                column[slot] = column[mirror] = values.get(name, np.nan)
+            self._count += 1
+            return self._count
+
+    def set_count(self, count: int):
+        """Adopt a point count published by another process writing the same buffer"""
+        with self._lock:
+            self._count = count
+
+    def _bounds(self, n: Optional[int]) -> Tuple[int, int]:
+        size = len(self)
+        n = size if n is None else max(0, min(n, size))
+        start = (self._count - n) % self.capacity if n else 0
+        return start, start + n
+
+    @staticmethod
+    def _readonly(view: np.ndarray) -> np.ndarray:
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """datetime64[ns] view of the last ``n`` timestamps (all held points by default)"""
+        start, end = self._bounds(n)
+        return self._readonly(self._timestamps[start:end].view("datetime64[ns]"))
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """View of the last ``n`` values of one column"""
+        start, end = self._bounds(n)
+        return self._readonly(self._columns[name][start:end])
+
+    def _window(self, n: Optional[int]) -> Mapping[str, np.ndarray]:
+        start, end = self._bounds(n)
+        views = {"timestamp": self._readonly(self._timestamps[start:end].view("datetime64[ns]"))}
+        for name, column in self._columns.items():
+            views[name] = self._readonly(column[start:end])
+        return MappingProxyType(views)
+
+    def window(self, n: Optional[int] = None) -> Mapping[str, np.ndarray]:
+        """Views of the last ``n`` points for every column plus ``timestamp``"""
+        with self._lock:
+            return self._window(n)
+
+    def between(self, start=None, end=None) -> Dict[str, np.ndarray]:
+        """Copies of the held points with ``start <= timestamp < end`` (datetimes or datetime64).
+
+        Copies rather than views, so the result stays intact however many
+        points are appended while a caller processes a long range.
+        """
+        with self._lock:
+            window = self._window(None)
+            timestamps = window["timestamp"]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, np.datetime64(start, "ns"), side="left"))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, np.datetime64(end, "ns"), side="left"))
+            return {name: view[lo:hi].copy() for name, view in window.items()}
+
+    def since(self, sequence: int, limit: Optional[int] = None) -> Mapping[str, np.ndarray]:
+        """Views of the points appended after ``sequence`` (at most those still held)"""
+        with self._lock:
+            pending = self._count - max(sequence, 0)
+            if limit is not None:
+                pending = min(pending, limit)
+            return self._window(max(pending, 0))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Metrics Query
+Vectorized time-bucket aggregation over the persisted metrics history
+"""
+
+import itertools
+import json
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from metrics_rollup import MetricsRollupStore
+
+AGGREGATIONS = ("mean", "min", "max", "sum", "count", "p95")
+
+# Sizes accepted as ``bucket`` besides a plain number of seconds
+BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+MAX_BUCKETS_PER_QUERY = 10_000_000
+
+def parse_bucket(bucket) -> int:
+    """Bucket size in seconds from a number or a string such as ``"15m"``, ``"1h"`` or ``"1d"``"""
+    text = str(bucket).strip().lower()
+    unit = BUCKET_UNITS.get(text[-1:]) if text else None
+    try:
+        seconds = int(float(text[:-1]) * unit) if unit else int(float(text))
+    except ValueError:
+        raise ValueError(f"Invalid bucket size {bucket!r}") from None
+    if seconds <= 0:
+        raise ValueError(f"Bucket size must be positive, got {bucket!r}")
+    return seconds
+
+def aggregate_buckets(timestamps: np.ndarray, values: np.ndarray, bucket_ns: int,
+                      aggregation: str) -> Dict[str, np.ndarray]:
+    """Aggregate time-sorted points into fixed-width buckets.
+
+    ``timestamps`` are int64 nanoseconds in ascending order; NaN values are
+    ignored. Buckets are found with one ``flatnonzero`` over the bucket
+    indices and reduced with ``ufunc.reduceat``; p95 sorts each bucket's
+    values in a single lexsort and interpolates like ``np.percentile``.
+    Returns bucket starts (int64 ns), point counts and aggregated values,
+    with empty buckets omitted.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {aggregation!r}; expected one of {AGGREGATIONS}")
+
+    present = ~np.isnan(values)
+    timestamps, values = timestamps[present], values[present]
+    if not len(values):
+        empty = np.empty(0, dtype=np.int64)
+        return {"timestamp": empty, "count": empty, "value": np.empty(0)}
+
+    buckets = timestamps // bucket_ns
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+
+    if aggregation == "mean":
+        result = np.add.reduceat(values, starts) / counts
+    elif aggregation == "sum":
+        result = np.add.reduceat(values, starts)
+    elif aggregation == "min":
+        result = np.minimum.reduceat(values, starts)
+    elif aggregation == "max":
+        result = np.maximum.reduceat(values, starts)
+    elif aggregation == "count":
+        result = counts.astype(np.float64)
+    else:
+        ordered = values[np.lexsort((values, buckets))]
+        position = starts + 0.95 * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    return {"timestamp": buckets[starts] * bucket_ns, "count": counts, "value": result}
+
+class HistoryQuery:
+    """Range aggregation over the raw history persisted in a MetricsRollupStore.
+
+    Points are read in chunks and aggregated per chunk; the last, possibly
+    incomplete bucket of a chunk is carried into the next one. Memory is
+    therefore bounded by the chunk size whatever the range, and results can
+    be streamed while later chunks are still being read.
+    """
+
+    def __init__(self, store: MetricsRollupStore, chunk_rows: int = 65536):
+        self.store = store
+        self.chunk_rows = chunk_rows
+
+    def iter_buckets(self, field: str, start: datetime, end: Optional[datetime] = None, bucket_seconds: int = 3600,
+                     aggregation: str = "mean") -> Iterator[Dict[str, np.ndarray]]:
+        """Aggregated buckets of ``field`` over ``[start, end)``, one dict of arrays per chunk read"""
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}; expected one of {AGGREGATIONS}")
+        end = end or datetime.now()
+        if end <= start:
+            raise ValueError("Query range end must be after its start")
+        if (end - start).total_seconds() / bucket_seconds > MAX_BUCKETS_PER_QUERY:
+            raise ValueError(f"Query would produce more than {MAX_BUCKETS_PER_QUERY} buckets; use a larger bucket")
+
+        bucket_ns = bucket_seconds * 10**9
+        carry_timestamps = np.empty(0, dtype=np.int64)
+        carry_values = np.empty(0)
+        for chunk in self.store.iter_history([field], start, end, chunk_rows=self.chunk_rows):
+            timestamps = np.concatenate((carry_timestamps, chunk["timestamp"]))
+            values = np.concatenate((carry_values, chunk[field]))
+            # The last bucket may continue in the next chunk
+            cut = int(np.searchsorted(timestamps, timestamps[-1] - timestamps[-1] % bucket_ns, side="left"))
+            carry_timestamps, carry_values = timestamps[cut:], values[cut:]
+            if cut:
+                yield aggregate_buckets(timestamps[:cut], values[:cut], bucket_ns, aggregation)
+        if len(carry_values):
+            yield aggregate_buckets(carry_timestamps, carry_values, bucket_ns, aggregation)
+
+    def query(self, field: str, start: datetime, end: Optional[datetime] = None, bucket_seconds: int = 3600,
+              aggregation: str = "mean") -> Dict[str, np.ndarray]:
+        """All buckets of a range at once; ``timestamp`` is datetime64[ns]"""
+        chunks = list(self.iter_buckets(field, start, end, bucket_seconds, aggregation))
+        result = {
+            key: np.concatenate([chunk[key] for chunk in chunks]) if chunks else np.empty(0, dtype=dtype)
+            for key, dtype in (("timestamp", np.int64), ("count", np.int64), ("value", np.float64))
+        }
+        result["timestamp"] = result["timestamp"].view("datetime64[ns]")
+        return result
+
+    def stream_json(self, field: str, start: datetime, end: Optional[datetime] = None, bucket_seconds: int = 3600,
+                    aggregation: str = "mean") -> Iterator[bytes]:
+        """Query result as a JSON document, produced chunk by chunk.
+
+        ``{"field", "aggregation", "bucket_seconds", "start", "end", "columns",
+        "rows": [[bucket start ISO time, count, value], ...]}``. The query is
+        validated and its first chunk read before this returns, so errors can
+        still become an HTTP status instead of a truncated body.
+        """
+        end = end or datetime.now()
+        chunks = self.iter_buckets(field, start, end, bucket_seconds, aggregation)
+        first = next(chunks, None)
+        header = json.dumps({
+            "field": field,
+            "aggregation": aggregation,
+            "bucket_seconds": bucket_seconds,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "columns": ["timestamp", "count", "value"]
+        })
+
+        def document():
+            yield (header[:-1] + ', "rows": [').encode("utf-8")
+            separator = ""
+            for chunk in itertools.chain([first] if first is not None else [], chunks):
+                if len(chunk["value"]):
+                    yield self._rows_json(chunk, separator)
+                    separator = ", "
+            yield b"]}\n"
+
+        return document()
+
+    @staticmethod
+    def _rows_json(chunk: Dict[str, np.ndarray], separator: str) -> bytes:
+        times = np.datetime_as_string(chunk["timestamp"].view("datetime64[ns]").astype("datetime64[s]"))
+        rows = json.dumps([
+            [time, count, value]
+            for time, count, value in zip(times.tolist(), chunk["count"].tolist(), chunk["value"].tolist())
+        ])
+        return (separator + rows[1:-1]).encode("utf-8")
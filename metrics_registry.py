@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Metrics Registry
+In-process counters, gauges and HDR-style latency histograms with Prometheus text output
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket boundaries (seconds) exported for histograms
+DEFAULT_LATENCY_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1,
+                          0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Counter:
+    """Monotonically increasing value"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+class Gauge:
+    """Value that can go up and down"""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+class Histogram:
+    """Log-linear (HDR-style) histogram of nanosecond durations.
+
+    Each power-of-two range is split into ``2**precision_bits`` linear
+    sub-buckets, giving a bounded relative error (~6% at the default 4 bits)
+    over the whole range. Recording is a handful of integer operations.
+    """
+    __slots__ = ("precision_bits", "sub_buckets", "counts", "count", "sum_ns", "max_ns",
+                 "_shift_base", "_max_index")
+
+    def __init__(self, precision_bits: int = 4, max_exponent: int = 40):
+        self.precision_bits = precision_bits
+        self.sub_buckets = 1 << precision_bits
+        self.counts = [0] * (self.sub_buckets * (max_exponent + 2))
+        self._shift_base = precision_bits + 1
+        self._max_index = len(self.counts) - 1
+        self.count = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def observe_ns(self, value_ns: int):
+        shift = value_ns.bit_length() - self._shift_base
+        if shift < 0:
+            shift = 0
+        index = (shift << self.precision_bits) + (value_ns >> shift)
+        if index > self._max_index:
+            index = self._max_index
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def observe(self, seconds: float):
+        self.observe_ns(max(int(seconds * 1e9), 0))
+
+    def time(self) -> "_Timer":
+        """Context manager recording the duration of a block"""
+        return _Timer(self)
+
+    def _bucket_bounds(self, index: int) -> Tuple[int, int]:
+        """Lower (inclusive) and upper (exclusive) nanosecond bounds of a bucket"""
+        if index < 2 * self.sub_buckets:
+            return index, index + 1
+        shift = index // self.sub_buckets - 1
+        mantissa = index - self.sub_buckets * shift
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile in seconds"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._bucket_bounds(index)[1], self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def cumulative_counts(self, bounds_seconds) -> List[int]:
+        """Cumulative counts at each upper bound, for Prometheus ``le`` buckets"""
+        limits = [int(bound * 1e9) for bound in bounds_seconds]
+        result = [0] * len(limits)
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            upper = self._bucket_bounds(index)[1] - 1
+            for i, limit in enumerate(limits):
+                if upper <= limit:
+                    result[i] += bucket_count
+        return result
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe_ns(time.perf_counter_ns() - self.start)
+        return False
+
+class MetricFamily:
+    """A named metric with optional labelled children"""
+
+    def __init__(self, name: str, help_text: str, metric_type: str, factory, label_names=(), bounds=None):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self.bounds = bounds or DEFAULT_LATENCY_BOUNDS
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._children[()] = factory()
+
+    def labels(self, *values, **kwargs):
+        """Get (or create) the child for a set of label values"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.label_names)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def __getattr__(self, attr):
+        # Unlabelled families proxy straight to their single child
+        if attr.startswith("_") or self.label_names:
+            raise AttributeError(attr)
+        return getattr(self._children[()], attr)
+
+    def _label_str(self, values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for values, child in sorted(self._children.items()):
+            if self.metric_type == "histogram":
+                cumulative = child.cumulative_counts(self.bounds)
+                for bound, bucket_count in zip(self.bounds, cumulative):
+                    lines.append(f"{self.name}_bucket{self._label_str(values, ('le', repr(bound)))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{self._label_str(values, ('le', '+Inf'))} {child.count}")
+                lines.append(f"{self.name}_sum{self._label_str(values)} {child.sum_ns / 1e9}")
+                lines.append(f"{self.name}_count{self._label_str(values)} {child.count}")
+            else:
+                lines.append(f"{self.name}{self._label_str(values)} {child.value}")
+        return lines
+
+class MetricsRegistry:
+    """Registry of metric families rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, help_text: str, metric_type: str, factory, labels=(), bounds=None) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(name, help_text, metric_type, factory, labels, bounds)
+                self._families[name] = family
+            elif family.metric_type != metric_type:
+                raise ValueError(f"Metric {name} already registered as {family.metric_type}")
+            return family
+
+    def counter(self, name: str, help_text: str, labels=()) -> MetricFamily:
+        return self._register(name, help_text, "counter", Counter, labels)
+
+    def gauge(self, name: str, help_text: str, labels=()) -> MetricFamily:
+        return self._register(name, help_text, "gauge", Gauge, labels)
+
+    def histogram(self, name: str, help_text: str, labels=(), bounds=None) -> MetricFamily:
+        return self._register(name, help_text, "histogram", Histogram, labels, bounds)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines = []
+        for name in sorted(self._families):
+            lines.extend(self._families[name].render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """Get p50/p95/p99 of every histogram for logging"""
+        result = {}
+        for name, family in self._families.items():
+            if family.metric_type != "histogram":
+                continue
+            for values, child in family._children.items():
+                key = name + family._label_str(values)
+                result[key] = {
+                    "count": child.count,
+                    "p50": child.quantile(0.50),
+                    "p95": child.quantile(0.95),
+                    "p99": child.quantile(0.99)
+                }
+        return result
+
+REGISTRY = MetricsRegistry()
+
+def timed(histogram: Histogram):
+    """Decorator recording a function's duration (sync or async) in a histogram"""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    histogram.observe_ns(time.perf_counter_ns() - start)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe_ns(time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def start_metrics_server(port: int = 9108, host: str = "0.0.0.0", registry: MetricsRegistry = REGISTRY):
+    """Serve ``/metrics`` from a background thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Metrics Rollups
+Persistent min/max/mean/count aggregates of analytics metrics at 1-minute, 1-hour and 1-day resolution,
+plus the raw history points they summarise
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from metrics_history import HISTORY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+# Resolution (seconds) -> how long its buckets are kept (seconds, None = forever)
+DEFAULT_RETENTION = {
+    MINUTE: 14 * DAY,
+    HOUR: 400 * DAY,
+    DAY: None
+}
+
+# How long raw history points are kept (seconds, None = forever)
+DEFAULT_HISTORY_RETENTION = 400 * DAY
+
+METRIC_SECTIONS = ("solar_production", "social_engagement", "policy_impact",
+                   "economic_metrics", "environmental_impact")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    PRIMARY KEY (resolution, field, bucket_start)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO rollups (resolution, field, bucket_start, count, sum, min, max) VALUES (?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT (resolution, field, bucket_start) DO UPDATE SET
+    count = count + 1,
+    sum = sum + excluded.sum,
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max)
+"""
+
+_HISTORY_TABLE = "CREATE TABLE IF NOT EXISTS history (timestamp INTEGER PRIMARY KEY{columns})"
+
+_EPOCH = datetime(1970, 1, 1)
+
+def wall_seconds(moment: datetime) -> int:
+    """Seconds since the epoch on the wall clock of a naive datetime.
+
+    Buckets align with local minutes, hours and midnights, and bucket starts
+    convert to the same datetime64 values MetricsHistory uses.
+    """
+    return int((moment - _EPOCH).total_seconds())
+
+def flatten_numeric(metrics) -> Dict[str, float]:
+    """Every numeric value of an AnalyticsMetrics, keyed by dotted path"""
+    fields: Dict[str, float] = {}
+
+    def walk(prefix: str, value):
+        if isinstance(value, bool):
+            return
+        if isinstance(value, (int, float)):
+            fields[prefix] = float(value)
+        elif hasattr(value, "items"):
+            for key, item in value.items():
+                walk(f"{prefix}.{key}", item)
+
+    for section in METRIC_SECTIONS:
+        walk(section, getattr(metrics, section))
+    return fields
+
+class MetricsRollupStore:
+    """SQLite rollup tables updated incrementally as snapshots arrive.
+
+    Each snapshot is folded into its 1-minute, 1-hour and 1-day bucket with a
+    single upsert per field, so aggregates are durable as soon as ``add``
+    returns and nothing needs to be recomputed from raw points. The snapshot's
+    history columns are also kept as one raw row per snapshot, for queries
+    the rollups cannot answer (percentiles, arbitrary bucket sizes, exports).
+    """
+
+    def __init__(self, db_path: str = "solar_analytics_rollups.db",
+                 retention: Optional[Dict[int, Optional[int]]] = None, prune_every: int = 120,
+                 history_fields: Dict[str, Tuple[str, str]] = HISTORY_FIELDS,
+                 history_retention: Optional[int] = DEFAULT_HISTORY_RETENTION):
+        self.db_path = db_path
+        self.retention = dict(retention or DEFAULT_RETENTION)
+        self.resolutions = sorted(self.retention)
+        self.prune_every = prune_every
+        self.history_fields = dict(history_fields)
+        self.history_retention = history_retention
+        # Bumped on every add; callers use it to invalidate caches built from query results
+        self.version = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(_HISTORY_TABLE.format(
+            columns="".join(f', "{name}" REAL' for name in self.history_fields)
+        ))
+        # Columns added to history_fields after the table was created
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+        for name in self.history_fields:
+            if name not in existing:
+                self._conn.execute(f'ALTER TABLE history ADD COLUMN "{name}" REAL')
+        self._insert_history = "INSERT OR REPLACE INTO history (timestamp{names}) VALUES (?{marks})".format(
+            names="".join(f', "{name}"' for name in self.history_fields),
+            marks=", ?" * len(self.history_fields)
+        )
+
+    def add(self, metrics) -> int:
+        """Fold one AnalyticsMetrics into every resolution; returns the number of fields recorded"""
+        fields = flatten_numeric(metrics)
+        timestamp = wall_seconds(metrics.timestamp)
+        rows = [
+            (resolution, field, timestamp - timestamp % resolution, value, value, value)
+            for resolution in self.resolutions
+            for field, value in fields.items()
+        ]
+        history_row = [int(np.datetime64(metrics.timestamp, "ns").astype(np.int64))]
+        for section, key in self.history_fields.values():
+            value = getattr(metrics, section).get(key)
+            history_row.append(float(value) if isinstance(value, (int, float)) else None)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(_UPSERT, rows)
+                self._conn.execute(self._insert_history, history_row)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self.version += 1
+            due_for_prune = self.version % self.prune_every == 0
+
+        if due_for_prune:
+            self.prune(timestamp)
+        return len(fields)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete buckets older than their resolution's retention"""
+        now = now if now is not None else wall_seconds(datetime.now())
+        deleted = 0
+        with self._lock:
+            for resolution, keep_seconds in self.retention.items():
+                if keep_seconds is None:
+                    continue
+                cursor = self._conn.execute(
+                    "DELETE FROM rollups WHERE resolution = ? AND bucket_start < ?",
+                    (resolution, int(now - keep_seconds))
+                )
+                deleted += cursor.rowcount
+            if self.history_retention is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM history WHERE timestamp < ?", (int(now - self.history_retention) * 10**9,)
+                )
+                deleted += cursor.rowcount
+        if deleted:
+            logger.info(f"Pruned {deleted} expired rollup buckets and history points")
+        return deleted
+
+    def fields(self) -> List[str]:
+        """Names of all fields with rollups"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT field FROM rollups WHERE resolution = ? ORDER BY field", (self.resolutions[-1],)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def choose_resolution(self, start: datetime, end: datetime, points: int) -> int:
+        """Coarsest resolution that still yields at least ``points`` buckets over the range.
+
+        Falls back to the finest resolution when the range is too short for
+        any resolution to reach ``points``, so result size grows with the
+        requested point count rather than with the length of the range.
+        """
+        span = max((end - start).total_seconds(), 0)
+        for resolution in reversed(self.resolutions):
+            if span / resolution >= points:
+                return resolution
+        return self.resolutions[0]
+
+    def query(self, field: str, start: datetime, end: Optional[datetime] = None, points: int = 500,
+              resolution: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Aggregates of ``field`` over ``[start, end)`` at an automatically chosen resolution"""
+        end = end or datetime.now()
+        if resolution is None:
+            resolution = self.choose_resolution(start, end, points)
+        elif resolution not in self.retention:
+            raise ValueError(f"Unknown resolution {resolution}; expected one of {self.resolutions}")
+
+        start_ts = wall_seconds(start)
+        first_bucket = start_ts - start_ts % resolution
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket_start, count, sum, min, max FROM rollups "
+                "WHERE resolution = ? AND field = ? AND bucket_start >= ? AND bucket_start < ? "
+                "ORDER BY bucket_start",
+                (resolution, field, first_bucket, wall_seconds(end))
+            ).fetchall()
+
+        table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        counts = table[:, 1]
+        return {
+            "resolution": resolution,
+            "timestamp": table[:, 0].astype(np.int64).astype("datetime64[s]"),
+            "count": counts.astype(np.int64),
+            "mean": table[:, 2] / np.where(counts > 0, counts, 1),
+            "min": table[:, 3],
+            "max": table[:, 4]
+        }
+
+    def query_many(self, fields: Iterable[str], start: datetime, end: Optional[datetime] = None,
+                   points: int = 500) -> Dict[str, Dict[str, np.ndarray]]:
+        """Query several fields at the same resolution"""
+        end = end or datetime.now()
+        resolution = self.choose_resolution(start, end, points)
+        return {field: self.query(field, start, end, resolution=resolution) for field in fields}
+
+    def iter_history(self, fields: Sequence[str], start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     chunk_rows: int = 65536) -> Iterator[Dict[str, np.ndarray]]:
+        """Raw history points with ``start <= timestamp < end``, in chunks of at most ``chunk_rows``.
+
+        Each chunk maps ``timestamp`` (int64 nanoseconds, wall clock) and every
+        requested field to a NumPy array; missing values are NaN. Reads go
+        through their own read-only connection page by page, so a long
+        iteration never holds the writer's lock or all rows in memory. An
+        in-memory store has no file to reopen, so its pages are read through
+        the store's connection, taking the lock once per page.
+        """
+        unknown = [field for field in fields if field not in self.history_fields]
+        if unknown:
+            raise ValueError(f"Unknown history fields {unknown}; expected some of {sorted(self.history_fields)}")
+
+        lower = int(np.datetime64(start, "ns").astype(np.int64)) if start is not None else -2**63
+        upper = int(np.datetime64(end, "ns").astype(np.int64)) if end is not None else 2**63 - 1
+        sql = "SELECT timestamp{names} FROM history WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp LIMIT ?".format(
+            names="".join(f', "{field}"' for field in fields)
+        )
+
+        if self.db_path in ("", ":memory:"):
+            reader = None
+        else:
+            reader = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True,
+                                     check_same_thread=False)
+        try:
+            while True:
+                if reader is None:
+                    with self._lock:
+                        rows = self._conn.execute(sql, (lower, upper, chunk_rows)).fetchall()
+                else:
+                    rows = reader.execute(sql, (lower, upper, chunk_rows)).fetchall()
+                if not rows:
+                    return
+                timestamps = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+                # None (NULL) becomes NaN in a float array
+                values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(fields))
+                chunk = {"timestamp": timestamps}
+                for index, field in enumerate(fields):
+                    chunk[field] = values[:, index]
+                yield chunk
+                if len(rows) < chunk_rows:
+                    return
+                lower = int(timestamps[-1]) + 1
+        finally:
+            if reader is not None:
+                reader.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
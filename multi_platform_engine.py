@@ -5,21 +5,36 @@ Extends beyond Twitter to LinkedIn, YouTube, TikTok, Instagram, and Reddit
 """
 
 import asyncio
-import aiohttp
-import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 import random
 import os
+import uuid
 
 # Import our existing components
-from ai_engine import SolarAscensionAIEngine, SolarData, ResearchInsight
+from ai_engine import PLATFORM_POST_SECONDS, POSTS_TOTAL, SolarAscensionAIEngine, SolarData, ResearchInsight
+from log_config import log_payload
+from metrics_registry import REGISTRY, timed
 
 logger = logging.getLogger(__name__)
 
+FAN_OUT_OUTCOMES = REGISTRY.counter(
+    "solar_fan_out_outcomes_total", "Per-platform outcomes of multi-platform fan-outs", labels=("platform", "status")
+)
+FAN_OUT_SECONDS = REGISTRY.histogram(
+    "solar_fan_out_seconds", "Wall time of a whole multi-platform fan-out"
+).labels()
+
+# Outcome statuses: posted directly, handed to the outbox, or not published
+FAN_OUT_STATUSES = ("posted", "queued", "failed", "timeout", "error")
+
+# "two_tier": one LLM core message (plus one shared long-form text) per fan-out, adapted locally per platform;
+# "per_platform": one LLM call per platform
+GENERATION_MODES = ("two_tier", "per_platform")
+
 @dataclass
 class PlatformContent:
     """Content tailored for specific platforms"""
@@ -31,11 +46,70 @@ class PlatformContent:
     optimal_time: str
     engagement_metrics: Dict
 
+@dataclass
+class PlatformOutcome:
+    """What happened to one platform during a fan-out"""
+    platform: str
+    status: str
+    seconds: float
+    error: Optional[str] = None
+    content: Optional[PlatformContent] = None
+    # Successful LLM calls made for this platform alone (per-platform generation)
+    llm_calls: int = 0
+    
+    @property
+    def ok(self) -> bool:
+        return self.status in ("posted", "queued")
+
+@dataclass
+class FanOutResult:
+    """Per-platform outcomes of one post_to_all_platforms call"""
+    started_at: datetime
+    seconds: float = 0.0
+    outcomes: Dict[str, PlatformOutcome] = field(default_factory=dict)
+    llm_calls: int = 0
+    # Time spent publishing the outbox inline after the fan-out; not part of ``seconds``
+    drain_seconds: float = 0.0
+    drained: Optional[bool] = None
+    error: Optional[str] = None
+    
+    @property
+    def succeeded(self) -> List[str]:
+        return [name for name, outcome in self.outcomes.items() if outcome.ok]
+    
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, outcome in self.outcomes.items() if not outcome.ok]
+    
+    def to_dict(self) -> Dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "seconds": self.seconds,
+            "llm_calls": self.llm_calls,
+            "drain_seconds": self.drain_seconds,
+            "drained": self.drained,
+            "error": self.error,
+            "outcomes": {
+                name: {"status": outcome.status, "seconds": outcome.seconds, "error": outcome.error}
+                for name, outcome in self.outcomes.items()
+            }
+        }
+
 class MultiPlatformEngine:
     """Multi-platform social media automation"""
     
-    def __init__(self, ai_engine: SolarAscensionAIEngine):
+    def __init__(self, ai_engine: SolarAscensionAIEngine, platform_timeout: float = 120.0,
+                 platform_timeouts: Optional[Dict[str, float]] = None, max_concurrent_per_platform: int = 1,
+                 generation_mode: str = "two_tier", draft_timeout: float = 60.0):
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode {generation_mode!r}; expected one of {GENERATION_MODES}")
         self.ai_engine = ai_engine
+        self.generation_mode = generation_mode
+        # Seconds one platform may spend generating and posting before it is reported as timed out
+        self.platform_timeout = platform_timeout
+        self.platform_timeouts = dict(platform_timeouts or {})
+        # Seconds each shared two-tier LLM call may take before every platform falls back to the template text
+        self.draft_timeout = draft_timeout
         self.platforms = {
             'linkedin': LinkedInPlatform(),
             'youtube': YouTubePlatform(),
@@ -43,117 +117,348 @@ class MultiPlatformEngine:
             'instagram': InstagramPlatform(),
             'reddit': RedditPlatform()
         }
+        # Bounds overlapping fan-outs (e.g. pipeline cycles) per platform, independently of the others
+        self.platform_limiters = {
+            name: asyncio.Semaphore(max_concurrent_per_platform) for name in self.platforms
+        }
         self.content_strategy = self._create_content_strategy()
+        self.ai_engine.register_outbox_channels(
+            {name: self._outbox_publisher(name) for name in self.platforms}
+        )
+    
+    def _outbox_publisher(self, platform_name: str):
+        """Build the outbox publisher for one platform channel"""
+        platform_handler = self.platforms[platform_name]
+        
+        async def publish(entry) -> Optional[str]:
+            success = await platform_handler.post_content(PlatformContent(**entry.payload))
+            return f"{platform_name}-{entry.idempotency_key}" if success else None
+        
+        return publish
     
     def _create_content_strategy(self) -> Dict:
-        """Create platform-specific content strategies"""
+        """Create platform-specific content strategies.
+        
+        ``content_types`` map each angle to the opener the local adapter puts
+        before the core message. ``max_length`` is the platform's text limit,
+        ``long_form`` marks platforms whose post body is the shared long-form
+        text, and ``hashtag_style`` is footer, inline or none.
+        """
         return {
             'linkedin': {
-                'content_types': ['professional_insight', 'policy_analysis', 'industry_trend'],
+                'content_types': {
+                    'professional_insight': "Industry insight: {core}",
+                    'policy_analysis': "Policy lens: {core}",
+                    'industry_trend': "A trend worth watching in clean energy: {core}"
+                },
                 'tone': 'professional, analytical, business-focused',
                 'hashtags': ['#SolarEnergy', '#CleanTech', '#EnergyPolicy', '#Sustainability'],
                 'posting_times': ['09:00', '12:00', '17:00'],
-                'audience': 'Professionals, policymakers, industry leaders'
+                'audience': 'Professionals, policymakers, industry leaders',
+                'max_length': 3000,
+                'long_form': False,
+                'hashtag_style': 'footer'
             },
             'youtube': {
-                'content_types': ['educational_video', 'technology_demo', 'policy_explainer'],
+                'content_types': {
+                    'educational_video': "In today's video: {core}",
+                    'technology_demo': "See the technology behind the numbers. {core}",
+                    'policy_explainer': "Explained: {core}"
+                },
                 'tone': 'educational, engaging, visual',
                 'hashtags': ['#SolarTechnology', '#CleanEnergy', '#EnergyIndependence'],
                 'posting_times': ['15:00', '19:00'],
-                'audience': 'General public, students, technology enthusiasts'
+                'audience': 'General public, students, technology enthusiasts',
+                'max_length': 5000,
+                'long_form': True,
+                'hashtag_style': 'footer'
             },
             'tiktok': {
-                'content_types': ['viral_short', 'quick_fact', 'trending_topic'],
+                'content_types': {
+                    'viral_short': "☀️ {core}",
+                    'quick_fact': "⚡ Quick fact: {core}",
+                    'trending_topic': "🔥 Everyone's talking about solar: {core}"
+                },
                 'tone': 'fun, fast-paced, viral-worthy',
                 'hashtags': ['#SolarTok', '#CleanEnergy', '#ClimateAction'],
                 'posting_times': ['12:00', '18:00', '21:00'],
-                'audience': 'Gen Z, Millennials, social media users'
+                'audience': 'Gen Z, Millennials, social media users',
+                'max_length': 2200,
+                'long_form': False,
+                'hashtag_style': 'inline'
             },
             'instagram': {
-                'content_types': ['visual_story', 'infographic', 'behind_scenes'],
+                'content_types': {
+                    'visual_story': "☀️ {core}",
+                    'infographic': "📊 By the numbers: {core}",
+                    'behind_scenes': "🌤️ Behind the scenes of America's solar grid: {core}"
+                },
                 'tone': 'visual, inspiring, lifestyle-focused',
                 'hashtags': ['#SolarLife', '#CleanEnergy', '#SustainableLiving'],
                 'posting_times': ['11:00', '15:00', '19:00'],
-                'audience': 'Visual learners, lifestyle enthusiasts, environmentalists'
+                'audience': 'Visual learners, lifestyle enthusiasts, environmentalists',
+                'max_length': 2200,
+                'long_form': False,
+                'hashtag_style': 'footer'
             },
             'reddit': {
-                'content_types': ['community_discussion', 'ama_session', 'news_analysis'],
+                'content_types': {
+                    'community_discussion': "Discussion: {core}",
+                    'ama_session': "Ask us anything about today's solar numbers. {core}",
+                    'news_analysis': "Analysis: {core}"
+                },
                 'tone': 'informative, community-focused, discussion-oriented',
                 'hashtags': ['#SolarEnergy', '#ClimateAction', '#EnergyPolicy'],
                 'posting_times': ['10:00', '14:00', '20:00'],
-                'audience': 'Reddit community, tech enthusiasts, policy wonks'
+                'audience': 'Reddit community, tech enthusiasts, policy wonks',
+                'max_length': 40000,
+                'long_form': True,
+                'hashtag_style': 'none'
             }
         }
     
-    async def generate_platform_content(self, platform: str, solar_data: SolarData, research_insights: List[ResearchInsight]) -> PlatformContent:
-        """Generate platform-specific content"""
-        strategy = self.content_strategy[platform]
-        content_type = random.choice(strategy['content_types'])
-        
-        # Build context for AI generation
+    def _generation_context(self, solar_data: SolarData, research_insights: List[ResearchInsight]) -> Dict:
+        """Data points shared by every prompt of a fan-out"""
         context = {
-            'platform': platform,
-            'tone': strategy['tone'],
-            'audience': strategy['audience'],
             'current_production_mw': f"{solar_data.current_production:,.0f}",
             'market_price': f"${solar_data.market_price:.1f}",
             'carbon_saved_tons': f"{solar_data.carbon_saved:,.0f}"
         }
+        for key in self.ai_engine.withheld_context_keys:
+            context.pop(key, None)
         
         if research_insights:
             latest_insight = research_insights[0]
             context['research_title'] = latest_insight.title
             context['research_impact'] = latest_insight.impact
+        return context
+    
+    async def generate_drafts(self, solar_data: SolarData,
+                              research_insights: List[ResearchInsight]) -> Tuple[Dict[str, str], int]:
+        """The LLM tier of two-tier generation: one core message, plus one long-form text if any platform needs it.
+        
+        Both calls run concurrently, each bounded by ``draft_timeout``; a call
+        that fails or times out is replaced by the template text, so a hung
+        LLM cannot stall the platforms. Every platform is then adapted from
+        these drafts without further LLM calls. Returns the drafts and the
+        number of LLM calls that succeeded.
+        """
+        context = self._generation_context(solar_data, research_insights)
+        generator = self.ai_engine.ai_generator
+        
+        async def draft(content_type: str) -> Optional[str]:
+            try:
+                return await asyncio.wait_for(generator.try_generate_content(content_type, context),
+                                              self.draft_timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Generating the {content_type} draft timed out after {self.draft_timeout:g}s")
+                return None
+        
+        content_types = {'core': 'core_message'}
+        if any(self.content_strategy[name]['long_form'] for name in self.platforms):
+            content_types['long_form'] = 'long_form'
+        generated = await asyncio.gather(*(draft(content_type) for content_type in content_types.values()))
+        
+        drafts = {
+            key: content if content is not None else generator.fallback_content(content_type, context)
+            for (key, content_type), content in zip(content_types.items(), generated)
+        }
+        return drafts, sum(content is not None for content in generated)
+    
+    def adapt_content(self, platform: str, drafts: Dict[str, str]) -> PlatformContent:
+        """The local tier of two-tier generation: apply a platform's angle, length limit and hashtags"""
+        strategy = self.content_strategy[platform]
+        content_type = random.choice(list(strategy['content_types']))
+        source = drafts.get('long_form') if strategy['long_form'] else None
+        body = strategy['content_types'][content_type].format(core=source or drafts['core'])
+        
+        hashtags = strategy['hashtags']
+        if strategy['hashtag_style'] == 'footer':
+            suffix = "\n\n" + " ".join(hashtags)
+        elif strategy['hashtag_style'] == 'inline':
+            suffix = " " + " ".join(hashtags)
+        else:
+            suffix = ""
+        
+        return PlatformContent(
+            platform=platform,
+            content=_truncate(body, strategy['max_length'] - len(suffix)) + suffix,
+            media_urls=[],  # Would be populated with generated media
+            hashtags=hashtags,
+            target_audience=strategy['audience'],
+            optimal_time=random.choice(strategy['posting_times']),
+            engagement_metrics={}
+        )
+    
+    async def generate_platform_content(self, platform: str, solar_data: SolarData, research_insights: List[ResearchInsight],
+                                        drafts: Optional[Dict[str, str]] = None) -> PlatformContent:
+        """Generate platform-specific content, adapted from ``drafts`` or with its own LLM call"""
+        content, _ = await self._platform_content(platform, solar_data, research_insights, drafts)
+        return content
+    
+    async def _platform_content(self, platform: str, solar_data: SolarData, research_insights: List[ResearchInsight],
+                                drafts: Optional[Dict[str, str]]) -> Tuple[PlatformContent, bool]:
+        """Platform content, plus whether an LLM call for it succeeded"""
+        if drafts is not None:
+            return self.adapt_content(platform, drafts), False
+        
+        strategy = self.content_strategy[platform]
+        content_type = random.choice(list(strategy['content_types']))
+        
+        # Build context for AI generation
+        context = {
+            'platform': platform,
+            'angle': content_type.replace('_', ' '),
+            'tone': strategy['tone'],
+            'audience': strategy['audience'],
+            'max_length': strategy['max_length'],
+            **self._generation_context(solar_data, research_insights)
+        }
         
         # Generate content using AI
-        content = await self.ai_engine.ai_generator.generate_content(content_type, context)
+        generator = self.ai_engine.ai_generator
+        content = await generator.try_generate_content('platform_post', context)
+        generated = content is not None
+        if not generated:
+            content = generator.fallback_content('platform_post', context)
         
         return PlatformContent(
             platform=platform,
-            content=content,
+            content=_truncate(content, strategy['max_length']),
             media_urls=[],  # Would be populated with generated media
             hashtags=strategy['hashtags'],
             target_audience=strategy['audience'],
             optimal_time=random.choice(strategy['posting_times']),
             engagement_metrics={}
-        )
+        ), generated
     
-    async def post_to_all_platforms(self):
-        """Post content to all platforms"""
+    async def post_to_all_platforms(self, solar_data: Optional[SolarData] = None,
+                                    research_insights: Optional[List[ResearchInsight]] = None) -> FanOutResult:
+        """Post content to all platforms concurrently, reusing already collected data when given.
+        
+        In two-tier mode the LLM is called once for a core message (and once
+        more for long-form platforms) before the fan-out, and each platform's
+        post is adapted from those drafts locally. Every platform then
+        generates and posts in its own task under its own semaphore and
+        timeout, so the fan-out takes about as long as the slowest platform
+        and one failing or hanging platform does not hold up the rest.
+        With an outbox but no running outbox workers, the enqueued posts are
+        then published inline within ``outbox_drain_timeout``; that time is
+        reported as ``drain_seconds`` and kept out of ``seconds``.
+        Returns the outcome of every platform.
+        """
+        result = FanOutResult(started_at=datetime.now())
+        start = time.perf_counter()
         try:
             logger.info("Starting multi-platform content distribution...")
             
-            # Collect real-time data
-            solar_data = await self.ai_engine.collect_real_time_data()
-            research_insights = self.ai_engine.research_db.get_recent_insights(days=7)
+            # Collect real-time data unless the caller already has a snapshot
+            if solar_data is None:
+                solar_data = await self.ai_engine.collect_real_time_data()
+            if research_insights is None:
+                research_insights = self.ai_engine.research_db.get_recent_insights(days=7)
+            
+            drafts = None
+            if self.generation_mode == "two_tier":
+                drafts, result.llm_calls = await self.generate_drafts(solar_data, research_insights)
             
-            # Generate and post content for each platform
-            for platform_name, platform_handler in self.platforms.items():
+            outcomes = await asyncio.gather(*(
+                self._generate_and_post(platform_name, solar_data, research_insights, drafts)
+                for platform_name in self.platforms
+            ))
+            result.outcomes = {outcome.platform: outcome for outcome in outcomes}
+            result.llm_calls += sum(outcome.llm_calls for outcome in outcomes)
+            
+            generated = [outcome for outcome in outcomes if outcome.status == "queued"]
+            if generated:
                 try:
-                    # Generate platform-specific content
-                    platform_content = await self.generate_platform_content(
-                        platform_name, solar_data, research_insights
-                    )
-                    
-                    # Post to platform
-                    success = await platform_handler.post_content(platform_content)
-                    
-                    if success:
-                        logger.info(f"Successfully posted to {platform_name}")
-                    else:
-                        logger.warning(f"Failed to post to {platform_name}")
-                        
+                    await self._enqueue_fan_out([outcome.content for outcome in generated])
                 except Exception as e:
-                    logger.error(f"Error posting to {platform_name}: {e}")
+                    logger.error(f"Error enqueueing multi-platform fan-out: {e}")
+                    for outcome in generated:
+                        outcome.status, outcome.error = "error", f"enqueue failed: {e}"
+                    generated = []
             
-            logger.info("Multi-platform distribution completed")
+            # Without long-running outbox workers, publish the outbox inline
+            if generated and self.ai_engine.outbox_publisher is None:
+                drain_start = time.perf_counter()
+                try:
+                    result.drained = await self.ai_engine.publish_outbox_backlog(
+                        self.ai_engine.outbox_drain_timeout)
+                finally:
+                    result.drain_seconds = time.perf_counter() - drain_start
+            
+            for outcome in outcomes:
+                FAN_OUT_OUTCOMES.labels(platform=outcome.platform, status=outcome.status).inc()
+            logger.info(f"Multi-platform distribution completed: {len(result.succeeded)} ok, "
+                        f"{len(result.failed)} failed {result.failed or ''}")
             
         except Exception as e:
+            result.error = str(e)
             logger.error(f"Error in multi-platform posting: {e}")
+        finally:
+            result.seconds = time.perf_counter() - start - result.drain_seconds
+            FAN_OUT_SECONDS.observe(result.seconds)
+        return result
+    
+    async def _generate_and_post(self, platform_name: str, solar_data: SolarData,
+                                 research_insights: List[ResearchInsight],
+                                 drafts: Optional[Dict[str, str]] = None) -> PlatformOutcome:
+        """Generate and publish one platform's content; never raises"""
+        timeout = self.platform_timeouts.get(platform_name, self.platform_timeout)
+        start = time.perf_counter()
+        outcome = PlatformOutcome(platform_name, "error", 0.0)
+        
+        async def generate_and_post():
+            async with self.platform_limiters[platform_name]:
+                outcome.content, generated = await self._platform_content(platform_name, solar_data,
+                                                                          research_insights, drafts)
+                outcome.llm_calls = int(generated)
+                if self.ai_engine.outbox is not None:
+                    # Published by the outbox once the whole fan-out is enqueued
+                    outcome.status = "queued"
+                    return
+                success = await self.platforms[platform_name].post_content(outcome.content)
+                outcome.status = "posted" if success else "failed"
+        
+        try:
+            await asyncio.wait_for(generate_and_post(), timeout)
+            if outcome.status == "posted":
+                logger.info(f"Successfully posted to {platform_name}")
+            elif outcome.status == "failed":
+                logger.warning(f"Failed to post to {platform_name}")
+        except asyncio.TimeoutError:
+            outcome.status, outcome.error = "timeout", f"no result within {timeout:g}s"
+            logger.error(f"Posting to {platform_name} timed out after {timeout:g}s")
+        except Exception as e:
+            outcome.status, outcome.error = "error", str(e)
+            logger.error(f"Error posting to {platform_name}: {e}")
+        outcome.seconds = time.perf_counter() - start
+        return outcome
+    
+    async def _enqueue_fan_out(self, generated: List[PlatformContent]):
+        """Enqueue a whole fan-out in one outbox transaction"""
+        batch_id = uuid.uuid4().hex
+        items = [
+            (content.platform, asdict(content), f"{batch_id}:{content.platform}")
+            for content in generated
+        ]
+        await asyncio.to_thread(self.ai_engine.outbox.enqueue_many, items)
+        logger.info(f"Enqueued fan-out {batch_id} for {len(items)} platforms")
+
+def _truncate(text: str, limit: int) -> str:
+    """``text`` cut to at most ``limit`` characters at a word boundary"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
 
 class LinkedInPlatform:
     """LinkedIn platform integration"""
     
+    @timed(PLATFORM_POST_SECONDS.labels(platform="linkedin"))
     async def post_content(self, content: PlatformContent) -> bool:
         """Post content to LinkedIn"""
         try:
@@ -167,8 +472,9 @@ class LinkedInPlatform:
             }
             
             logger.info(f"LINKEDIN: Posting professional content: {content.content[:50]}...")
-            logger.info(f"Post data: {json.dumps(post_data, indent=2)}")
+            log_payload(logger, "Post data", post_data)
             
+            POSTS_TOTAL.labels(platform="linkedin").inc()
             return True
             
         except Exception as e:
@@ -178,6 +484,7 @@ class LinkedInPlatform:
 class YouTubePlatform:
     """YouTube platform integration"""
     
+    @timed(PLATFORM_POST_SECONDS.labels(platform="youtube"))
     async def post_content(self, content: PlatformContent) -> bool:
         """Post content to YouTube"""
         try:
@@ -192,8 +499,9 @@ class YouTubePlatform:
             }
             
             logger.info(f"YOUTUBE: Creating educational video: {video_data['title']}")
-            logger.info(f"Video data: {json.dumps(video_data, indent=2)}")
+            log_payload(logger, "Video data", video_data)
             
+            POSTS_TOTAL.labels(platform="youtube").inc()
             return True
             
         except Exception as e:
@@ -203,6 +511,7 @@ class YouTubePlatform:
 class TikTokPlatform:
     """TikTok platform integration"""
     
+    @timed(PLATFORM_POST_SECONDS.labels(platform="tiktok"))
     async def post_content(self, content: PlatformContent) -> bool:
         """Post content to TikTok"""
         try:
@@ -217,8 +526,9 @@ class TikTokPlatform:
             }
             
             logger.info(f"TIKTOK: Creating viral short: {content.content[:30]}...")
-            logger.info(f"TikTok data: {json.dumps(tiktok_data, indent=2)}")
+            log_payload(logger, "TikTok data", tiktok_data)
             
+            POSTS_TOTAL.labels(platform="tiktok").inc()
             return True
             
         except Exception as e:
@@ -228,6 +538,7 @@ class TikTokPlatform:
 class InstagramPlatform:
     """Instagram platform integration"""
     
+    @timed(PLATFORM_POST_SECONDS.labels(platform="instagram"))
     async def post_content(self, content: PlatformContent) -> bool:
         """Post content to Instagram"""
         try:
@@ -242,8 +553,9 @@ class InstagramPlatform:
             }
             
             logger.info(f"INSTAGRAM: Creating visual post: {content.content[:30]}...")
-            logger.info(f"Instagram data: {json.dumps(instagram_data, indent=2)}")
+            log_payload(logger, "Instagram data", instagram_data)
             
+            POSTS_TOTAL.labels(platform="instagram").inc()
             return True
             
         except Exception as e:
@@ -253,6 +565,7 @@ class InstagramPlatform:
 class RedditPlatform:
     """Reddit platform integration"""
     
+    @timed(PLATFORM_POST_SECONDS.labels(platform="reddit"))
     async def post_content(self, content: PlatformContent) -> bool:
         """Post content to Reddit"""
         try:
@@ -267,8 +580,9 @@ class RedditPlatform:
             }
             
             logger.info(f"REDDIT: Creating community post: {reddit_data['title']}")
-            logger.info(f"Reddit data: {json.dumps(reddit_data, indent=2)}")
+            log_payload(logger, "Reddit data", reddit_data)
             
+            POSTS_TOTAL.labels(platform="reddit").inc()
             return True
             
         except Exception as e:
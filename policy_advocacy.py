@@ -5,7 +5,6 @@ Automated legislative tracking, stakeholder engagement, and advocacy campaigns
 """
 
 import asyncio
-import aiohttp
 import json
 import logging
 import time
@@ -14,15 +13,19 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import random
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 
 # Import our existing components
 from ai_engine import SolarAscensionAIEngine, SolarData, ResearchInsight
+from log_config import log_payload
+from metrics_registry import REGISTRY, timed
 
 logger = logging.getLogger(__name__)
 
+ADVOCACY_CAMPAIGN_SECONDS = REGISTRY.histogram(
+    "solar_advocacy_campaign_seconds", "Latency of a complete advocacy campaign"
+).labels()
+ADVOCACY_EMAILS_TOTAL = REGISTRY.counter("solar_advocacy_emails_total", "Advocacy emails sent").labels()
+
 @dataclass
 class LegislativeBill:
     """Legislative bill tracking"""
@@ -297,7 +300,7 @@ Solar Ascension Advocacy Team
             }
             
             logger.info(f"ADVOCACY EMAIL: Sending to {stakeholder.name} at {stakeholder.email}")
-            logger.info(f"Email data: {json.dumps(email_data, indent=2)}")
+            log_payload(logger, "Email data", email_data)
             
             # Update stakeholder contact record
             stakeholder.last_contact = datetime.now()
@@ -308,6 +311,7 @@ Solar Ascension Advocacy Team
             logger.error(f"Error sending advocacy email: {e}")
             return False
     
+    @timed(ADVOCACY_CAMPAIGN_SECONDS)
     async def run_advocacy_campaign(self, bill: LegislativeBill) -> bool:
         """Run automated advocacy campaign for a bill"""
         try:
@@ -341,6 +345,7 @@ Solar Ascension Advocacy Team
                     
                     if success:
                         campaign.metrics["emails_sent"] += 1
+                        ADVOCACY_EMAILS_TOTAL.inc()
                         
                 except Exception as e:
                     logger.error(f"Error in campaign for {stakeholder.name}: {e}")
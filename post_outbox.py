@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Post Outbox
+Durable SQLite write-ahead outbox with leased workers
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_CLAIMED = "claimed"
+STATUS_PUBLISHED = "published"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    needs_reconcile INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    published_at REAL,
+    external_id TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, available_at, id);
+"""
+
+@dataclass
+class OutboxEntry:
+    """A post waiting to be published"""
+    id: int
+    idempotency_key: str
+    channel: str
+    payload: Dict
+    attempts: int
+    needs_reconcile: bool
+
+# Publishes an entry and returns the platform's post ID (or None on failure)
+Publisher = Callable[[OutboxEntry], Awaitable[Optional[str]]]
+# Checks whether a replayed entry already went out before a crash
+Reconciler = Callable[[OutboxEntry], Awaitable[Optional[str]]]
+
+class PostOutbox:
+    """SQLite-backed outbox of generated posts.
+
+    Posts are enqueued transactionally and claimed by workers under a
+    time-limited lease that the worker renews before each send. Every
+    publication is acknowledged durably before the worker moves on.
+    Entries whose lease expired (for example because the process died
+    mid-fan-out) are handed out again flagged ``needs_reconcile`` so the
+    publisher can check for an earlier successful send before retrying.
+    """
+
+    def __init__(self, db_path: str = "solar_ascension_outbox.db", max_attempts: int = 5):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(self, channel: str, payload: Dict, idempotency_key: Optional[str] = None) -> str:
+        """Durably enqueue a single post and return its idempotency key"""
+        return self.enqueue_many([(channel, payload, idempotency_key)])[0]
+
+    def enqueue_many(self, items: Iterable[Tuple[str, Dict, Optional[str]]]) -> List[str]:
+        """Enqueue several posts atomically (e.g. a thread or a platform fan-out)"""
+        now = time.time()
+        rows = [
+            (key or uuid.uuid4().hex, channel, json.dumps(payload, ensure_ascii=False), now)
+            for channel, payload, key in items
+        ]
+
+        def insert(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, channel, payload, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+        self._transaction(insert)
+        return [row[0] for row in rows]
+
+    def recover(self) -> int:
+        """Return entries leased by dead processes to the queue for replay"""
+        def release(conn):
+            owners = [row[0] for row in conn.execute(
+                "SELECT DISTINCT lease_owner FROM outbox WHERE status = ?", (STATUS_CLAIMED,)
+            )]
+            dead = [owner for owner in owners if not self._owner_alive(owner)]
+            if not dead:
+                return 0
+
+            cursor = conn.executemany(
+                "UPDATE outbox SET status = ?, needs_reconcile = 1, lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = ? AND lease_owner IS ?",
+                [(STATUS_PENDING, STATUS_CLAIMED, owner) for owner in dead]
+            )
+            return cursor.rowcount
+
+        recovered = self._transaction(release)
+        if recovered:
+            logger.warning(f"Outbox recovered {recovered} unacknowledged posts for replay")
+        return recovered
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        """Check whether the process holding a lease is still running"""
+        if owner is None:
+            return False
+        if owner.startswith(f"{self.instance_id}:"):
+            return True
+        try:
+            pid = int(owner.split("-", 1)[0])
+        except ValueError:
+            return False
+        # A restarted process can inherit its predecessor's PID (e.g. in containers)
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def claim(self, worker_id: str, limit: int = 1, lease_seconds: float = 60.0) -> List[OutboxEntry]:
+        """Lease up to ``limit`` publishable entries to a worker"""
+        now = time.time()
+        owner = f"{self.instance_id}:{worker_id}"
+
+        def lease(conn):
+            rows = conn.execute(
+                "SELECT id, idempotency_key, channel, payload, attempts, needs_reconcile, status FROM outbox "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (STATUS_PENDING, now, STATUS_CLAIMED, now, limit)
+            ).fetchall()
+            if not rows:
+                return []
+
+            conn.executemany(
+                "UPDATE outbox SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "needs_reconcile = needs_reconcile OR ? WHERE id = ?",
+                [(STATUS_CLAIMED, owner, now + lease_seconds, row[6] == STATUS_CLAIMED, row[0]) for row in rows]
+            )
+            return [
+                OutboxEntry(
+                    id=row[0],
+                    idempotency_key=row[1],
+                    channel=row[2],
+                    payload=json.loads(row[3]),
+                    attempts=row[4] + 1,
+                    # An expired lease means an earlier attempt may have succeeded
+                    needs_reconcile=bool(row[5]) or row[6] == STATUS_CLAIMED
+                )
+                for row in rows
+            ]
+
+        return self._transaction(lease)
+
+    def extend_lease(self, entry_id: int, worker_id: str, lease_seconds: float = 60.0) -> bool:
+        """Renew a worker's lease on an entry; False if the lease was lost to another worker"""
+        owner = f"{self.instance_id}:{worker_id}"
+
+        def renew(conn):
+            return conn.execute(
+                "UPDATE outbox SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + lease_seconds, entry_id, STATUS_CLAIMED, owner)
+            ).rowcount == 1
+
+        return self._transaction(renew)
+
+    def ack(self, entry_id: int, external_id: Optional[str] = None):
+        """Durably record a successful publication before returning"""
+        def write(conn):
+            conn.execute(
+                "UPDATE outbox SET status = 'published', published_at = ?, external_id = ?, "
+                "lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                (time.time(), external_id, entry_id)
+            )
+
+        self._transaction(write)
+
+    def release(self, entry: OutboxEntry, error: str, retry_delay: float = 30.0, reconcile: bool = False):
+        """Return a failed entry to the queue, or park it after too many attempts.
+
+        ``reconcile`` marks an attempt that may still have gone out, e.g. one that timed out.
+        """
+        failed = entry.attempts >= self.max_attempts
+        status = STATUS_FAILED if failed else STATUS_PENDING
+        available_at = time.time() + retry_delay * (2 ** (entry.attempts - 1))
+
+        def update(conn):
+            conn.execute(
+                "UPDATE outbox SET status = ?, last_error = ?, available_at = ?, "
+                "needs_reconcile = needs_reconcile OR ?, lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                (status, error[:500], available_at, reconcile, entry.id)
+            )
+
+        self._transaction(update)
+        if failed:
+            logger.error(f"Outbox entry {entry.idempotency_key} failed permanently: {error}")
+
+    def status(self, idempotency_key: str) -> Optional[Dict]:
+        """Status, attempt count and last error of one entry, or None if it is unknown"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, attempts, last_error FROM outbox WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], "attempts": row[1], "last_error": row[2]}
+
+    def count_due(self, channels: Iterable[str]) -> int:
+        """Entries of ``channels`` that are publishable now or currently leased"""
+        channels = list(channels)
+        if not channels:
+            return 0
+        placeholders = ", ".join("?" * len(channels))
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM outbox WHERE channel IN ({placeholders}) "
+                "AND ((status = ? AND available_at <= ?) OR status = ?)",
+                (*channels, STATUS_PENDING, time.time(), STATUS_CLAIMED)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Get entry counts by status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+            stats = {status: 0 for status in (STATUS_PENDING, STATUS_CLAIMED, STATUS_PUBLISHED, STATUS_FAILED)}
+            stats.update(dict(rows))
+            return stats
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+class OutboxPublisher:
+    """Worker tasks that drain the outbox independently of content generation.
+
+    Each send is given at most ``publish_timeout`` seconds (half the lease by
+    default) and the lease is renewed just before it, so no entry can be
+    re-claimed by another worker while a send is still in flight.
+    """
+
+    def __init__(self, outbox: PostOutbox, publishers: Dict[str, Publisher],
+                 reconcilers: Optional[Dict[str, Reconciler]] = None, workers: int = 2,
+                 claim_batch: int = 4, lease_seconds: float = 60.0, poll_interval: float = 0.5,
+                 publish_timeout: Optional[float] = None):
+        if publish_timeout is not None and publish_timeout >= lease_seconds:
+            raise ValueError("publish_timeout must be shorter than lease_seconds")
+        self.outbox = outbox
+        self.publishers = publishers
+        self.reconcilers = reconcilers or {}
+        self.workers = workers
+        self.claim_batch = claim_batch
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.publish_timeout = publish_timeout if publish_timeout is not None else lease_seconds / 2
+        self.published = 0
+        self.failures = 0
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self):
+        """Replay the unacknowledged tail and start the worker tasks"""
+        await asyncio.to_thread(self.outbox.recover)
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker(f"worker-{i}")) for i in range(self.workers)]
+        logger.info(f"Outbox publisher started with {self.workers} workers")
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until no entry this publisher could send now remains.
+
+        Entries backing off after a failure and entries of channels without a
+        publisher stay in the outbox for a later run instead of being waited on.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            if not await asyncio.to_thread(self.outbox.count_due, self.publishers):
+                return
+            if deadline and time.monotonic() > deadline:
+                raise asyncio.TimeoutError("Outbox did not drain in time")
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self):
+        """Stop the worker tasks"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: str):
+        while not self._stopping:
+            entries = await asyncio.to_thread(
+                self.outbox.claim, worker_id, self.claim_batch, self.lease_seconds
+            )
+            if not entries:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            for entry in entries:
+                # Later entries of a batch have waited behind earlier sends; take a fresh lease first
+                renewed = await asyncio.to_thread(self.outbox.extend_lease, entry.id, worker_id,
+                                                  self.lease_seconds)
+                if not renewed:
+                    logger.warning(f"Lease on outbox entry {entry.idempotency_key} lost; skipping it")
+                    continue
+                await self._publish(entry)
+
+    async def _publish(self, entry: OutboxEntry):
+        publisher = self.publishers.get(entry.channel)
+        if publisher is None:
+            await asyncio.to_thread(self.outbox.release, entry, f"No publisher for channel {entry.channel}")
+            self.failures += 1
+            return
+
+        try:
+            external_id = await asyncio.wait_for(self._send(entry, publisher), self.publish_timeout)
+            if not external_id:
+                raise RuntimeError("publisher reported failure")
+
+            self.published += 1
+            await asyncio.to_thread(self.outbox.ack, entry.id, external_id)
+        except asyncio.TimeoutError:
+            logger.error(f"Publishing outbox entry {entry.idempotency_key} to {entry.channel} "
+                         f"timed out after {self.publish_timeout:g}s")
+            self.failures += 1
+            # The send may still have gone out; check before any retry
+            await asyncio.to_thread(self.outbox.release, entry, "publish timed out", reconcile=True)
+        except Exception as e:
+            logger.error(f"Error publishing outbox entry {entry.idempotency_key} to {entry.channel}: {e}")
+            self.failures += 1
+            await asyncio.to_thread(self.outbox.release, entry, str(e))
+
+    async def _send(self, entry: OutboxEntry, publisher: Publisher) -> Optional[str]:
+        if entry.needs_reconcile and entry.channel in self.reconcilers:
+            external_id = await self.reconcilers[entry.channel](entry)
+            if external_id:
+                logger.info(f"Outbox entry {entry.idempotency_key} already published as {external_id}")
+                return external_id
+        return await publisher(entry)
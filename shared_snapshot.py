@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Shared Snapshot
+Single-writer shared-memory snapshots and columnar history for multi-worker dashboard serving
+
+Usage:
+    python shared_snapshot.py          # the one collector process
+    gunicorn -w 8 -k gthread --threads 32 'analytics_dashboard:create_worker_server()'
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from analytics_dashboard import AnalyticsMetrics, MetricsSnapshot, frozen_metrics
+from anomaly_detection import Anomaly
+from metrics_history import HISTORY_FIELDS, MetricsHistory
+from metrics_rollup import MetricsRollupStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHM_NAME = "solar_ascension_snapshot"
+MAGIC = int.from_bytes(b"SOLARSHM", "little")
+LAYOUT_VERSION = 1
+
+# Header slots (uint64): magic, layout, seqlock counter, snapshot version, history count,
+# snapshot blob length, schema length, history capacity
+_MAGIC, _LAYOUT, _SEQ, _VERSION, _COUNT, _BLOB_LEN, _SCHEMA_LEN, _CAPACITY = range(8)
+HEADER_BYTES = 64
+SCHEMA_BYTES = 4096
+
+METRIC_SECTIONS = ("solar_production", "social_engagement", "policy_impact",
+                   "economic_metrics", "environmental_impact")
+
+def _region_sizes(capacity: int, field_count: int, blob_bytes: int) -> Dict[str, int]:
+    history_offset = HEADER_BYTES + SCHEMA_BYTES
+    blob_offset = history_offset + MetricsHistory.buffer_size(capacity, field_count)
+    return {"history": history_offset, "blob": blob_offset, "total": blob_offset + blob_bytes}
+
+class SharedSnapshotWriter:
+    """Publishes snapshots and their history points into one shared memory block.
+
+    Every publication is bracketed by a seqlock counter: it is made odd
+    before writing and even afterwards, so readers can detect and retry a
+    read that overlapped a write without ever taking a lock. Register
+    ``publish`` as a BackgroundCollector listener in the single collector
+    process.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, capacity: int = 1000, history_window: int = 50,
+                 blob_bytes: int = 256 * 1024, rollup_db: Optional[str] = None):
+        self.name = name
+        self.capacity = capacity
+        self.blob_bytes = blob_bytes
+        self.fields = dict(HISTORY_FIELDS)
+        self.regions = _region_sizes(capacity, len(self.fields), blob_bytes)
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.regions["total"])
+        except FileExistsError:
+            # Left behind by a collector that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.regions["total"])
+
+        self._header = np.ndarray(8, dtype=np.uint64, buffer=self.shm.buf)
+        self.history = MetricsHistory(capacity, self.fields,
+                                      buffer=self.shm.buf[self.regions["history"]:self.regions["blob"]])
+
+        schema = json.dumps({
+            "fields": self.fields,
+            "history_window": history_window,
+            "blob_bytes": blob_bytes,
+            "rollup_db": os.path.abspath(rollup_db) if rollup_db else None
+        }).encode("utf-8")
+        if len(schema) > SCHEMA_BYTES:
+            raise ValueError("shared snapshot schema does not fit in its region")
+        self.shm.buf[HEADER_BYTES:HEADER_BYTES + len(schema)] = schema
+
+        self._header[_SCHEMA_LEN] = len(schema)
+        self._header[_CAPACITY] = capacity
+        self._header[_LAYOUT] = LAYOUT_VERSION
+        self._header[_MAGIC] = MAGIC
+
+    def publish(self, snapshot: MetricsSnapshot):
+        """Copy a snapshot's new history points and metrics into shared memory"""
+        metrics = snapshot.metrics
+        blob = json.dumps({
+            "version": snapshot.version,
+            "metrics": {section: getattr(metrics, section) for section in METRIC_SECTIONS},
+            "timestamp": metrics.timestamp.isoformat(),
+            "anomalies": [anomaly.as_dict() for anomaly in metrics.anomalies],
+            "fallback_series": list(metrics.fallback_series),
+            "collected_at": snapshot.collected_at.isoformat(),
+            "collection_seconds": snapshot.collection_seconds
+        }, default=_json_default).encode("utf-8")
+        if len(blob) > self.blob_bytes:
+            logger.error(f"Snapshot {snapshot.version} is {len(blob)} bytes; shared region holds {self.blob_bytes}")
+            return
+
+        history = snapshot.history
+        new_points = min(snapshot.history_sequence - self.history.total_appended, len(history["timestamp"]))
+        timestamps = history["timestamp"].view(np.int64)
+        blob_start = self.regions["blob"]
+
+        header = self._header
+        header[_SEQ] += 1  # odd: write in progress
+        try:
+            # Points land in the slots their sequence numbers map to, as in the collector's own history
+            self.history.set_count(snapshot.history_sequence - max(new_points, 0))
+            for index in range(len(timestamps) - max(new_points, 0), len(timestamps)):
+                self.history.append_row(timestamps[index], {name: history[name][index] for name in self.fields})
+            self.history.set_count(snapshot.history_sequence)
+            self.shm.buf[blob_start:blob_start + len(blob)] = blob
+            header[_BLOB_LEN] = len(blob)
+            header[_COUNT] = snapshot.history_sequence
+            header[_VERSION] = snapshot.version
+        finally:
+            # Even again even if the copy failed, or readers would spin on this write forever;
+            # they fall back to their last good snapshot if what is left does not decode
+            header[_SEQ] += 1
+
+    def close(self, unlink: bool = True):
+        self._header = None
+        self.history = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+class SharedSnapshotReader:
+    """Read side of a SharedSnapshotWriter, for serving workers.
+
+    Offers the same surface the dashboard uses on a BackgroundCollector
+    (``latest``, ``history_window``, ``metrics_history``, ``rollups``,
+    ``add_listener``, ``start``/``stop``). A snapshot copies the metrics
+    blob and its live history window inside the seqlock-validated read, so
+    it stays intact while the writer moves on; this happens only when the
+    version changes. ``metrics_history`` itself is a view of the shared
+    block for range queries, which copy what they return.
+
+    A read that keeps overlapping writes for ``read_timeout`` seconds (or
+    finds a writer that died mid-publication) returns the last good snapshot
+    instead of blocking the request thread.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, poll_interval: float = 0.1, attach_timeout: float = 30.0,
+                 read_timeout: float = 0.05):
+        self.name = name
+        self.poll_interval = poll_interval
+        self.read_timeout = read_timeout
+        self.shm = self._attach(name, attach_timeout)
+        self._header = np.ndarray(8, dtype=np.uint64, buffer=self.shm.buf)
+
+        schema_len = int(self._header[_SCHEMA_LEN])
+        schema = json.loads(bytes(self.shm.buf[HEADER_BYTES:HEADER_BYTES + schema_len]))
+        self.fields = {name: tuple(path) for name, path in schema["fields"].items()}
+        self.history_window = schema["history_window"]
+        capacity = int(self._header[_CAPACITY])
+        self.regions = _region_sizes(capacity, len(self.fields), schema["blob_bytes"])
+        self.metrics_history = MetricsHistory(capacity, self.fields,
+                                              buffer=self.shm.buf[self.regions["history"]:self.regions["blob"]])
+        self.rollups = MetricsRollupStore(schema["rollup_db"]) if schema["rollup_db"] else None
+
+        self.read_retries = 0
+        self._latest: Optional[MetricsSnapshot] = None
+        self._listeners: List[Callable[[MetricsSnapshot], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _attach(name: str, timeout: float) -> shared_memory.SharedMemory:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+                continue
+            # Attaching registers the block with this process's resource tracker, which would
+            # unlink it when the worker exits; only the writer owns the block's lifetime
+            resource_tracker.unregister(shm._name, "shared_memory")
+            header = np.ndarray(8, dtype=np.uint64, buffer=shm.buf)
+            if int(header[_MAGIC]) == MAGIC and int(header[_LAYOUT]) == LAYOUT_VERSION:
+                del header
+                return shm
+            del header
+            shm.close()
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Shared memory {name} is not a snapshot block of layout {LAYOUT_VERSION}")
+            time.sleep(0.2)
+
+    @property
+    def latest(self) -> Optional[MetricsSnapshot]:
+        """Latest consistent snapshot; re-read from shared memory only when its version changed"""
+        header = self._header
+        deadline = time.monotonic() + self.read_timeout
+        while True:
+            if time.monotonic() > deadline:
+                logger.warning("Shared snapshot stayed mid-write; serving the last good snapshot")
+                return self._latest
+            before = int(header[_SEQ])
+            if before & 1:
+                self.read_retries += 1
+                time.sleep(0)
+                continue
+            version = int(header[_VERSION])
+            if version == 0:
+                return None
+            if self._latest is not None and self._latest.version == version:
+                return self._latest
+            count = int(header[_COUNT])
+            blob_start = self.regions["blob"]
+            blob = bytes(self.shm.buf[blob_start:blob_start + int(header[_BLOB_LEN])])
+            self.metrics_history.set_count(count)
+            history = {}
+            for column, view in self.metrics_history.window(self.history_window).items():
+                history[column] = view.copy()
+                history[column].flags.writeable = False
+            if int(header[_SEQ]) == before:
+                break
+            self.read_retries += 1
+
+        try:
+            data = json.loads(blob)
+            metrics = data["metrics"]
+            snapshot = MetricsSnapshot(
+                version=data["version"],
+                metrics=frozen_metrics(AnalyticsMetrics(
+                    timestamp=datetime.fromisoformat(data["timestamp"]),
+                    anomalies=tuple(Anomaly.from_dict(anomaly) for anomaly in data["anomalies"]),
+                    fallback_series=tuple(data.get("fallback_series", ())),
+                    **{section: metrics[section] for section in METRIC_SECTIONS}
+                )),
+                history=MappingProxyType(history),
+                history_sequence=count,
+                collected_at=datetime.fromisoformat(data["collected_at"]),
+                collection_seconds=data["collection_seconds"]
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            # Left behind by a publication that failed part-way
+            logger.error(f"Unreadable shared snapshot {version}: {e}")
+            return self._latest
+        self._latest = snapshot
+        return snapshot
+
+    def add_listener(self, listener: Callable[[MetricsSnapshot], None]):
+        """Call ``listener`` with every new snapshot, from the watcher thread"""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Watch the version counter and notify listeners of new snapshots"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="shared-snapshot-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _watch(self):
+        seen = 0
+        while not self._stop.wait(self.poll_interval):
+            if int(self._header[_VERSION]) == seen:
+                continue
+            snapshot = self.latest
+            if snapshot is None:
+                continue
+            seen = snapshot.version
+            for listener in self._listeners:
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.error(f"Snapshot listener failed: {e}")
+
+    def close(self):
+        self.stop()
+        self._latest = None
+        self._header = None
+        self.metrics_history = None
+        self.shm.close()
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "items"):
+        return dict(value)
+    return str(value)
+
+async def main():
+    """Run the single collector process that feeds every dashboard worker"""
+    from ai_engine import SolarAscensionAIEngine
+    from analytics_dashboard import AnalyticsCollector, BackgroundCollector
+    from anomaly_detection import AnomalyDetector
+    from social_ingestion import build_social_ingestor
+
+    ai_engine = SolarAscensionAIEngine(
+        os.getenv('TWITTER_API_KEY', ''),
+        os.getenv('TWITTER_API_SECRET', ''),
+        os.getenv('OPENAI_API_KEY', '')
+    )
+    rollup_db = os.getenv('SOLAR_ROLLUP_DB', 'solar_analytics_rollups.db')
+    analytics_collector = AnalyticsCollector(ai_engine, rollups=MetricsRollupStore(rollup_db),
+                                             anomaly_detector=AnomalyDetector(),
+                                             social_ingestor=build_social_ingestor(
+                                                 os.getenv('SOLAR_SOCIAL_DB', 'solar_social_metrics.db')))
+    collector = BackgroundCollector(analytics_collector, interval=float(os.getenv('SOLAR_COLLECTION_INTERVAL', '30')))
+    writer = SharedSnapshotWriter(os.getenv('SOLAR_SNAPSHOT_SHM', DEFAULT_SHM_NAME),
+                                  capacity=analytics_collector.metrics_history.capacity,
+                                  history_window=collector.history_window, rollup_db=rollup_db)
+    collector.add_listener(writer.publish)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    collector.start()
+    logger.info(f"Publishing analytics snapshots to shared memory '{writer.name}'")
+    try:
+        await stop.wait()
+    finally:
+        collector.stop()
+        writer.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
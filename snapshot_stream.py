@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Snapshot Stream
+Server-Sent Events fan-out of dashboard snapshot frames with per-client backpressure
+"""
+
+import itertools
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterator, Optional
+
+from metrics_registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SSE_CONTENT_TYPE = "text/event-stream"
+
+STREAM_SUBSCRIBERS = REGISTRY.gauge("solar_stream_subscribers", "Connected server-push clients").labels()
+STREAM_FRAMES_SENT = REGISTRY.counter("solar_stream_frames_total", "Frames written to push clients").labels()
+STREAM_FRAMES_DROPPED = REGISTRY.counter(
+    "solar_stream_frames_dropped_total", "Stale frames dropped for slow push clients"
+).labels()
+STREAM_ENCODE_SECONDS = REGISTRY.histogram(
+    "solar_stream_encode_seconds", "Time to encode one frame for all push clients"
+).labels()
+
+# Encoders return the JSON body of a frame; previous is None for a full (reset) frame
+FrameEncoder = Callable[[object, Optional[object]], str]
+
+def sse_event(event: str, data: str, event_id: Optional[int] = None) -> bytes:
+    """Format one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+class StreamSubscription:
+    """One client's bounded mailbox of encoded frames.
+
+    When a client falls more than ``max_pending`` frames behind, its pending
+    deltas are discarded and it is sent one full frame of the latest snapshot
+    instead, so a slow reader never grows server memory or delays others.
+    """
+
+    def __init__(self, subscriber_id: int, max_pending: int):
+        self.subscriber_id = subscriber_id
+        self.max_pending = max_pending
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.closed = False
+        self.needs_full = True
+        self._pending = deque()
+        self._ready = threading.Event()
+
+    def _offer(self, frame: bytes):
+        # Called with the broadcaster lock held
+        if self.needs_full:
+            # The full frame is built on wake-up; the delta itself is not needed
+            self._ready.set()
+            return
+        if len(self._pending) >= self.max_pending:
+            dropped = len(self._pending)
+            self._pending.clear()
+            self.frames_dropped += dropped
+            STREAM_FRAMES_DROPPED.inc(dropped)
+            self.needs_full = True
+        else:
+            self._pending.append(frame)
+        self._ready.set()
+
+    def _take(self):
+        # Called with the broadcaster lock held
+        frames = list(self._pending)
+        self._pending.clear()
+        self._ready.clear()
+        return frames
+
+class SnapshotBroadcaster:
+    """Encodes each published snapshot once and fans the bytes out to every subscriber"""
+
+    def __init__(self, encode_delta: FrameEncoder, encode_full: FrameEncoder, max_pending: int = 8,
+                 heartbeat_seconds: float = 15.0):
+        self.encode_delta = encode_delta
+        self.encode_full = encode_full
+        self.max_pending = max_pending
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, StreamSubscription] = {}
+        self._ids = itertools.count(1)
+        self._latest = None
+        self._full_frame = None
+        self._full_frame_version = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, snapshot):
+        """Encode a delta against the previous snapshot and queue it for every client"""
+        with STREAM_ENCODE_SECONDS.time():
+            frame = sse_event("snapshot", self.encode_delta(snapshot, self._latest), snapshot.version)
+        with self._lock:
+            self._latest = snapshot
+            for subscription in self._subscribers.values():
+                subscription._offer(frame)
+
+    def _full_frame_for(self, snapshot) -> bytes:
+        # One full-frame encoding per snapshot version, shared by every (re)connecting client
+        with self._lock:
+            if self._full_frame_version == snapshot.version:
+                return self._full_frame
+        frame = sse_event("snapshot", self.encode_full(snapshot, None), snapshot.version)
+        with self._lock:
+            self._full_frame, self._full_frame_version = frame, snapshot.version
+        return frame
+
+    def subscribe(self) -> StreamSubscription:
+        with self._lock:
+            subscription = StreamSubscription(next(self._ids), self.max_pending)
+            self._subscribers[subscription.subscriber_id] = subscription
+        STREAM_SUBSCRIBERS.set(self.subscriber_count)
+        return subscription
+
+    def unsubscribe(self, subscription: StreamSubscription):
+        subscription.closed = True
+        subscription._ready.set()
+        with self._lock:
+            self._subscribers.pop(subscription.subscriber_id, None)
+        STREAM_SUBSCRIBERS.set(self.subscriber_count)
+
+    def _next_frames(self, subscription: StreamSubscription):
+        with self._lock:
+            if subscription.needs_full:
+                if self._latest is None:
+                    return []
+                snapshot = self._latest
+                subscription.needs_full = False
+                subscription._take()
+                resync = True
+            else:
+                return subscription._take()
+        # Deltas published after this point are queued behind the full frame
+        return [self._full_frame_for(snapshot)] if resync else []
+
+    def stream(self, subscription: StreamSubscription) -> Iterator[bytes]:
+        """Generator of SSE bytes for one client; unsubscribes when the client goes away"""
+        try:
+            yield b"retry: 2000\n\n"
+            while not subscription.closed:
+                frames = self._next_frames(subscription)
+                if frames:
+                    for frame in frames:
+                        yield frame
+                    subscription.frames_sent += len(frames)
+                    STREAM_FRAMES_SENT.inc(len(frames))
+                    continue
+                if not subscription._ready.wait(self.heartbeat_seconds):
+                    # Comment line keeps proxies from timing out and surfaces dead connections
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self):
+        """Disconnect every client"""
+        with self._lock:
+            subscriptions = list(self._subscribers.values())
+        for subscription in subscriptions:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            subscriptions = list(self._subscribers.values())
+        return {
+            "subscribers": len(subscriptions),
+            "frames_sent": sum(s.frames_sent for s in subscriptions),
+            "frames_dropped": sum(s.frames_dropped for s in subscriptions),
+            "latest_version": self._latest.version if self._latest is not None else None
+        }
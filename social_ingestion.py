@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Solar Ascension Social Ingestion
+Incremental per-platform engagement ingestion into a SQLite per-post time series
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from content_pipeline import PostRateLimiter
+from metrics_registry import REGISTRY
+from metrics_rollup import wall_seconds
+
+logger = logging.getLogger(__name__)
+
+SOCIAL_PLATFORMS = ("twitter", "linkedin", "youtube", "tiktok", "instagram", "reddit")
+
+INGEST_SECONDS = REGISTRY.histogram(
+    "solar_social_ingest_seconds", "Time to fetch and store one platform's changes", labels=("platform",)
+)
+POSTS_CHANGED = REGISTRY.counter(
+    "solar_social_posts_changed_total", "Posts whose engagement changed at ingestion", labels=("platform",)
+)
+INGEST_ERRORS = REGISTRY.counter("solar_social_ingest_errors_total", "Failed platform fetches", labels=("platform",))
+
+@dataclass
+class SocialPost:
+    """Engagement counters of one post as last reported by its platform"""
+    platform: str
+    post_id: str
+    published_at: datetime
+    likes: int = 0
+    comments: int = 0
+    shares: int = 0
+    impressions: int = 0
+
+    @property
+    def engagement(self) -> int:
+        return self.likes + self.comments + self.shares
+
+@dataclass
+class FetchResult:
+    """Posts a fetcher saw since its cursor, the account's follower count and the cursor to resume from"""
+    posts: List[SocialPost] = field(default_factory=list)
+    followers: Optional[int] = None
+    cursor: Optional[str] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS social_posts (
+    platform TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    published_at INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    shares INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (platform, post_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_social_posts_published ON social_posts (platform, published_at);
+CREATE TABLE IF NOT EXISTS social_engagement (
+    platform TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    observed_at INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    shares INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    PRIMARY KEY (platform, post_id, observed_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS social_accounts (
+    platform TEXT PRIMARY KEY,
+    cursor TEXT,
+    followers INTEGER,
+    fetched_at INTEGER
+);
+"""
+
+_COUNTERS = ("likes", "comments", "shares", "impressions")
+
+class SocialMetricsStore:
+    """Latest counters per post, a time series of every change, and a cursor per platform.
+
+    ``apply`` compares incoming posts with their stored counters and writes
+    only the ones that changed, so write volume follows activity. Per-platform
+    totals are kept as running sums updated by the same deltas, which makes
+    ``summary`` independent of how many posts have ever been ingested.
+    """
+
+    def __init__(self, db_path: str = "solar_social_metrics.db", viral_threshold: int = 1000):
+        self.db_path = db_path
+        self.viral_threshold = viral_threshold
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # One scan at startup; afterwards totals move only by the deltas of changed posts
+        self._totals: Dict[str, Dict[str, int]] = {
+            platform: {"posts": 0, "engagement": 0, "impressions": 0, "viral_posts": 0, "followers": 0}
+            for platform in SOCIAL_PLATFORMS
+        }
+        rows = self._conn.execute(
+            "SELECT platform, COUNT(*), SUM(likes + comments + shares), SUM(impressions), "
+            "SUM(likes + comments + shares >= ?) FROM social_posts GROUP BY platform", (viral_threshold,)
+        ).fetchall()
+        for platform, posts, engagement, impressions, viral in rows:
+            self._totals.setdefault(platform, {"followers": 0}).update(
+                posts=posts, engagement=engagement or 0, impressions=impressions or 0, viral_posts=viral or 0
+            )
+        for platform, followers in self._conn.execute("SELECT platform, followers FROM social_accounts"):
+            self._totals.setdefault(platform, {"posts": 0, "engagement": 0, "impressions": 0, "viral_posts": 0})
+            self._totals[platform]["followers"] = followers or 0
+
+    def cursor(self, platform: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT cursor FROM social_accounts WHERE platform = ?", (platform,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, platform: str, result: FetchResult, observed_at: Optional[datetime] = None) -> int:
+        """Store the posts of one fetch that changed; returns how many did"""
+        observed = wall_seconds(observed_at or datetime.now())
+        incoming = {post.post_id: post for post in result.posts}
+
+        with self._lock:
+            stored = self._stored_counters(platform, list(incoming))
+            changed = []
+            for post_id, post in incoming.items():
+                counters = (post.likes, post.comments, post.shares, post.impressions)
+                if stored.get(post_id) != counters:
+                    changed.append((post, counters, stored.get(post_id)))
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO social_posts VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (platform, post_id) DO UPDATE SET likes = excluded.likes, "
+                    "comments = excluded.comments, shares = excluded.shares, "
+                    "impressions = excluded.impressions, updated_at = excluded.updated_at",
+                    [(platform, post.post_id, wall_seconds(post.published_at), *counters, observed)
+                     for post, counters, _ in changed]
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO social_engagement VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(platform, post.post_id, observed, *counters) for post, counters, _ in changed]
+                )
+                self._conn.execute(
+                    "INSERT INTO social_accounts VALUES (?, ?, ?, ?) ON CONFLICT (platform) DO UPDATE SET "
+                    "cursor = excluded.cursor, followers = COALESCE(excluded.followers, followers), "
+                    "fetched_at = excluded.fetched_at",
+                    (platform, result.cursor, result.followers, observed)
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+            totals = self._totals.setdefault(
+                platform, {"posts": 0, "engagement": 0, "impressions": 0, "viral_posts": 0, "followers": 0}
+            )
+            for post, counters, previous in changed:
+                before = previous or (0, 0, 0, 0)
+                engagement_before = sum(before[:3])
+                totals["posts"] += previous is None
+                totals["engagement"] += post.engagement - engagement_before
+                totals["impressions"] += post.impressions - before[3]
+                totals["viral_posts"] += ((post.engagement >= self.viral_threshold)
+                                          - (previous is not None and engagement_before >= self.viral_threshold))
+            if result.followers is not None:
+                totals["followers"] = result.followers
+        return len(changed)
+
+    def _stored_counters(self, platform: str, post_ids: List[str]) -> Dict[str, Tuple[int, int, int, int]]:
+        stored = {}
+        for offset in range(0, len(post_ids), 500):
+            batch = post_ids[offset:offset + 500]
+            rows = self._conn.execute(
+                f"SELECT post_id, likes, comments, shares, impressions FROM social_posts "
+                f"WHERE platform = ? AND post_id IN ({', '.join('?' * len(batch))})",
+                (platform, *batch)
+            ).fetchall()
+            stored.update((row[0], tuple(row[1:])) for row in rows)
+        return stored
+
+    def engagement_series(self, platform: str, post_id: str) -> Dict[str, np.ndarray]:
+        """Every recorded change of one post's counters; ``timestamp`` is datetime64[s]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT observed_at, likes, comments, shares, impressions FROM social_engagement "
+                "WHERE platform = ? AND post_id = ? ORDER BY observed_at", (platform, post_id)
+            ).fetchall()
+        table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+        series = {"timestamp": table[:, 0].astype("datetime64[s]")}
+        for index, name in enumerate(_COUNTERS, start=1):
+            series[name] = table[:, index]
+        series["engagement"] = table[:, 1] + table[:, 2] + table[:, 3]
+        return series
+
+    def summary(self, now: Optional[datetime] = None) -> Dict:
+        """Social engagement metrics in the shape AnalyticsCollector publishes"""
+        now = now or datetime.now()
+        midnight = wall_seconds(now.replace(hour=0, minute=0, second=0, microsecond=0))
+        with self._lock:
+            # Index range scan over today's posts only
+            posts_today = dict(self._conn.execute(
+                "SELECT platform, COUNT(*) FROM social_posts WHERE published_at >= ? GROUP BY platform", (midnight,)
+            ).fetchall())
+            totals = {platform: dict(values) for platform, values in self._totals.items()}
+
+        breakdown = {
+            platform: {
+                "followers": values["followers"],
+                "engagement": values["engagement"],
+                "posts": posts_today.get(platform, 0),
+                "viral_posts": values["viral_posts"],
+                "impressions": values["impressions"],
+                "posts_tracked": values["posts"]
+            }
+            for platform, values in totals.items()
+        }
+        total_followers = sum(values["followers"] for values in breakdown.values())
+        total_engagement = sum(values["engagement"] for values in breakdown.values())
+        total_impressions = sum(values["impressions"] for values in breakdown.values())
+        return {
+            "total_followers": total_followers,
+            "total_engagement": total_engagement,
+            "posts_today": sum(values["posts"] for values in breakdown.values()),
+            "viral_posts": sum(values["viral_posts"] for values in breakdown.values()),
+            "platform_breakdown": breakdown,
+            "engagement_rate": total_engagement / max(total_followers, 1) * 100,
+            # Measured impressions where platforms report them, else the old follower-based estimate
+            "reach_estimate": total_impressions or total_followers * 2.5,
+            "timestamp": now.isoformat()
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SocialFetcher:
+    """Fetches the engagement of one platform's posts that changed since a cursor.
+
+    Every API request goes through ``limiter``, so concurrent fetchers each
+    stay within their own platform's budget. Subclasses implement
+    ``fetch_changes``; ``configured`` is False when credentials are missing.
+    """
+    platform = ""
+
+    def __init__(self, requests_per_hour: Optional[float] = None, poll_interval: float = 300.0):
+        self.limiter = PostRateLimiter(requests_per_hour)
+        self.poll_interval = poll_interval
+
+    @property
+    def configured(self) -> bool:
+        return True
+
+    async def fetch_changes(self, cursor: Optional[str]) -> FetchResult:
+        raise NotImplementedError
+
+def _parse_time(value) -> datetime:
+    """Local naive datetime from an ISO 8601 string or epoch seconds"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00").replace("+0000", "+00:00"))
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+
+class HTTPSocialFetcher(SocialFetcher):
+    """Fetcher for a platform HTTP API with a bearer token and an account ID from the environment.
+
+    Platforms do not offer "engagement changed since", so each sweep reads the
+    posts published within ``active_days`` (older posts rarely move) and the
+    store discards the unchanged ones. The returned cursor is the sweep time.
+    """
+    api = ""
+    token_env = ""
+    account_env = ""
+
+    def __init__(self, token: Optional[str] = None, account_id: Optional[str] = None, session=None,
+                 active_days: int = 7, max_pages: int = 10, requests_per_hour: Optional[float] = 900,
+                 poll_interval: float = 300.0):
+        super().__init__(requests_per_hour, poll_interval)
+        self.token = token if token is not None else os.getenv(self.token_env, "")
+        self.account_id = account_id if account_id is not None else os.getenv(self.account_env, "")
+        # Optional shared aiohttp.ClientSession; a short-lived one is used otherwise
+        self.session = session
+        self.active_days = active_days
+        self.max_pages = max_pages
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.token and (self.account_id or not self.account_env))
+
+    def _client_session(self):
+        if self.session is not None:
+            return nullcontext(self.session)
+
+        import aiohttp
+        return aiohttp.ClientSession()
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def _request(self, session, path: str, params: Optional[Dict] = None, method: str = "GET",
+                       json_body: Optional[Dict] = None) -> Dict:
+        await self.limiter.acquire()
+        async with session.request(method, f"{self.api}{path}", params=params, json=json_body,
+                                   headers=self._headers()) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def fetch_changes(self, cursor: Optional[str]) -> FetchResult:
+        since = datetime.now() - timedelta(days=self.active_days)
+        sweep_started = datetime.now()
+        async with self._client_session() as session:
+            followers = await self.fetch_followers(session)
+            posts: List[SocialPost] = []
+            page = None
+            for _ in range(self.max_pages):
+                batch, page = await self.fetch_page(session, since, page)
+                posts.extend(post for post in batch if post.published_at >= since)
+                if not page or (batch and min(post.published_at for post in batch) < since):
+                    break
+        return FetchResult(posts, followers, sweep_started.isoformat())
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        raise NotImplementedError
+
+    async def fetch_page(self, session, since: datetime, page) -> Tuple[List[SocialPost], Optional[object]]:
+        """One page of posts, newest first, and the token of the next page (None when done)"""
+        raise NotImplementedError
+
+class TwitterFetcher(HTTPSocialFetcher):
+    platform = "twitter"
+    api = "https://api.twitter.com/2"
+    token_env = "TWITTER_BEARER_TOKEN"
+    account_env = "TWITTER_USER_ID"
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, f"/users/{self.account_id}", {"user.fields": "public_metrics"})
+        return data["data"]["public_metrics"]["followers_count"]
+
+    async def fetch_page(self, session, since, page):
+        params = {
+            "max_results": 100,
+            "tweet.fields": "created_at,public_metrics",
+            "start_time": since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+        if page:
+            params["pagination_token"] = page
+        data = await self._request(session, f"/users/{self.account_id}/tweets", params)
+        posts = [
+            SocialPost(
+                platform=self.platform,
+                post_id=tweet["id"],
+                published_at=_parse_time(tweet["created_at"]),
+                likes=tweet["public_metrics"]["like_count"],
+                comments=tweet["public_metrics"]["reply_count"],
+                shares=tweet["public_metrics"]["retweet_count"] + tweet["public_metrics"].get("quote_count", 0),
+                impressions=tweet["public_metrics"].get("impression_count", 0)
+            )
+            for tweet in data.get("data", [])
+        ]
+        return posts, data.get("meta", {}).get("next_token")
+
+class LinkedInFetcher(HTTPSocialFetcher):
+    platform = "linkedin"
+    api = "https://api.linkedin.com/rest"
+    token_env = "LINKEDIN_ACCESS_TOKEN"
+    account_env = "LINKEDIN_ORGANIZATION_URN"
+    page_size = 50
+
+    def _headers(self) -> Dict[str, str]:
+        return {**super()._headers(), "LinkedIn-Version": "202401", "X-Restli-Protocol-Version": "2.0.0"}
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, f"/networkSizes/{quote(self.account_id, safe='')}",
+                                   {"edgeType": "COMPANY_FOLLOWED_BY_MEMBER"})
+        return data.get("firstDegreeSize")
+
+    async def fetch_page(self, session, since, page):
+        start = page or 0
+        data = await self._request(session, "/posts", {
+            "q": "author", "author": self.account_id, "count": self.page_size, "start": start
+        })
+        posts = []
+        for element in data.get("elements", []):
+            actions = await self._request(session, f"/socialActions/{quote(element['id'], safe='')}")
+            posts.append(SocialPost(
+                platform=self.platform,
+                post_id=element["id"],
+                published_at=_parse_time(element["publishedAt"] / 1000),
+                likes=actions.get("likesSummary", {}).get("totalLikes", 0),
+                comments=actions.get("commentsSummary", {}).get("aggregatedTotalComments", 0)
+            ))
+        return posts, start + self.page_size if len(data.get("elements", [])) == self.page_size else None
+
+class YouTubeFetcher(HTTPSocialFetcher):
+    platform = "youtube"
+    api = "https://www.googleapis.com/youtube/v3"
+    token_env = "YOUTUBE_API_KEY"
+    account_env = "YOUTUBE_CHANNEL_ID"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"X-Goog-Api-Key": self.token}
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, "/channels", {"part": "statistics", "id": self.account_id})
+        items = data.get("items", [])
+        return int(items[0]["statistics"]["subscriberCount"]) if items else None
+
+    async def fetch_page(self, session, since, page):
+        params = {
+            "part": "id", "channelId": self.account_id, "type": "video", "order": "date", "maxResults": 50,
+            "publishedAfter": since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+        if page:
+            params["pageToken"] = page
+        search = await self._request(session, "/search", params)
+        video_ids = [item["id"]["videoId"] for item in search.get("items", [])]
+        if not video_ids:
+            return [], None
+        videos = await self._request(session, "/videos", {"part": "statistics,snippet", "id": ",".join(video_ids)})
+        posts = [
+            SocialPost(
+                platform=self.platform,
+                post_id=video["id"],
+                published_at=_parse_time(video["snippet"]["publishedAt"]),
+                likes=int(video["statistics"].get("likeCount", 0)),
+                comments=int(video["statistics"].get("commentCount", 0)),
+                impressions=int(video["statistics"].get("viewCount", 0))
+            )
+            for video in videos.get("items", [])
+        ]
+        return posts, search.get("nextPageToken")
+
+class TikTokFetcher(HTTPSocialFetcher):
+    platform = "tiktok"
+    api = "https://open.tiktokapis.com/v2"
+    token_env = "TIKTOK_ACCESS_TOKEN"
+    # The token identifies the account
+    account_env = ""
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, "/user/info/", {"fields": "follower_count"})
+        return data["data"]["user"]["follower_count"]
+
+    async def fetch_page(self, session, since, page):
+        body = {"max_count": 20}
+        if page:
+            body["cursor"] = page
+        data = (await self._request(
+            session, "/video/list/", {"fields": "id,create_time,like_count,comment_count,share_count,view_count"},
+            method="POST", json_body=body
+        ))["data"]
+        posts = [
+            SocialPost(
+                platform=self.platform,
+                post_id=video["id"],
+                published_at=_parse_time(video["create_time"]),
+                likes=video.get("like_count", 0),
+                comments=video.get("comment_count", 0),
+                shares=video.get("share_count", 0),
+                impressions=video.get("view_count", 0)
+            )
+            for video in data.get("videos", [])
+        ]
+        return posts, data.get("cursor") if data.get("has_more") else None
+
+class InstagramFetcher(HTTPSocialFetcher):
+    platform = "instagram"
+    api = "https://graph.facebook.com/v19.0"
+    token_env = "INSTAGRAM_ACCESS_TOKEN"
+    account_env = "INSTAGRAM_USER_ID"
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, f"/{self.account_id}", {"fields": "followers_count"})
+        return data.get("followers_count")
+
+    async def fetch_page(self, session, since, page):
+        params = {"fields": "id,timestamp,like_count,comments_count", "limit": 50, "since": int(since.timestamp())}
+        if page:
+            params["after"] = page
+        data = await self._request(session, f"/{self.account_id}/media", params)
+        posts = [
+            SocialPost(
+                platform=self.platform,
+                post_id=media["id"],
+                published_at=_parse_time(media["timestamp"]),
+                likes=media.get("like_count", 0),
+                comments=media.get("comments_count", 0)
+            )
+            for media in data.get("data", [])
+        ]
+        paging = data.get("paging", {})
+        return posts, paging.get("cursors", {}).get("after") if paging.get("next") else None
+
+class RedditFetcher(HTTPSocialFetcher):
+    platform = "reddit"
+    api = "https://oauth.reddit.com"
+    token_env = "REDDIT_ACCESS_TOKEN"
+    account_env = "REDDIT_USERNAME"
+
+    def _headers(self) -> Dict[str, str]:
+        return {**super()._headers(), "User-Agent": "solar-ascension-analytics/1.0"}
+
+    async def fetch_followers(self, session) -> Optional[int]:
+        data = await self._request(session, f"/user/{self.account_id}/about")
+        return (data["data"].get("subreddit") or {}).get("subscribers")
+
+    async def fetch_page(self, session, since, page):
+        params = {"limit": 100, "sort": "new"}
+        if page:
+            params["after"] = page
+        data = (await self._request(session, f"/user/{self.account_id}/submitted", params))["data"]
+        posts = [
+            SocialPost(
+                platform=self.platform,
+                post_id=child["data"]["id"],
+                published_at=_parse_time(child["data"]["created_utc"]),
+                likes=max(child["data"].get("score", 0), 0),
+                comments=child["data"].get("num_comments", 0),
+                shares=child["data"].get("num_crossposts", 0)
+            )
+            for child in data.get("children", [])
+        ]
+        return posts, data.get("after")
+
+FETCHERS = {
+    fetcher.platform: fetcher
+    for fetcher in (TwitterFetcher, LinkedInFetcher, YouTubeFetcher, TikTokFetcher, InstagramFetcher, RedditFetcher)
+}
+
+class SocialIngestor:
+    """Runs platform fetchers concurrently and folds their changes into a SocialMetricsStore.
+
+    Each fetcher is polled at most every ``poll_interval`` seconds and resumes
+    from its stored cursor. Fetchers without credentials are skipped.
+    """
+
+    def __init__(self, store: SocialMetricsStore, fetchers: Iterable[SocialFetcher]):
+        self.store = store
+        self.fetchers = {}
+        for fetcher in fetchers:
+            if fetcher.configured:
+                self.fetchers[fetcher.platform] = fetcher
+            else:
+                logger.info(f"No credentials for {fetcher.platform}; its social metrics will not be ingested")
+        self._last_run: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def ingest(self, force: bool = False) -> Dict[str, int]:
+        """Fetch every due platform concurrently; returns changed posts per platform"""
+        now = time.monotonic()
+        due = [
+            fetcher for platform, fetcher in self.fetchers.items()
+            if force or now - self._last_run.get(platform, float("-inf")) >= fetcher.poll_interval
+        ]
+        for fetcher in due:
+            self._last_run[fetcher.platform] = now
+        changed = await asyncio.gather(*(self._ingest_platform(fetcher) for fetcher in due))
+        return dict(zip((fetcher.platform for fetcher in due), changed))
+
+    async def _ingest_platform(self, fetcher: SocialFetcher) -> int:
+        platform = fetcher.platform
+        try:
+            with INGEST_SECONDS.labels(platform=platform).time():
+                cursor = await asyncio.to_thread(self.store.cursor, platform)
+                result = await fetcher.fetch_changes(cursor)
+                changed = await asyncio.to_thread(self.store.apply, platform, result)
+            POSTS_CHANGED.labels(platform=platform).inc(changed)
+            return changed
+        except Exception as e:
+            INGEST_ERRORS.labels(platform=platform).inc()
+            logger.error(f"Error ingesting {platform} social metrics: {e}")
+            return 0
+
+    def ingest_in_background(self) -> asyncio.Task:
+        """Start an ingestion pass unless one is still running, without waiting for it"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.ingest())
+        return self._task
+
+def build_social_ingestor(db_path: str = "solar_social_metrics.db", session=None) -> SocialIngestor:
+    """Ingestor with a fetcher for every platform, configured from the environment"""
+    return SocialIngestor(SocialMetricsStore(db_path), [fetcher(session=session) for fetcher in FETCHERS.values()])
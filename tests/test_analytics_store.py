@@ -0,0 +1,76 @@
+"""Running aggregates, spilling and IDs of the post record ring buffer"""
+
+import asyncio
+import json
+import math
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics_store import PostRecordStore
+from local_standins import build_standin_engine
+
+START = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def test_aggregates_match_a_recount_after_eviction(tmp_path):
+    spill_path = tmp_path / "posts.jsonl"
+    store = PostRecordStore(capacity=4, spill_path=str(spill_path), preview_chars=5, spill_flush_every=100)
+    contents = ["x" * length for length in (10, 3, 25, 7, 18, 1, 12)]
+    ids = [store.append(content, engagement=i, timestamp=START + timedelta(minutes=i))
+           for i, content in enumerate(contents)]
+    assert ids == list(range(1, 8))
+    assert store.record_engagement(6, 40)
+    # Evicted and unknown records can no longer be updated
+    assert not store.record_engagement(2, 99)
+    assert not store.record_engagement(0, 1)
+    assert store.get(2) is None
+
+    lengths = [len(content) for content in contents]
+    engagement = [0, 1, 2, 3, 4, 40, 6]
+    held = slice(3, None)
+    summary = store.summary()
+    assert summary["posts_made"] == 7
+    assert (summary["posts_in_memory"], summary["posts_spilled"]) == (4, 3)
+    assert summary["length_mean"] == pytest.approx(statistics.fmean(lengths))
+    assert summary["length_std"] == pytest.approx(statistics.pstdev(lengths))
+    assert (summary["length_min"], summary["length_max"]) == (1, 25)
+    assert summary["engagement_total"] == sum(engagement)
+    assert summary["window_length_mean"] == pytest.approx(statistics.fmean(lengths[held]))
+    assert summary["window_engagement"] == sum(engagement[held])
+    assert summary["last_post_id"] == 7
+
+    assert [record["id"] for record in store.recent(10)] == [7, 6, 5, 4]
+    assert store.get(6) == {"id": 6, "timestamp": (START + timedelta(minutes=5)).isoformat(),
+                            "content": "x", "length": 1, "engagement": 40}
+
+    store.close()
+    spilled = [json.loads(line) for line in spill_path.read_text(encoding="utf-8").splitlines()]
+    assert [(record["id"], record["length"], record["content"]) for record in spilled] == [
+        (1, 10, "xxxxx"), (2, 3, "xxx"), (3, 25, "xxxxx")
+    ]
+    assert store._spill_file is None
+
+
+def test_empty_store_summary():
+    store = PostRecordStore(capacity=2, spill_path=None)
+    summary = store.summary()
+    assert (summary["posts_made"], summary["length_mean"], summary["length_std"]) == (0, 0.0, 0.0)
+    assert math.isclose(summary["window_length_mean"], 0.0)
+    with pytest.raises(ValueError):
+        PostRecordStore(capacity=0)
+
+
+def test_published_post_id_records_engagement():
+    engine = build_standin_engine()
+
+    async def publish():
+        post_id = await engine.publish_content("Solar is now the cheapest electricity in history")
+        assert engine.record_engagement(post_id, 12)
+        await engine.close()
+        return post_id
+
+    post_id = asyncio.run(publish())
+    assert engine.post_records.get(post_id)["engagement"] == 12
+    assert engine.analytics["engagement_total"] == 12
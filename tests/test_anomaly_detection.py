@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from analytics_dashboard import AnalyticsCollector
+from anomaly_detection import AnomalyDetector
+from local_standins import build_standin_engine
+
+PRICE = "solar_production.market_price_usd_mwh"
+
+
+def _ticks(count, start=datetime(2024, 1, 1), step=timedelta(seconds=30)):
+    return [start + i * step for i in range(count)]
+
+
+def test_hourly_series_pinned_at_fallback_stays_flagged():
+    detector = AnomalyDetector()
+    ticks = _ticks(600)
+    # Four hours of an hourly-updated price sampled every 30s
+    for i, timestamp in enumerate(ticks[:480]):
+        detector.observe({PRICE: 40.0 + (i // 120)}, timestamp)
+    assert not detector.active
+
+    # Then the API fails and the default is substituted for the rest of the run
+    for timestamp in ticks[480:]:
+        active = detector.observe({PRICE: 50.0}, timestamp, fallbacks=[PRICE])
+        assert [anomaly.kind for anomaly in active] == ["fallback"]
+    anomaly = detector.active[PRICE]
+    assert anomaly.value == 50.0
+    assert anomaly.score == 120
+    assert anomaly.since == ticks[480]
+
+    # Live values clear the flag, and the defaults did not drag the mean towards 50
+    detector.observe({PRICE: 43.0}, ticks[-1] + timedelta(seconds=30))
+    assert not detector.active
+    assert detector.observe({PRICE: 43.0}, ticks[-1] + timedelta(seconds=60)) == []
+
+
+def test_series_on_fallback_from_startup_is_flagged():
+    detector = AnomalyDetector()
+    for timestamp in _ticks(50):
+        active = detector.observe({PRICE: 50.0, "solar_production.current_production_mw": 1950.0}, timestamp,
+                                  fallbacks=[PRICE])
+        assert [(anomaly.series, anomaly.kind) for anomaly in active] == [(PRICE, "fallback")]
+
+
+def test_collector_withholds_context_while_market_api_is_down():
+    engine = build_standin_engine()
+    collector = AnalyticsCollector(engine, anomaly_detector=AnomalyDetector(), withhold_anomalous_content=True)
+    live_fetch = engine.data_api.fetch_energy_market_data
+
+    async def market_api_down():
+        return None
+
+    async def run():
+        await collector.collect_all_metrics()
+        assert engine.withheld_context_keys == set()
+
+        engine.data_api.fetch_energy_market_data = market_api_down
+        analytics = await collector.collect_all_metrics()
+        assert analytics.solar_production["market_price_usd_mwh"] == 50.0
+        assert PRICE in analytics.fallback_series
+        assert {a.series for a in analytics.anomalies if a.kind == "fallback"} >= {PRICE}
+        assert engine.withheld_context_keys == {"market_price"}
+
+        engine.data_api.fetch_energy_market_data = live_fetch
+        await collector.collect_all_metrics()
+        assert engine.withheld_context_keys == set()
+
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+"""Staged content pipeline: outbox publishing, backpressure, failure handling and metrics"""
+
+import asyncio
+
+import pytest
+
+from content_pipeline import ContentPipeline
+from local_standins import build_standin_engine
+
+
+class StubEngine:
+    """Engine surface the pipeline uses, with configurable per-stage delays"""
+
+    def __init__(self, collect_delay=0.0, generate_delay=0.0, post_delay=0.0):
+        self.collect_delay = collect_delay
+        self.generate_delay = generate_delay
+        self.post_delay = post_delay
+        self.collected = 0
+        self.posted = []
+
+    async def collect_real_time_data(self):
+        await asyncio.sleep(self.collect_delay)
+        self.collected += 1
+        return {"cycle": self.collected}
+
+    async def generate_contextual_content(self, solar_data):
+        await asyncio.sleep(self.generate_delay)
+        return f"post {solar_data['cycle']}"
+
+    async def post_content(self, content, wait_published=False):
+        await asyncio.sleep(self.post_delay)
+        self.posted.append(content)
+        return True
+
+
+def test_slow_post_stage_holds_back_collection():
+    engine = StubEngine(post_delay=0.05)
+    pipeline = ContentPipeline(engine, queue_size=1)
+
+    async def run():
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    posted = len(engine.posted)
+    assert 5 <= posted <= 11
+    # At most one item waiting in each queue plus one in flight per stage
+    assert engine.collected <= posted + 2 * pipeline.queue_size + 3
+    assert pipeline.stages["collect"].blocked_output_seconds > 0.2
+    assert pipeline.queue_metrics["post"].max_depth == 1
+
+
+def test_failed_stage_cancels_the_others():
+    engine = StubEngine()
+    pipeline = ContentPipeline(engine, queue_size=1)
+
+    async def broken_post_stage():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("post stage crashed")
+
+    pipeline._post_stage = broken_post_stage
+
+    async def run():
+        # Without cancellation the collect and generate stages would block on full queues forever
+        with pytest.raises(RuntimeError, match="post stage crashed"):
+            await asyncio.wait_for(pipeline.run(), timeout=2)
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(run())
+    assert pipeline.get_metrics()["elapsed_seconds"] < 1
+
+
+def test_metrics_name_the_slowest_stage_as_bottleneck():
+    engine = StubEngine(collect_delay=0.005, generate_delay=0.04, post_delay=0.005)
+    pipeline = ContentPipeline(engine, queue_size=2)
+    assert pipeline.get_metrics()["bottleneck_stage"] is None
+
+    asyncio.run(pipeline.run(cycles=6))
+    metrics = pipeline.get_metrics()
+
+    assert metrics["bottleneck_stage"] == "generate"
+    assert engine.posted == [f"post {i}" for i in range(1, 7)]
+    for name in ("collect", "generate", "post"):
+        assert metrics["stages"][name]["items_processed"] == 6
+    assert metrics["stages"]["generate"]["utilisation"] > 0.6
+    assert metrics["posts_per_hour"] == pytest.approx(6 / metrics["elapsed_seconds"] * 3600)
+    assert metrics["queues"]["generate"]["maxsize"] == 2
+
+
+def test_pipeline_counts_only_posts_the_outbox_published(tmp_path):
+    engine = build_standin_engine(outbox_path=str(tmp_path / "outbox.db"))
+    published = []
+
+    async def flaky_publish(entry):
+        # Every other tweet fails and stays queued for a retry
+        if len(published) % 2:
+            published.append(None)
+            return None
+        published.append(entry.payload["text"])
+        return f"external-{len(published)}"
+
+    engine.outbox_channels["twitter"] = flaky_publish
+    metrics = asyncio.run(engine.run_content_pipeline(cycles=4))
+
+    assert engine.outbox_publisher is None
+    stats = engine.outbox.stats()
+    assert stats["published"] == metrics["stages"]["post"]["items_processed"] == 2
+    assert metrics["stages"]["post"]["errors"] == 2
+    assert stats["pending"] == 2
@@ -0,0 +1,39 @@
+import numpy as np
+
+from downsampling import lttb_indices
+
+
+def test_matches_plain_lttb_without_gaps():
+    x = np.arange(200, dtype=np.float64)
+    y = np.sin(x / 7.0)
+    indices = lttb_indices(x, y, 20)
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 199
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_gaps_do_not_hide_peaks():
+    x = np.arange(100, dtype=np.float64)
+    y = np.zeros(100)
+    y[10:14] = np.nan
+    y[30:40] = np.nan
+    y[45] = 50.0
+    y[70] = -50.0
+    indices = lttb_indices(x, y, 12)
+    assert 45 in indices
+    assert 70 in indices
+
+
+def test_all_gap_buckets_and_gap_endpoints():
+    x = np.arange(60, dtype=np.float64)
+    y = np.linspace(0.0, 1.0, 60)
+    y[:20] = np.nan
+    y[-1] = np.nan
+    y[35] = 10.0
+    indices = lttb_indices(x, y, 8)
+    assert len(indices) == 8
+    assert np.all(np.diff(indices) > 0)
+    assert 35 in indices
+    # Buckets with values never keep a gap
+    interior = indices[1:-1]
+    assert np.isfinite(y[interior[interior >= 20]]).all()
@@ -0,0 +1,136 @@
+"""Shared data cache and scheduling of the multi-account engine host"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ai_engine import SolarDataAPI
+from engine_host import AccountConfig, CachedSolarDataAPI, EngineHost
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Counts upstream irradiance fetches; ``values`` is consumed one per fetch"""
+    state = SimpleNamespace(calls=0, values=[], latency=0.0)
+
+    async def fetch_solar_irradiance(self, lat, lon):
+        state.calls += 1
+        await asyncio.sleep(state.latency)
+        return state.values.pop(0) if state.values else 650.0
+
+    async def fetch_energy_market_data(self):
+        return {"value": 42.5, "period": "2024-01-01T00"}
+
+    monkeypatch.setattr(SolarDataAPI, "fetch_solar_irradiance", fetch_solar_irradiance)
+    monkeypatch.setattr(SolarDataAPI, "fetch_energy_market_data", fetch_energy_market_data)
+    return state
+
+
+def test_cached_values_expire_after_ttl(upstream):
+    upstream.values = [500.0, 600.0]
+    api = CachedSolarDataAPI(ttl=0.1)
+
+    async def run():
+        first = await api.get_solar_irradiance(1.0, 2.0)
+        cached = await api.get_solar_irradiance(1.0, 2.0)
+        await asyncio.sleep(0.15)
+        return first, cached, await api.get_solar_irradiance(1.0, 2.0)
+
+    assert asyncio.run(run()) == (500.0, 500.0, 600.0)
+    assert upstream.calls == api.upstream_requests == 2
+
+
+def test_concurrent_callers_share_one_fetch(upstream):
+    upstream.latency = 0.05
+    api = CachedSolarDataAPI()
+
+    async def run():
+        return await asyncio.gather(*(api.get_solar_irradiance(1.0, 2.0) for _ in range(20)))
+
+    assert asyncio.run(run()) == [650.0] * 20
+    assert upstream.calls == api.upstream_requests == 1
+    assert not api._in_flight
+
+
+def test_fallback_defaults_are_not_cached(upstream):
+    upstream.values = [None, None, 700.0]
+    api = CachedSolarDataAPI(ttl=300.0)
+
+    async def run():
+        return [await api.get_solar_irradiance(1.0, 2.0) for _ in range(4)]
+
+    # Each failure is retried on the next call; the first real value is then cached
+    assert asyncio.run(run()) == [SolarDataAPI.DEFAULT_IRRADIANCE] * 2 + [700.0, 700.0]
+    assert upstream.calls == 3
+
+
+class CountingChat:
+    """OpenAI stand-in recording how many completions run at once and who asked first"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.completions = self
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        message = SimpleNamespace(content="Solar is rising across America. #Solar")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_accounts_share_the_llm_limit_fairly(upstream):
+    latency, accounts, limit = 0.05, 8, 2
+    host = EngineHost([AccountConfig(f"account-{i}", "key", "secret", openai_api_key=f"openai-{i}")
+                       for i in range(accounts)], max_concurrent_llm_calls=limit, max_concurrent_cycles=accounts)
+    chat = CountingChat(latency)
+    for generator in host.shared._generators.values():
+        generator.client = SimpleNamespace(chat=chat)
+
+    async def run():
+        await asyncio.gather(*(host.run_cycle(account) for account in host.accounts.values()))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    elapsed = time.monotonic() - start
+
+    assert chat.max_active == limit
+    status = host.get_status()["accounts"]
+    assert all(account["cycles_run"] == 1 and account["failures"] == 0 for account in status.values())
+    # Queued in arrival order: nobody waits more than a full round of the others
+    rounds = accounts // limit
+    assert max(account["last_cycle_seconds"] for account in status.values()) < (rounds + 2) * latency
+    assert elapsed < (rounds + 2) * latency
+    # The shared cache fetched irradiance once for all accounts
+    assert upstream.calls == 1
+
+
+def test_account_queued_for_the_cycle_limit_counts_as_running(upstream):
+    host = EngineHost([AccountConfig(f"account-{i}", "key", "secret") for i in range(2)], max_concurrent_cycles=1)
+    first, second = host.accounts.values()
+    gate = asyncio.Event()
+
+    async def blocked_cycle():
+        await gate.wait()
+
+    first.engine.run_content_cycle = blocked_cycle
+
+    async def run():
+        tasks = [asyncio.create_task(host.run_cycle(first)), asyncio.create_task(host.run_cycle(second))]
+        await asyncio.sleep(0.05)
+        # The second account is only waiting for the limiter, but its next slot must still be skipped
+        assert first.running and second.running
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert not first.running and not second.running
+
+    asyncio.run(run())
@@ -0,0 +1,28 @@
+"""Import-time budgets of the cron-driven entry points"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark_suite import IMPORT_BUDGETS_MS, measure_import_time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only needed on the code paths that post, fetch or schedule, never at import
+LAZY_MODULES = ("aiohttp", "openai", "tweepy", "schedule", "pandas", "plotly", "dash")
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_time_within_budget(module):
+    elapsed_ms = measure_import_time(module)
+    assert elapsed_ms <= IMPORT_BUDGETS_MS[module], f"import {module} took {elapsed_ms:.1f}ms"
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_heavy_dependencies_are_imported_lazily(module, tmp_path):
+    code = f"import sys, {module}; print(' '.join(name for name in {LAZY_MODULES!r} if name in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=tmp_path,
+                               env=env, check=True)
+    assert completed.stdout.split() == []
@@ -0,0 +1,91 @@
+"""Windows of the mirrored ring buffer across wraparound"""
+
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from metrics_history import MetricsHistory
+
+FIELDS = {"production": ("solar_production", "current_production_mw"),
+          "price": ("solar_production", "market_price_usd_mwh")}
+START = np.datetime64(datetime(2024, 3, 1), "ns").astype(np.int64)
+
+
+def _fill(history, count, first=0):
+    for i in range(first, first + count):
+        history.append_row(START + i * 10**9, {"production": float(i)})
+
+
+@pytest.mark.parametrize("appended", [3, 5, 7, 10, 13])
+def test_window_is_the_latest_points_in_order(appended):
+    history = MetricsHistory(capacity=5, fields=FIELDS)
+    _fill(history, appended)
+    expected = list(range(max(appended - 5, 0), appended))
+
+    window = history.window()
+    assert len(history) == len(expected)
+    assert window["production"].tolist() == expected
+    assert window["timestamp"].astype(np.int64).tolist() == [START + i * 10**9 for i in expected]
+    assert np.isnan(window["price"]).all()
+    assert history.window(2)["production"].tolist() == expected[-2:]
+    assert history.window(0)["production"].tolist() == []
+    assert history.column("production", 99).tolist() == expected
+
+
+def test_window_is_a_read_only_view():
+    history = MetricsHistory(capacity=4, fields=FIELDS)
+    _fill(history, 6)
+    window = history.window(3)
+    assert np.shares_memory(window["production"], history._columns["production"])
+    with pytest.raises(ValueError):
+        window["production"][0] = 1.0
+    # The view stays valid for capacity - n further appends
+    _fill(history, 1, first=6)
+    assert window["production"].tolist() == [3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("sequence, limit, expected", [
+    (7, None, [7.0, 8.0, 9.0]),
+    (9, None, [9.0]),
+    (10, None, []),
+    (12, None, []),
+    # Older than the buffer holds: only what is still there
+    (0, None, [5.0, 6.0, 7.0, 8.0, 9.0]),
+    (-3, None, [5.0, 6.0, 7.0, 8.0, 9.0]),
+    (4, 2, [8.0, 9.0]),
+])
+def test_since_after_wraparound(sequence, limit, expected):
+    history = MetricsHistory(capacity=5, fields=FIELDS)
+    _fill(history, 10)
+    assert history.total_appended == 10
+    assert history.since(sequence, limit)["production"].tolist() == expected
+
+
+def test_between_copies_held_points_in_range():
+    history = MetricsHistory(capacity=4, fields=FIELDS)
+    _fill(history, 7)
+    base = datetime(2024, 3, 1)
+    points = history.between(base + timedelta(seconds=4), base + timedelta(seconds=6))
+    assert points["production"].tolist() == [4.0, 5.0]
+    _fill(history, 4, first=7)
+    assert points["production"].tolist() == [4.0, 5.0]
+    assert history.between(end=base + timedelta(seconds=5))["production"].tolist() == []
+
+
+def test_shared_buffer_reader_follows_writer_count():
+    size = MetricsHistory.buffer_size(4, len(FIELDS))
+    block = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        writer = MetricsHistory(capacity=4, fields=FIELDS, buffer=block.buf)
+        reader = MetricsHistory(capacity=4, fields=FIELDS, buffer=block.buf)
+        _fill(writer, 6)
+        reader.set_count(writer.total_appended)
+        assert reader.window()["production"].tolist() == [2.0, 3.0, 4.0, 5.0]
+        del writer, reader
+    finally:
+        block.close()
+        block.unlink()
+    with pytest.raises(ValueError):
+        MetricsHistory(capacity=4, fields=FIELDS, buffer=bytearray(size - 1))
@@ -0,0 +1,79 @@
+"""Bucket placement, quantiles and Prometheus output of the log-linear histogram"""
+
+import random
+
+import numpy as np
+import pytest
+
+from metrics_registry import Histogram, MetricsRegistry
+
+
+def _index(histogram, value_ns):
+    histogram.counts = [0] * len(histogram.counts)
+    histogram.observe_ns(value_ns)
+    return histogram.counts.index(1)
+
+
+def test_every_value_lands_in_a_bucket_containing_it():
+    histogram = Histogram()
+    values = list(range(0, 200)) + [random.Random(7).randrange(1, 10**12) for _ in range(2000)]
+    values += [(1 << shift) + delta for shift in range(5, 39) for delta in (-1, 0, 1)]
+    for value in values:
+        lower, upper = histogram._bucket_bounds(_index(histogram, value))
+        assert lower <= value < upper, value
+        # Small values are exact, larger ones within one sub-bucket (1/16 of a power of two)
+        if value >= 2 * histogram.sub_buckets:
+            assert (upper - lower) / lower <= 1 / histogram.sub_buckets
+
+
+def test_bucket_bounds_are_contiguous():
+    histogram = Histogram(precision_bits=3, max_exponent=10)
+    bounds = [histogram._bucket_bounds(index) for index in range(len(histogram.counts))]
+    assert bounds[0][0] == 0
+    assert all(previous[1] == current[0] for previous, current in zip(bounds, bounds[1:]))
+
+
+def test_values_past_the_range_go_to_the_last_bucket():
+    histogram = Histogram(precision_bits=4, max_exponent=10)
+    assert _index(histogram, 10**15) == len(histogram.counts) - 1
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99, 1.0])
+def test_quantile_is_within_the_relative_error(q):
+    rng = np.random.default_rng(3)
+    samples_ns = (rng.lognormal(mean=np.log(5e6), sigma=1.0, size=20000)).astype(np.int64)
+    histogram = Histogram()
+    for value in samples_ns.tolist():
+        histogram.observe_ns(value)
+    exact = np.sort(samples_ns)[max(1, int(q * len(samples_ns) + 0.5)) - 1] / 1e9
+    estimate = histogram.quantile(q)
+    # Quantiles report the bucket's upper bound, capped at the largest value seen
+    assert exact <= estimate <= exact * (1 + 1 / histogram.sub_buckets)
+    assert histogram.quantile(1.0) == samples_ns.max() / 1e9
+
+
+def test_quantile_of_empty_and_single_value():
+    histogram = Histogram()
+    assert histogram.quantile(0.99) == 0.0
+    histogram.observe(0.25)
+    assert histogram.quantile(0.5) == histogram.quantile(0.99) == 0.25
+    assert (histogram.count, histogram.sum_ns, histogram.max_ns) == (1, 250_000_000, 250_000_000)
+
+
+def test_cumulative_counts_and_prometheus_buckets():
+    registry = MetricsRegistry()
+    family = registry.histogram("request_seconds", "Request latency", labels=("route",), bounds=(0.001, 0.01, 0.1))
+    child = family.labels(route="/api")
+    for seconds in (0.0002, 0.0004, 0.003, 0.004, 0.005, 0.05, 2.0):
+        child.observe(seconds)
+    assert child.cumulative_counts((0.001, 0.01, 0.1)) == [2, 5, 6]
+
+    text = registry.render()
+    assert 'request_seconds_bucket{route="/api",le="0.001"} 2' in text
+    assert 'request_seconds_bucket{route="/api",le="0.1"} 6' in text
+    assert 'request_seconds_bucket{route="/api",le="+Inf"} 7' in text
+    assert 'request_seconds_count{route="/api"} 7' in text
+    assert registry.snapshot()['request_seconds{route="/api"}']["count"] == 7
+
+    with pytest.raises(ValueError):
+        registry.counter("request_seconds", "clash")
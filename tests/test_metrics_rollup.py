@@ -0,0 +1,98 @@
+"""Rollup upserts and raw history reads of the SQLite metrics store"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from analytics_dashboard import AnalyticsMetrics
+from metrics_rollup import MetricsRollupStore
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _metrics(timestamp, production, price=40.0):
+    return AnalyticsMetrics(
+        solar_production={"current_production_mw": production, "market_price_usd_mwh": price},
+        social_engagement={}, policy_impact={}, economic_metrics={}, environmental_impact={},
+        timestamp=timestamp
+    )
+
+
+def _store(db_path):
+    return MetricsRollupStore(db_path, history_retention=None, retention={60: None, 3600: None, 86400: None})
+
+
+@pytest.mark.parametrize("name", [":memory:", "rollups.db", "odd ?#% dir/rollups.db"])
+def test_iter_history_reads_every_point_in_chunks(tmp_path, name):
+    if name != ":memory:":
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        name = str(tmp_path / name)
+    store = _store(name)
+    for i in range(5):
+        store.add(_metrics(START + timedelta(seconds=30 * i), 100.0 + i))
+
+    chunks = list(store.iter_history(["solar_production_mw", "total_followers"], chunk_rows=2))
+    assert [len(chunk["timestamp"]) for chunk in chunks] == [2, 2, 1]
+    production = np.concatenate([chunk["solar_production_mw"] for chunk in chunks])
+    assert production.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    # Fields missing from a snapshot come back as NaN
+    assert np.isnan(np.concatenate([chunk["total_followers"] for chunk in chunks])).all()
+
+    window = list(store.iter_history(["solar_production_mw"], start=START + timedelta(seconds=30),
+                                     end=START + timedelta(seconds=90)))
+    assert window[0]["solar_production_mw"].tolist() == [101.0, 102.0]
+    store.close()
+
+
+def test_add_upserts_one_bucket_per_resolution():
+    store = _store(":memory:")
+    # Three snapshots in the first minute, one in the next minute, one in the next hour
+    for offset, production in [(0, 100.0), (20, 130.0), (40, 70.0), (60, 200.0), (3600, 50.0)]:
+        store.add(_metrics(START + timedelta(seconds=offset), production))
+    field = "solar_production.current_production_mw"
+    assert store.fields() == ["solar_production.current_production_mw", "solar_production.market_price_usd_mwh"]
+
+    end = START + timedelta(days=1)
+    minutes = store.query(field, START, end, resolution=60)
+    assert minutes["timestamp"].tolist() == [START, START + timedelta(minutes=1), START + timedelta(hours=1)]
+    assert minutes["count"].tolist() == [3, 1, 1]
+    assert minutes["mean"].tolist() == [100.0, 200.0, 50.0]
+    assert minutes["min"].tolist() == [70.0, 200.0, 50.0]
+    assert minutes["max"].tolist() == [130.0, 200.0, 50.0]
+
+    hours = store.query(field, START, end, resolution=3600)
+    assert hours["count"].tolist() == [4, 1]
+    assert hours["mean"].tolist() == [125.0, 50.0]
+    assert (hours["min"].tolist(), hours["max"].tolist()) == ([70.0, 50.0], [200.0, 50.0])
+
+    days = store.query(field, START.replace(hour=0), end, resolution=86400)
+    assert days["timestamp"].tolist() == [START.replace(hour=0)]
+    assert (days["count"].tolist(), days["mean"].tolist()) == ([5], [110.0])
+    assert (days["min"].tolist(), days["max"].tolist()) == ([50.0], [200.0])
+
+    with pytest.raises(ValueError):
+        store.query(field, START, end, resolution=300)
+    store.close()
+
+
+def test_rollups_survive_reopening(tmp_path):
+    db_path = str(tmp_path / "rollups.db")
+    store = _store(db_path)
+    store.add(_metrics(START, 10.0))
+    store.close()
+
+    store = _store(db_path)
+    store.add(_metrics(START + timedelta(seconds=10), 30.0))
+    hours = store.query("solar_production.current_production_mw", START, START + timedelta(hours=1),
+                        resolution=3600)
+    assert (hours["count"].tolist(), hours["mean"].tolist()) == ([2], [20.0])
+    store.close()
+
+
+def test_choose_resolution_keeps_requested_point_count():
+    store = _store(":memory:")
+    assert store.choose_resolution(START, START + timedelta(hours=2), points=100) == 60
+    assert store.choose_resolution(START, START + timedelta(days=30), points=500) == 3600
+    assert store.choose_resolution(START, START + timedelta(days=800), points=500) == 86400
+    store.close()
@@ -0,0 +1,141 @@
+"""Concurrent multi-platform fan-out and two-tier content adaptation"""
+
+import asyncio
+import time
+
+import pytest
+
+from local_standins import build_standin_engine
+from multi_platform_engine import MultiPlatformEngine
+
+
+class StandInPublisher:
+    """Platform handler that records posts and takes ``delay`` seconds per post"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.posts = []
+        self.active = 0
+        self.max_active = 0
+
+    async def post_content(self, content):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.posts.append(content)
+        return True
+
+
+@pytest.fixture
+def engine():
+    return build_standin_engine()
+
+
+def _multi_platform(engine, delays=None, **kwargs):
+    multi_platform = MultiPlatformEngine(engine, **kwargs)
+    delays = delays or {}
+    multi_platform.platforms = {name: StandInPublisher(delays.get(name, 0.0)) for name in multi_platform.platforms}
+    return multi_platform
+
+
+def _record_llm_calls(engine):
+    calls = []
+    generate = engine.ai_generator.try_generate_content
+
+    async def recording(content_type, context=None):
+        calls.append(content_type)
+        return await generate(content_type, context)
+
+    engine.ai_generator.try_generate_content = recording
+    return calls
+
+
+def _fan_out(multi_platform):
+    return multi_platform.post_to_all_platforms(solar_data=None, research_insights=[])
+
+
+def test_hung_platform_times_out_without_holding_up_the_others(engine):
+    multi_platform = _multi_platform(engine, delays={"tiktok": 10.0}, platform_timeouts={"tiktok": 0.2})
+
+    start = time.monotonic()
+    result = asyncio.run(_fan_out(multi_platform))
+
+    assert time.monotonic() - start < 1.0
+    assert result.outcomes["tiktok"].status == "timeout"
+    assert result.failed == ["tiktok"]
+    assert sorted(result.succeeded) == ["instagram", "linkedin", "reddit", "youtube"]
+    for name in result.succeeded:
+        assert len(multi_platform.platforms[name].posts) == 1
+    assert result.to_dict()["outcomes"]["tiktok"]["error"] == "no result within 0.2s"
+
+
+def test_platform_limits_are_independent_across_overlapping_fan_outs(engine):
+    multi_platform = _multi_platform(engine, delays={"linkedin": 0.3}, max_concurrent_per_platform=1)
+
+    async def run():
+        return await asyncio.gather(_fan_out(multi_platform), _fan_out(multi_platform))
+
+    results = asyncio.run(run())
+    linkedin, reddit = multi_platform.platforms["linkedin"], multi_platform.platforms["reddit"]
+    assert len(linkedin.posts) == len(reddit.posts) == 2
+    # The slow platform is serialised by its own limiter...
+    assert linkedin.max_active == 1
+    assert sorted(result.outcomes["linkedin"].seconds for result in results)[1] >= 0.55
+    # ...while the other platforms of both fan-outs finish right away
+    assert all(result.outcomes["reddit"].seconds < 0.2 for result in results)
+
+
+def test_two_tier_generates_long_form_only_when_a_platform_needs_it(engine):
+    calls = _record_llm_calls(engine)
+    multi_platform = _multi_platform(engine)
+    result = asyncio.run(_fan_out(multi_platform))
+    assert sorted(calls) == ["core_message", "long_form"]
+    assert result.llm_calls == 2
+
+    calls.clear()
+    for name in ("youtube", "reddit"):
+        del multi_platform.platforms[name]
+    result = asyncio.run(_fan_out(multi_platform))
+    assert calls == ["core_message"]
+    assert result.llm_calls == 1
+    assert sorted(result.succeeded) == ["instagram", "linkedin", "tiktok"]
+
+
+def test_per_platform_mode_calls_the_llm_for_every_platform(engine):
+    calls = _record_llm_calls(engine)
+    result = asyncio.run(_fan_out(_multi_platform(engine, generation_mode="per_platform")))
+    assert calls == ["platform_post"] * 5
+    assert result.llm_calls == 5
+
+
+def test_adapted_posts_respect_length_limits_and_hashtag_style(engine):
+    multi_platform = MultiPlatformEngine(engine)
+    drafts = {"core": "Solar keeps growing. " * 500, "long_form": "A longer look at the grid. " * 2000}
+
+    for name, strategy in multi_platform.content_strategy.items():
+        post = multi_platform.adapt_content(name, drafts)
+        assert len(post.content) <= strategy["max_length"]
+        footer = " ".join(strategy["hashtags"])
+        body = post.content
+        if strategy["hashtag_style"] == "footer":
+            assert body.endswith("\n\n" + footer)
+            body = body[:-len(footer) - 2]
+        elif strategy["hashtag_style"] == "inline":
+            assert body.endswith(" " + footer) and "\n" not in body
+            body = body[:-len(footer) - 1]
+        else:
+            assert "#" not in body
+        # Cut at a word boundary, with an ellipsis
+        assert body.endswith("…") and not body.endswith(" …")
+        expected_source = "A longer look" if strategy["long_form"] else "Solar keeps growing"
+        assert expected_source in body
+
+
+def test_short_drafts_are_not_truncated(engine):
+    multi_platform = MultiPlatformEngine(engine)
+    post = multi_platform.adapt_content("linkedin", {"core": "Solar hit a record today."})
+    assert "Solar hit a record today." in post.content
+    assert "…" not in post.content
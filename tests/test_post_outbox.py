@@ -0,0 +1,126 @@
+"""Crash and drain behaviour of the durable post outbox"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+from post_outbox import OutboxPublisher, PostOutbox
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Publishes one entry, then dies right after the send returns
+_CRASHING_WORKER = textwrap.dedent("""
+    import asyncio, os, sys
+    from post_outbox import OutboxPublisher, PostOutbox
+
+    db_path, sent_path = sys.argv[1:3]
+
+    async def publish(entry):
+        with open(sent_path, "a") as f:
+            f.write(entry.idempotency_key + "\\n")
+        return "external-1"
+
+    async def main():
+        outbox = PostOutbox(db_path)
+        publisher = OutboxPublisher(outbox, {"twitter": publish})
+        entry = outbox.claim("worker-0")[0]
+        await publisher._publish(entry)
+        os._exit(9)
+
+    asyncio.run(main())
+""")
+
+def _sends(sent_path):
+    if not os.path.exists(sent_path):
+        return []
+    with open(sent_path) as f:
+        return f.read().split()
+
+def test_worker_killed_after_publish_does_not_double_post(tmp_path):
+    db_path, sent_path = str(tmp_path / "outbox.db"), str(tmp_path / "sent.txt")
+    outbox = PostOutbox(db_path)
+    outbox.enqueue("twitter", {"text": "hello"}, idempotency_key="post-1")
+    outbox.close()
+
+    completed = subprocess.run([sys.executable, "-c", _CRASHING_WORKER, db_path, sent_path],
+                               cwd=str(tmp_path), env=dict(os.environ, PYTHONPATH=REPO_DIR))
+    assert completed.returncode == 9
+    assert _sends(sent_path) == ["post-1"]
+
+    async def publish(entry):
+        with open(sent_path, "a") as f:
+            f.write(entry.idempotency_key + "\n")
+        return "external-2"
+
+    async def restart():
+        outbox = PostOutbox(db_path)
+        publisher = OutboxPublisher(outbox, {"twitter": publish}, poll_interval=0.01)
+        await publisher.start()
+        try:
+            await publisher.drain(timeout=5)
+        finally:
+            await publisher.stop()
+        return outbox.stats()
+
+    stats = asyncio.run(restart())
+    assert _sends(sent_path) == ["post-1"]
+    assert stats["published"] == 1
+
+def test_drain_skips_backed_off_entries_and_unknown_channels(tmp_path):
+    outbox = PostOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("twitter", {"text": "fails"}, idempotency_key="failing")
+    outbox.enqueue("mastodon", {"text": "no publisher"}, idempotency_key="orphan")
+
+    async def failing(entry):
+        return None
+
+    async def run():
+        publisher = OutboxPublisher(outbox, {"twitter": failing}, poll_interval=0.01)
+        await publisher.start()
+        try:
+            start = time.monotonic()
+            await publisher.drain(timeout=5)
+            return time.monotonic() - start
+        finally:
+            await publisher.stop()
+
+    assert asyncio.run(run()) < 2
+    stats = outbox.stats()
+    # Both stay queued for a later run rather than being waited on
+    assert stats["pending"] == 2
+    outbox.close()
+
+def test_slow_send_is_never_posted_twice(tmp_path):
+    outbox = PostOutbox(str(tmp_path / "outbox.db"))
+    for i in range(4):
+        outbox.enqueue("twitter", {"text": f"post {i}"}, idempotency_key=f"post-{i}")
+    sends = []
+
+    async def publish(entry):
+        sends.append(entry.idempotency_key)
+        # The first send hangs past the lease; the rest each take a third of it
+        await asyncio.sleep(5.0 if entry.idempotency_key == "post-0" else 0.1)
+        return f"external-{entry.idempotency_key}"
+
+    async def run():
+        publisher = OutboxPublisher(outbox, {"twitter": publish}, workers=2, claim_batch=4,
+                                    lease_seconds=0.3, poll_interval=0.01)
+        await publisher.start()
+        try:
+            await asyncio.sleep(1.0)
+        finally:
+            await publisher.stop()
+
+    asyncio.run(run())
+    # Neither the hung send nor the batch queued behind it were re-claimed mid-flight
+    assert sorted(sends) == ["post-0", "post-1", "post-2", "post-3"]
+    stats = outbox.stats()
+    assert stats["published"] == 3
+    assert stats["pending"] == 1
+    entry = outbox._conn.execute(
+        "SELECT needs_reconcile, last_error FROM outbox WHERE idempotency_key = 'post-0'").fetchone()
+    assert entry == (1, "publish timed out")
+    outbox.close()
@@ -0,0 +1,54 @@
+"""Seqlock robustness of the shared-memory snapshot"""
+
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+
+from analytics_dashboard import AnalyticsCollector, BackgroundCollector
+from local_standins import build_standin_engine
+from shared_snapshot import _SEQ, SharedSnapshotReader, SharedSnapshotWriter
+
+@pytest.fixture
+def shared():
+    collector = BackgroundCollector(AnalyticsCollector(build_standin_engine(), history_capacity=64),
+                                    history_window=8)
+    writer = SharedSnapshotWriter(f"solar_test_{uuid.uuid4().hex[:12]}", capacity=64, history_window=8)
+    collector.add_listener(writer.publish)
+    reader = SharedSnapshotReader(writer.name, read_timeout=0.05)
+    yield collector, writer, reader
+    reader.close()
+    writer.close()
+
+def test_failed_publish_leaves_sequence_even(shared, monkeypatch):
+    collector, writer, reader = shared
+    asyncio.run(collector.collect_once())
+    good = reader.latest
+
+    def broken(timestamp_ns, values):
+        raise RuntimeError("copy failed")
+
+    monkeypatch.setattr(writer.history, "append_row", broken)
+    asyncio.run(collector.collect_once())
+    assert int(writer._header[_SEQ]) % 2 == 0
+    assert reader.latest is good
+
+def test_reader_gives_up_on_a_writer_stuck_mid_write(shared):
+    collector, writer, reader = shared
+    asyncio.run(collector.collect_once())
+    good = reader.latest
+    asyncio.run(collector.collect_once())
+    # A writer that died between the two sequence increments
+    writer._header[_SEQ] += 1
+    assert reader.latest is good
+
+def test_snapshot_history_is_not_overwritten_by_later_publishes(shared):
+    collector, writer, reader = shared
+    asyncio.run(collector.collect_once())
+    snapshot = reader.latest
+    before = {name: column.copy() for name, column in snapshot.history.items()}
+    for _ in range(80):
+        asyncio.run(collector.collect_once())
+    for name, column in snapshot.history.items():
+        np.testing.assert_array_equal(column, before[name])
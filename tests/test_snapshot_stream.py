@@ -0,0 +1,27 @@
+import threading
+from types import SimpleNamespace
+
+from snapshot_stream import SnapshotBroadcaster
+
+
+def test_waiting_client_gets_full_frame_without_heartbeat_delay():
+    broadcaster = SnapshotBroadcaster(
+        encode_delta=lambda snapshot, previous: "delta",
+        encode_full=lambda snapshot, previous: "full",
+        heartbeat_seconds=30.0,
+    )
+    stream = broadcaster.stream(broadcaster.subscribe())
+    assert next(stream) == b"retry: 2000\n\n"
+
+    frames = []
+    reader = threading.Thread(target=lambda: frames.append(next(stream)), daemon=True)
+    reader.start()
+    # Nothing published yet, so the client is parked waiting for a frame
+    reader.join(0.2)
+    assert reader.is_alive()
+
+    broadcaster.publish(SimpleNamespace(version=1))
+    reader.join(2.0)
+    assert not reader.is_alive()
+    assert b"data: full" in frames[0]
+    broadcaster.close()
@@ -0,0 +1,86 @@
+"""Running totals and per-post time series of the social engagement store"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from local_standins import StandInSocialFetcher
+from social_ingestion import FetchResult, SocialMetricsStore, SocialPost
+
+NOW = datetime(2024, 5, 1, 15, 0, 0)
+
+
+def _post(post_id, likes=0, comments=0, shares=0, impressions=0, published_at=NOW - timedelta(hours=1)):
+    return SocialPost("twitter", post_id, published_at, likes, comments, shares, impressions)
+
+
+def _comparable(summary):
+    return {key: value for key, value in summary.items() if key != "timestamp"}
+
+
+def test_running_totals_match_a_full_recount(tmp_path):
+    db_path = str(tmp_path / "social.db")
+    store = SocialMetricsStore(db_path, viral_threshold=30)
+    fetchers = [StandInSocialFetcher(platform, seed=3) for platform in ("twitter", "reddit")]
+
+    async def ingest():
+        for fetcher in fetchers:
+            for step in range(2):
+                result = await fetcher.fetch_changes(store.cursor(fetcher.platform))
+                store.apply(fetcher.platform, result, NOW + timedelta(minutes=step))
+
+    asyncio.run(ingest())
+    incremental = store.summary(NOW)
+    store.close()
+
+    # A fresh store computes its totals with one full scan of the stored posts
+    recounted = SocialMetricsStore(db_path, viral_threshold=30)
+    assert _comparable(incremental) == _comparable(recounted.summary(NOW))
+    # Posts are only returned once they gain engagement
+    assert all(fetcher.requests == 2 for fetcher in fetchers)
+    assert 0 < incremental["platform_breakdown"]["twitter"]["posts_tracked"] <= 4
+    assert incremental["total_followers"] == sum(fetcher.followers for fetcher in fetchers)
+    assert incremental["viral_posts"] > 0
+    recounted.close()
+
+
+def test_apply_tracks_deltas_viral_transitions_and_followers():
+    store = SocialMetricsStore(":memory:", viral_threshold=100)
+    t0 = NOW
+    assert store.apply("twitter", FetchResult([_post("a", likes=10, impressions=100), _post("b", likes=20)],
+                                              followers=500, cursor="1"), t0) == 2
+
+    # "a" goes viral, "b" is unchanged and skipped, no follower count this time
+    assert store.apply("twitter", FetchResult([_post("a", likes=90, comments=15, impressions=900),
+                                               _post("b", likes=20)], cursor="2"), t0 + timedelta(minutes=1)) == 1
+    twitter = store.summary(NOW)["platform_breakdown"]["twitter"]
+    assert twitter == {"followers": 500, "engagement": 125, "posts": 2, "viral_posts": 1, "impressions": 900,
+                       "posts_tracked": 2}
+    assert store.cursor("twitter") == "2"
+
+    # Likes removed: "a" drops back under the threshold
+    assert store.apply("twitter", FetchResult([_post("a", likes=50, comments=15, impressions=950)],
+                                              followers=510, cursor="3"), t0 + timedelta(minutes=2)) == 1
+    twitter = store.summary(NOW)["platform_breakdown"]["twitter"]
+    assert (twitter["engagement"], twitter["viral_posts"], twitter["followers"]) == (85, 0, 510)
+
+    series = store.engagement_series("twitter", "a")
+    assert series["timestamp"].dtype == "datetime64[s]"
+    assert series["timestamp"].astype(datetime).tolist() == [
+        t0 + timedelta(minutes=step) for step in range(3)
+    ]
+    assert series["likes"].tolist() == [10, 90, 50]
+    assert series["engagement"].tolist() == [10, 105, 65]
+    assert series["impressions"].tolist() == [100, 900, 950]
+    # The unchanged post has only its first observation
+    assert store.engagement_series("twitter", "b")["likes"].tolist() == [20]
+    assert len(store.engagement_series("twitter", "missing")["timestamp"]) == 0
+    store.close()
+
+
+def test_posts_today_counts_only_posts_published_since_midnight():
+    store = SocialMetricsStore(":memory:")
+    store.apply("twitter", FetchResult([_post("old", published_at=NOW - timedelta(days=1)), _post("new")]), NOW)
+    summary = store.summary(NOW)
+    assert summary["posts_today"] == 1
+    assert summary["platform_breakdown"]["twitter"]["posts_tracked"] == 2
+    store.close()